@@ -0,0 +1,270 @@
+"""
+Throughput and latency of the payment API, driven in-process through the ASGI app (no server, no network).
+
+The payment gateway and the User/Company services are replaced by deterministic stubs (see 'benchmarks.stubs'),
+the database is a real Postgres with the schema migrated ('alembic upgrade head', or '--create-schema').
+Production-like dependency behavior can be injected with seeded fault specifications (see 'FaultInjector.from_spec').
+
+Usage:
+    python -m benchmarks.api_benchmark --requests 2000 --concurrency 1 10 50 --output results.json
+    python -m benchmarks.api_benchmark --baseline benchmarks/baselines/api_benchmark.json --tolerance 0.1
+    python -m benchmarks.api_benchmark --output benchmarks/baselines/api_benchmark.json  # store a new baseline
+    python -m benchmarks.api_benchmark --gateway-faults "latency=lognormal:40:0.9;timeout_ms=2000;seed=1" \
+        --user-service-faults "latency=normal:10:3;errors=UserServiceError/503:0.01;seed=2"
+
+Exits with status 1 if a metric regressed by more than the tolerance against the baseline.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Callable
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+from benchmarks.common import latency_summary, compare_to_baseline
+from benchmarks.stubs import StubPaymentGateway, StubUserServiceAdapter, StubCompanyServiceAdapter
+from src.core.config import settings
+from src.core.dependencies import setup_dependencies, shutdown_dependencies
+from src.core.logger import LoggerService
+from src.domain.validation import luhn_check_digit, iban_check_digits
+from src.infrastructure.adapters.fault_injecting_company_service_adapter import FaultInjectingCompanyServiceAdapter
+from src.infrastructure.adapters.fault_injecting_payment_gateway import FaultInjectingPaymentGateway
+from src.infrastructure.adapters.fault_injecting_user_service_adapter import FaultInjectingUserServiceAdapter
+from src.infrastructure.database.database import Base
+from src.infrastructure.database.pool import InstrumentedAsyncQueuePool
+from src.infrastructure.fault_injection.fault_injector import FaultInjector
+from src.main import app
+
+ENDPOINTS = {
+    "bank_card": "/api/v1/payment/bank_card",
+    "bank_account": "/api/v1/payment/bank_account",
+}
+COMPARED_METRICS = ("throughput_per_second", "p50_ms", "p95_ms", "p99_ms", "errors")
+
+
+def card_number(rng: random.Random) -> str:
+    """Random 16-digit card number passing the Luhn check."""
+    partial_number = "".join(rng.choice("0123456789") for _ in range(15))
+    return partial_number + luhn_check_digit(partial_number)
+
+
+def kz_iban(rng: random.Random) -> str:
+    """Random Kazakhstan IBAN with valid check digits."""
+    bban = "".join(rng.choice("0123456789") for _ in range(16))
+    return "KZ" + iban_check_digits("KZ", bban) + bban
+
+
+def bank_card_payload(rng: random.Random) -> dict:
+    return dict(
+        card_holder_first_name="John",
+        card_holder_last_name="Doe",
+        card_number=card_number(rng),
+        expiration_date=f"12/{(date.today().year + 3) % 100:02d}",
+        cvv_code=f"{rng.randrange(1000):03d}",
+        user_id=str(uuid.UUID(int=rng.getrandbits(128))),
+    )
+
+
+def bank_account_payload(rng: random.Random) -> dict:
+    return dict(
+        account_holder_name="OOO Naeb",
+        account_number=kz_iban(rng),
+        # A company can have only one bank account, so the ID must not repeat across runs
+        company_id=str(uuid.uuid4()),
+    )
+
+
+PAYLOADS: dict[str, Callable[[random.Random], dict]] = {
+    "bank_card": bank_card_payload,
+    "bank_account": bank_account_payload,
+}
+
+
+def create_engine(database_url: str) -> AsyncEngine:
+    return create_async_engine(
+        database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+async def build_dependencies(engine: AsyncEngine, args: argparse.Namespace) -> dict:
+    """The dependencies of 'setup_dependencies', on the benchmark's engine and with the external services stubbed."""
+    # Tokens are unique in the database, so they must not repeat across runs either
+    payment_gateway = StubPaymentGateway(args.stub_latency_ms, token_prefix=f"BENCH-{uuid.uuid4().hex[:12]}")
+    user_service_adapter = StubUserServiceAdapter(args.stub_latency_ms)
+    company_service_adapter = StubCompanyServiceAdapter(args.stub_latency_ms)
+
+    fault_injectors = {}
+    if args.gateway_faults:
+        fault_injectors["payment_gateway"] = FaultInjector.from_spec(args.gateway_faults)
+        payment_gateway = FaultInjectingPaymentGateway(payment_gateway, fault_injectors["payment_gateway"])
+    if args.user_service_faults:
+        fault_injectors["user_service"] = FaultInjector.from_spec(args.user_service_faults)
+        user_service_adapter = FaultInjectingUserServiceAdapter(user_service_adapter, fault_injectors["user_service"])
+    if args.company_service_faults:
+        fault_injectors["company_service"] = FaultInjector.from_spec(args.company_service_faults)
+        company_service_adapter = FaultInjectingCompanyServiceAdapter(
+            company_service_adapter, fault_injectors["company_service"]
+        )
+
+    dependencies = await setup_dependencies(
+        engine,
+        payment_gateway=payment_gateway,
+        user_service_adapter=user_service_adapter,
+        company_service_adapter=company_service_adapter,
+        logger=LoggerService("benchmarks.api", "api_benchmark.log", console_level=logging.ERROR),
+    )
+    dependencies["fault_injectors"] = fault_injectors
+    return dependencies
+
+
+async def run_level(client: httpx.AsyncClient, endpoint: str, requests: int, warmup: int,
+                    concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    make_payload = PAYLOADS[endpoint]
+    path = ENDPOINTS[endpoint]
+
+    for _ in range(warmup):
+        await client.post(path, json=make_payload(rng))
+
+    payloads = [make_payload(rng) for _ in range(requests)]
+    remaining = iter(payloads)
+    latencies_ms: list[float] = []
+    status_counts: dict[int, int] = {}
+
+    async def worker() -> None:
+        for payload in remaining:
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+            status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return dict(
+        endpoint=endpoint,
+        concurrency=concurrency,
+        **latency_summary(latencies_ms, elapsed),
+        errors=sum(count for status_code, count in status_counts.items() if status_code >= 400),
+        status_counts={str(status_code): count for status_code, count in sorted(status_counts.items())},
+    )
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    engine = create_engine(args.database_url)
+    if args.create_schema:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    if args.reset:
+        async with engine.begin() as connection:
+            await connection.execute(text("TRUNCATE bank_cards, bank_accounts"))
+
+    app.state.dependencies = await build_dependencies(engine, args)
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://payment-service") as client:
+            for endpoint in args.endpoints:
+                for concurrency in args.concurrency:
+                    result = await run_level(
+                        client, endpoint, args.requests, args.warmup, concurrency, args.seed
+                    )
+                    result["db_pool"] = engine.pool.usage()  # type: ignore
+                    result["faults"] = {
+                        name: injector.stats() for name, injector in app.state.dependencies["fault_injectors"].items()
+                    }
+                    result["dependency_guards"] = {
+                        name: guard.stats() for name, guard in app.state.dependencies["dependency_guards"].items()
+                    }
+                    print(json.dumps(result))
+                    results.append(result)
+    finally:
+        # Also disposes the engine
+        await shutdown_dependencies(app.state.dependencies)
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests per concurrency level.")
+    parser.add_argument("--warmup", type=int, default=100, help="Requests sent before every measurement.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0,
+                        help="Latency of every payment gateway and User/Company service call.")
+    parser.add_argument("--gateway-faults", default="", help="Fault specification of the payment gateway.")
+    parser.add_argument("--user-service-faults", default="", help="Fault specification of the User Service.")
+    parser.add_argument("--company-service-faults", default="", help="Fault specification of the Company Service.")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--create-schema", action="store_true", help="Create the tables if they don't exist.")
+    parser.add_argument("--reset", action="store_true",
+                        help="TRUNCATE the bank_cards and bank_accounts tables first. Never use on a shared database.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative regression, 0.1 = 10%%.")
+    args = parser.parse_args()
+
+    # SQL statement logging would dominate the measurements
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    results = asyncio.run(run(args))
+    report = dict(
+        benchmark="api_benchmark",
+        created_at=datetime.now(timezone.utc).isoformat(),
+        git_revision=git_revision(),
+        python=platform.python_version(),
+        parameters=dict(
+            requests=args.requests, warmup=args.warmup, seed=args.seed, stub_latency_ms=args.stub_latency_ms,
+            gateway_faults=args.gateway_faults, user_service_faults=args.user_service_faults,
+            company_service_faults=args.company_service_faults,
+            db_pool_size=settings.DB_POOL_SIZE, db_max_overflow=settings.DB_MAX_OVERFLOW,
+        ),
+        results=results,
+    )
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        comparison = compare_to_baseline(
+            results, baseline["results"], ("endpoint", "concurrency"), COMPARED_METRICS, args.tolerance
+        )
+        for entry in comparison:
+            print(json.dumps(entry))
+        regressions = [entry for entry in comparison if entry["regression"]]
+        if regressions:
+            print(f"{len(regressions)} regression(s) against the baseline from {baseline.get('git_revision')}.",
+                  file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
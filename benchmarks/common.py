@@ -0,0 +1,54 @@
+import statistics
+from typing import Sequence
+
+
+def latency_summary(latencies_ms: Sequence[float], elapsed_seconds: float) -> dict:
+    """Throughput and latency percentiles of a benchmark run."""
+    ordered = sorted(latencies_ms)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return dict(
+        count=len(ordered),
+        throughput_per_second=round(len(ordered) / elapsed_seconds, 1),
+        mean_ms=round(statistics.fmean(ordered), 3),
+        p50_ms=percentile(0.50),
+        p95_ms=percentile(0.95),
+        p99_ms=percentile(0.99),
+        max_ms=round(ordered[-1], 3),
+    )
+
+
+# Metrics where a lower value is better; for the others (throughput) a higher value is
+LOWER_IS_BETTER = ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "errors")
+
+
+def compare_to_baseline(results: list[dict], baseline: list[dict], keys: Sequence[str],
+                        metrics: Sequence[str], tolerance: float) -> list[dict]:
+    """
+    Relative change of every metric of 'results' against the entry of 'baseline' with the same 'keys'
+    (e.g. endpoint and concurrency). A change worse than 'tolerance' (0.1 = 10%) is flagged as a regression.
+    """
+    baseline_by_key = {tuple(entry[key] for key in keys): entry for entry in baseline}
+    comparison = []
+    for entry in results:
+        baseline_entry = baseline_by_key.get(tuple(entry[key] for key in keys))
+        if baseline_entry is None:
+            continue
+        for metric in metrics:
+            before, after = baseline_entry.get(metric), entry.get(metric)
+            if before is None or after is None:
+                continue
+            if before:
+                change = round((after - before) / before, 4)
+                worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            else:
+                # No relative change from zero (e.g. errors appearing)
+                change = None
+                worse = after > before if metric in LOWER_IS_BETTER else after < before
+            comparison.append(dict(
+                **{key: entry[key] for key in keys},
+                metric=metric, baseline=before, current=after, change=change, regression=worse,
+            ))
+    return comparison
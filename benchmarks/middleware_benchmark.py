@@ -0,0 +1,108 @@
+"""
+Per-request overhead of the middleware stack: the former 'BaseHTTPMiddleware' implementations
+against the pure ASGI ones, measured by calling the ASGI app directly (no server, no network).
+
+Usage:
+    python -m benchmarks.middleware_benchmark --requests 20000 --concurrency 1 100
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from benchmarks.common import latency_summary
+from src.core.exceptions import PaymentServiceError
+from src.core.middleware.clients_filter_middleware import IPFilterMiddleware
+from src.core.middleware.exceptions_middleware import ExceptionMiddleware
+
+
+class LegacyIPFilterMiddleware(BaseHTTPMiddleware):
+    """The 'IPFilterMiddleware' as it was implemented before, kept here as the baseline."""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.client.host != "127.0.0.1":
+            raise PaymentServiceError(status_code=403, detail="Access denied: your IP is not allowed.")
+        return await call_next(request)
+
+
+class LegacyExceptionMiddleware(BaseHTTPMiddleware):
+    """The 'ExceptionMiddleware' as it was implemented before, kept here as the baseline."""
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            return ExceptionMiddleware.to_response(exc)
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return JSONResponse({"success": True})
+
+    if stack == "legacy":
+        app.add_middleware(LegacyIPFilterMiddleware)  # type: ignore
+        app.add_middleware(BaseHTTPMiddleware, dispatch=LegacyExceptionMiddleware(app=app).dispatch)  # type: ignore
+    elif stack == "asgi":
+        app.add_middleware(IPFilterMiddleware)  # type: ignore
+        app.add_middleware(ExceptionMiddleware)  # type: ignore
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8003),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def run(stack: str, requests: int, concurrency: int) -> dict:
+    app = build_app(stack)
+    for _ in range(1000):  # Warm-up: builds the middleware stack and the route caches
+        await call(app)
+
+    latencies_ms = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await call(app)
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latency_summary(latencies_ms, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 100])
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        results = {stack: asyncio.run(run(stack, args.requests, concurrency)) for stack in ("none", "legacy", "asgi")}
+        for stack, result in results.items():
+            overhead_us = (1 / result["throughput_per_second"] - 1 / results["none"]["throughput_per_second"]) * 1e6
+            print(json.dumps(dict(stack=stack, concurrency=concurrency, overhead_us=round(overhead_us, 1), **result)))
+
+
+if __name__ == "__main__":
+    main()
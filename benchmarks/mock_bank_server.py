@@ -0,0 +1,89 @@
+"""
+Local stand-in of the bank API used by 'HTTPBankPaymentGateway', for testing and benchmarking offline.
+
+Latency and failures are injected with a fault specification (see 'FaultInjector.from_spec'); injected errors
+are answered with HTTP 503. The specification can be changed at runtime, e.g. to simulate an outage:
+    curl -X PUT localhost:8010/_faults -d '{"spec": "errors=ConnectionError:1.0"}'
+
+Usage:
+    python -m benchmarks.mock_bank_server --port 8010 --faults "latency=lognormal:30:0.7;errors=ConnectionError:0.02;seed=1"
+    (then start the service with BANK_API_URL=http://127.0.0.1:8010)
+"""
+import argparse
+import itertools
+from collections import OrderedDict
+
+import uvicorn
+from fastapi import FastAPI, Header, Body
+from starlette.responses import JSONResponse
+
+from src.infrastructure.fault_injection.fault_injector import FaultInjector
+
+# Tokenization answers kept per 'Idempotency-Key', like a real bank would
+MAX_REMEMBERED_IDEMPOTENCY_KEYS = 100_000
+
+
+def create_mock_bank_app(faults: str = "") -> FastAPI:
+    app = FastAPI(title="Mock bank API")
+    app.state.fault_injector = FaultInjector.from_spec(faults)
+    app.state.requests = 0
+    tokens = itertools.count()
+    tokens_by_idempotency_key: OrderedDict[str, str] = OrderedDict()
+
+    async def with_faults(handler) -> JSONResponse:
+        app.state.requests += 1
+
+        async def respond() -> JSONResponse:
+            return handler()
+
+        try:
+            return await app.state.fault_injector.run(respond, timeout_error=lambda: TimeoutError())
+        except Exception as exc:
+            return JSONResponse(status_code=503, content={"error": f"{type(exc).__name__}: {exc}"})
+
+    @app.post("/tokens")
+    async def create_token(
+            payload: dict = Body(...),
+            idempotency_key: str | None = Header(default=None),
+    ) -> JSONResponse:
+        def handler() -> JSONResponse:
+            if idempotency_key is not None and idempotency_key in tokens_by_idempotency_key:
+                return JSONResponse({"token": tokens_by_idempotency_key[idempotency_key]})
+
+            token = f"MOCK-{payload.get('type', 'card').upper()}-{next(tokens)}"
+            if idempotency_key is not None:
+                tokens_by_idempotency_key[idempotency_key] = token
+                if len(tokens_by_idempotency_key) > MAX_REMEMBERED_IDEMPOTENCY_KEYS:
+                    tokens_by_idempotency_key.popitem(last=False)
+            return JSONResponse(status_code=201, content={"token": token})
+
+        return await with_faults(handler)
+
+    @app.get("/tokens/{token}/balance")
+    async def get_balance(token: str) -> JSONResponse:
+        return await with_faults(lambda: JSONResponse({"token": token, "balance": "10000.00"}))
+
+    @app.put("/_faults")
+    async def set_faults(spec: str = Body(..., embed=True)) -> dict:
+        app.state.fault_injector = FaultInjector.from_spec(spec)
+        return {"spec": spec}
+
+    @app.get("/_stats")
+    async def get_stats() -> dict:
+        return dict(requests=app.state.requests, **app.state.fault_injector.stats())
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--faults", default="", help="Fault specification, see 'FaultInjector.from_spec'.")
+    args = parser.parse_args()
+
+    uvicorn.run(create_mock_bank_app(args.faults), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Per-user lookups and inserts of 'bank_cards': hash-partitioned on 'user_id' (the layout of the migration
+'f3a8c6d19b52') against the same table unpartitioned.
+
+Both layouts are created side by side in schemas of their own, with the same columns, constraints and indexes,
+and driven through the repository and DAO queries of the service ('schema_translate_map' picks the schema).
+The schemas are dropped afterwards, unless '--keep'.
+
+Phases, per layout:
+- insert         - '--users' x '--cards-per-user' cards, added with 'create_many' in batches of '--batch-size',
+                   '--concurrency' batches at a time
+- list_by_user   - '--lookups' first pages of random users' cards ('get_by_user_id')
+- get_by_id_user - '--lookups' random cards by ID and user, pruned to the partition of the user
+- get_by_id      - '--lookups' random cards by ID alone, searched in every partition
+- explain        - partitions in the plan of every lookup
+
+Usage:
+    python -m benchmarks.partitioning_benchmark --users 20000 --cards-per-user 5 --lookups 5000 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from decimal import Decimal
+from functools import partial
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import MetaData, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+
+from benchmarks.common import latency_summary
+from src.core.config import settings
+from src.domain.models.payment_methods import CardPaymentMethod
+from src.infrastructure.database.models import BankCardModel, BankCardPaymentTokenModel, OutboxEventModel, BANK_CARD_PARTITIONS
+from src.infrastructure.database.pool import InstrumentedAsyncQueuePool
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+
+LAYOUTS = {"partitioned": "bench_partitioned", "unpartitioned": "bench_unpartitioned"}
+EXPLAINED_LOOKUPS = {
+    "list_by_user": "SELECT * FROM {schema}.bank_cards WHERE user_id = :user_id "
+                    "ORDER BY created_at DESC, id DESC LIMIT {limit}",
+    "get_by_id_user": "SELECT * FROM {schema}.bank_cards WHERE id = :card_id AND user_id = :user_id",
+    "get_by_id": "SELECT * FROM {schema}.bank_cards WHERE id = :card_id",
+}
+PARTITION_PATTERN = re.compile(r"bank_cards_p\d+")
+
+
+def create_engine(database_url: str, pool_size: int) -> AsyncEngine:
+    return create_async_engine(
+        database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+
+
+def layout_metadata(partitioned: bool) -> MetaData:
+    """The tables written by 'create_many'; the partitioned one gets its partitions from the 'after_create' hook."""
+    if partitioned:
+        return BankCardModel.metadata
+    metadata = MetaData()
+    bank_cards = BankCardModel.__table__.to_metadata(metadata)
+    bank_cards.dialect_options["postgresql"]["partition_by"] = None
+    BankCardPaymentTokenModel.__table__.to_metadata(metadata)
+    OutboxEventModel.__table__.to_metadata(metadata)
+    return metadata
+
+
+async def create_layout(engine: AsyncEngine, schema: str, partitioned: bool) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await connection.execute(text(f"CREATE SCHEMA {schema}"))
+        connection = await connection.execution_options(schema_translate_map={None: schema})
+        await connection.run_sync(
+            layout_metadata(partitioned).create_all,
+            tables=[
+                BankCardModel.__table__, BankCardPaymentTokenModel.__table__, OutboxEventModel.__table__
+            ] if partitioned else None,
+        )
+
+
+def bank_card(user_id: uuid.UUID) -> CardPaymentMethod:
+    return CardPaymentMethod(
+        user_id=user_id, card_holder_first_name="John", card_holder_last_name="Doe", card_last_four="1111",
+        expiration_date="12/29", payment_token=f"PARTITION-BENCH-{uuid.uuid4().hex}", balance=Decimal("100.00"),
+    )
+
+
+async def timed_calls(calls: list[Callable[[], Awaitable]], concurrency: int, rows: Optional[int] = None) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies_ms = []
+
+    async def timed_call(call: Callable[[], Awaitable]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed_call(call) for call in calls))
+    elapsed = time.perf_counter() - started
+    return dict(**latency_summary(latencies_ms, elapsed), rows_per_second=round((rows or len(calls)) / elapsed, 1))
+
+
+async def run_layout(engine: AsyncEngine, layout: str, args: argparse.Namespace) -> list[dict]:
+    schema = LAYOUTS[layout]
+    await create_layout(engine, schema, partitioned=layout == "partitioned")
+    session_maker = async_sessionmaker(
+        engine.execution_options(schema_translate_map={None: schema}), class_=AsyncSession, expire_on_commit=False
+    )
+    unit_of_work_factory = partial(SQLAlchemyUnitOfWork, session_maker)
+    rng = random.Random(args.seed)
+
+    users = [uuid.uuid4() for _ in range(args.users)]
+    cards = [bank_card(user_id) for user_id in users for _ in range(args.cards_per_user)]
+    # The batches of the API mix the cards of many users
+    rng.shuffle(cards)
+    batches = [cards[start:start + args.batch_size] for start in range(0, len(cards), args.batch_size)]
+
+    async def insert(batch: list[CardPaymentMethod]) -> None:
+        async with unit_of_work_factory() as uow:
+            await uow.bank_cards.create_many(batch)
+            await uow.commit()
+
+    async def list_by_user(user_id: uuid.UUID) -> None:
+        async with unit_of_work_factory(read_only=True) as uow:
+            await uow.bank_cards.get_by_user_id(user_id, settings.PAGE_DEFAULT_LIMIT)
+
+    async def get_by_id(card: CardPaymentMethod, with_user: bool) -> None:
+        async with unit_of_work_factory(read_only=True) as uow:
+            await uow.bank_cards.get_by_id(card.id, card.user_id if with_user else None)
+
+    results = [dict(layout=layout, phase="insert", batch_size=args.batch_size, **await timed_calls(
+        [partial(insert, batch) for batch in batches], args.concurrency, rows=len(cards)
+    ))]
+    async with engine.begin() as connection:
+        await connection.execute(text(f"ANALYZE {schema}.bank_cards"))
+
+    sampled_users = [rng.choice(users) for _ in range(args.lookups)]
+    sampled_cards = [rng.choice(cards) for _ in range(args.lookups)]
+    lookups = {
+        "list_by_user": [partial(list_by_user, user_id) for user_id in sampled_users],
+        "get_by_id_user": [partial(get_by_id, card, True) for card in sampled_cards],
+        "get_by_id": [partial(get_by_id, card, False) for card in sampled_cards],
+    }
+    for phase, calls in lookups.items():
+        results.append(dict(layout=layout, phase=phase, **await timed_calls(calls, args.concurrency)))
+
+    async with engine.connect() as connection:
+        for phase, query in EXPLAINED_LOOKUPS.items():
+            plan = await connection.execute(
+                text(f"EXPLAIN {query.format(schema=schema, limit=settings.PAGE_DEFAULT_LIMIT + 1)}"),
+                dict(user_id=cards[0].user_id, card_id=cards[0].id),
+            )
+            plan_text = "\n".join(row[0] for row in plan)
+            results.append(dict(
+                layout=layout, phase="explain", lookup=phase,
+                partitions_in_plan=len(set(PARTITION_PATTERN.findall(plan_text))),
+            ))
+    return results
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    engine = create_engine(args.database_url, pool_size=args.concurrency)
+    results = []
+    try:
+        for layout in LAYOUTS:
+            results.extend(await run_layout(engine, layout, args))
+    finally:
+        if not args.keep:
+            async with engine.begin() as connection:
+                for schema in LAYOUTS.values():
+                    await connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--cards-per-user", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark schemas for inspection.")
+    args = parser.parse_args()
+
+    print(json.dumps(dict(partitions=BANK_CARD_PARTITIONS, rows=args.users * args.cards_per_user)))
+    for result in asyncio.run(run(args)):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+HTTPBankPaymentGateway against the local mock bank server, run in a separate process (real TCP on localhost).
+
+Scenarios:
+    pooled      - keep-alive connection pool (the production configuration)
+    unpooled    - a new connection for every call, i.e. the cost of connection setup
+    outage      - the bank answers 503 to everything: retries stay within the budget, the circuit opens
+                  and calls fail fast
+
+The mock bank is a single process without TLS, so connection setup is far cheaper than against a real bank.
+Give it a realistic service time (the default '--faults'): saturated, its own queueing dominates both scenarios.
+
+Usage:
+    python -m benchmarks.payment_gateway_benchmark --calls 5000 --concurrency 20 --faults "latency=fixed:10"
+"""
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+import uuid
+from datetime import date
+
+import httpx
+
+from benchmarks.common import latency_summary
+from src.domain.schemas import AddBankCardDTO
+from src.infrastructure.adapters.http_bank_payment_gateway import HTTPBankPaymentGateway
+from src.infrastructure.exceptions import PaymentGatewayError
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from src.infrastructure.resilience.retry_budget import RetryBudget
+
+SCENARIOS = ("pooled", "unpooled", "outage")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_mock_bank(port: int, faults: str) -> asyncio.subprocess.Process:
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.mock_bank_server", "--port", str(port), "--faults", faults
+    )
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        while True:
+            try:
+                await client.get("/_stats")
+                return server
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+
+
+async def run(scenario: str, calls: int, concurrency: int, faults: str) -> dict:
+    port = free_port()
+    server = await start_mock_bank(port, "errors=ConnectionError:1.0" if scenario == "outage" else faults)
+    base_url = f"http://127.0.0.1:{port}"
+
+    gateway = HTTPBankPaymentGateway(
+        base_url,
+        max_connections=concurrency,
+        max_keepalive_connections=0 if scenario == "unpooled" else concurrency,
+        retry_budget=RetryBudget(ratio=0.1, min_retries_per_second=5),
+        circuit_breaker=CircuitBreaker(failure_rate_threshold=0.5, minimum_calls=20, open_duration=5),
+    )
+    card = AddBankCardDTO(
+        user_id=uuid.uuid4(), card_holder_first_name="John", card_holder_last_name="Doe",
+        card_number="4111111111111111", expiration_date=f"12/{(date.today().year + 3) % 100:02d}", cvv_code="123",
+    )
+
+    latencies_ms = []
+    failures = 0
+    remaining = iter(range(calls))
+
+    async def worker() -> None:
+        nonlocal failures
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await gateway.get_payment_token(card)
+            except PaymentGatewayError:
+                failures += 1
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    await gateway.close()
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        bank_stats = (await client.get("/_stats")).json()
+    server.terminate()
+    await server.wait()
+
+    return dict(
+        scenario=scenario,
+        concurrency=concurrency,
+        **latency_summary(latencies_ms, elapsed),
+        failures=failures,
+        # Requests the bank received per call: how much the retries amplified the load
+        amplification=round((bank_stats["requests"] - 1) / calls, 3),
+        **gateway.stats(),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--faults", default="latency=fixed:10", help="Fault specification of the mock bank (not used by 'outage').")
+    args = parser.parse_args()
+
+    for scenario in args.scenarios:
+        print(json.dumps(asyncio.run(run(scenario, args.calls, args.concurrency, args.faults))))
+
+
+if __name__ == "__main__":
+    main()
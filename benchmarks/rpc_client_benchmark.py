@@ -0,0 +1,87 @@
+"""
+Throughput of RabbitMQRPCClient against the in-process broker stand-in (no RabbitMQ needed).
+
+Usage:
+    python -m benchmarks.rpc_client_benchmark --calls 20000 --concurrency 1 10 100 --channels 8
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+
+from aio_pika import Message
+
+from benchmarks.common import latency_summary
+from src.domain.schemas import RabbitMQResponse
+from src.infrastructure.adapters.rabbitmq_user_service_adapter import RabbitMQUserServiceAdapter
+from src.infrastructure.messaging.in_memory_broker import InMemoryBroker
+from src.infrastructure.messaging.rabbitmq_rpc_client import RabbitMQRPCClient
+
+USER_SERVICE_QUEUE = "user_service_queue"
+
+
+async def start_fake_user_service(broker: InMemoryBroker, latency_ms: float) -> None:
+    """Answers every 'get_user_by_id' request with an active user after 'latency_ms'."""
+    connection = await broker.connect()
+    channel = await connection.channel()
+    queue = await channel.declare_queue(USER_SERVICE_QUEUE)
+
+    async def on_request(message) -> None:
+        request = json.loads(message.body)
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        now = datetime.now().isoformat()
+        response = RabbitMQResponse.success_response(200, dict(
+            id=request["user_id"], first_name="John", last_name="Doe", roles=["user"], is_active=True,
+            email="example@gmail.com", phone_number="+1234567890", created_at=now, updated_at=now,
+        ))
+        await channel.default_exchange.publish(
+            Message(json.dumps(response.__dict__).encode(), correlation_id=message.correlation_id),
+            routing_key=message.reply_to,
+        )
+
+    await queue.consume(on_request, no_ack=True)
+
+
+async def run(calls: int, concurrency: int, channels: int, latency_ms: float) -> dict:
+    broker = InMemoryBroker()
+    await start_fake_user_service(broker, latency_ms)
+
+    rpc_client = RabbitMQRPCClient(url="", channel_pool_size=channels, connect=broker.connect)
+    await rpc_client.connect()
+    adapter = RabbitMQUserServiceAdapter(rpc_client, USER_SERVICE_QUEUE)
+
+    latencies_ms = []
+    remaining = iter(range(calls))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await adapter.get_user_by_id(uuid.uuid4())
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    await rpc_client.close()
+    return latency_summary(latencies_ms, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--channels", type=int, default=8)
+    parser.add_argument("--service-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        result = asyncio.run(run(args.calls, concurrency, args.channels, args.service_latency_ms))
+        print(json.dumps(dict(concurrency=concurrency, **result)))
+
+
+if __name__ == "__main__":
+    main()
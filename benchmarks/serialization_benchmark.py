@@ -0,0 +1,150 @@
+"""
+CPU time per response body: the former serialization path of the payment routes against 'api_response'.
+
+legacy - 'to_dict()' splatted into 'APIResponse(content=...)', re-validated and dumped by FastAPI's
+         'serialize_response' against the route's 'response_model', then encoded by 'JSONResponse'
+fast   - 'APIResponse[...]' built without validation and encoded once by pydantic-core ('APIJSONResponse')
+
+Both paths must produce the same JSON document, which is checked before measuring.
+
+Usage:
+    python -m benchmarks.serialization_benchmark --iterations 20000 --batch-size 100
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from starlette.responses import JSONResponse
+
+from src.domain.models.payment_methods import CardPaymentMethod, BankAccountPaymentMethod
+from src.presentation.responses import api_response
+from src.presentation.schemas import APIResponse, AddBankCardBatchItemResponse
+
+MESSAGE = 'Payment method added successfully.'
+
+
+def bank_card() -> CardPaymentMethod:
+    now = datetime.now(timezone.utc)
+    return CardPaymentMethod(
+        user_id=uuid.uuid4(), card_holder_first_name="John", card_holder_last_name="Doe", card_last_four="1111",
+        expiration_date="12/29", payment_token=f"TOKEN-{uuid.uuid4().hex}", balance=Decimal("10000.00"),
+        created_at=now, updated_at=now,
+    )
+
+
+def bank_account() -> BankAccountPaymentMethod:
+    now = datetime.now(timezone.utc)
+    return BankAccountPaymentMethod(
+        company_id=uuid.uuid4(), account_holder_name="OOO Naeb", account_number="KZ233456789012345678",
+        balance=Decimal("10000.00"), created_at=now, updated_at=now,
+    )
+
+
+def legacy_path(response_model: type) -> Callable[[Any], Awaitable[bytes]]:
+    field = create_model_field(name="Response", type_=response_model, mode="serialization")
+
+    async def render(response: APIResponse) -> bytes:
+        content = await serialize_response(field=field, response_content=response)
+        return JSONResponse(content).body
+
+    return render
+
+
+def build_cases(batch_size: int) -> dict[str, tuple[Callable[[], Awaitable[bytes]], Callable[[], Awaitable[bytes]]]]:
+    card = bank_card()
+    account = bank_account()
+    batch = [
+        (index, bank_card() if index % 10 else None, None if index % 10 else "User is not active.")
+        for index in range(batch_size)
+    ]
+    card_model = APIResponse[CardPaymentMethod]
+    account_model = APIResponse[BankAccountPaymentMethod]
+    batch_model = APIResponse[list[AddBankCardBatchItemResponse]]
+    render_card, render_account, render_batch = legacy_path(card_model), legacy_path(account_model), \
+        legacy_path(batch_model)
+
+    async def legacy_card() -> bytes:
+        return await render_card(APIResponse(success=True, message=MESSAGE, content={**card.to_dict()}))
+
+    async def fast_card() -> bytes:
+        return api_response(card_model, content=card, message=MESSAGE, status_code=201).body
+
+    async def legacy_account() -> bytes:
+        return await render_account(APIResponse(success=True, message=MESSAGE, content={**account.to_dict()}))
+
+    async def fast_account() -> bytes:
+        return api_response(account_model, content=account, message=MESSAGE, status_code=201).body
+
+    async def legacy_batch() -> bytes:
+        return await render_batch(APIResponse(success=False, message=MESSAGE, content=[
+            AddBankCardBatchItemResponse(index=index, success=item is not None, content=item, error=error)
+            for index, item, error in batch
+        ]))
+
+    async def fast_batch() -> bytes:
+        return api_response(batch_model, success=False, message=MESSAGE, status_code=207, content=[
+            AddBankCardBatchItemResponse.model_construct(
+                index=index, success=item is not None, content=item, error=error
+            )
+            for index, item, error in batch
+        ]).body
+
+    return {
+        "bank_card": (legacy_card, fast_card),
+        "bank_account": (legacy_account, fast_account),
+        f"bank_card_batch_{batch_size}": (legacy_batch, fast_batch),
+    }
+
+
+async def measure(render: Callable[[], Awaitable[bytes]], iterations: int) -> float:
+    """Mean CPU time of one call, in microseconds."""
+    for _ in range(min(1000, iterations)):
+        await render()
+    started = time.process_time()
+    for _ in range(iterations):
+        await render()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+async def run(iterations: int, batch_size: int) -> list[dict]:
+    results = []
+    for case, (legacy, fast) in build_cases(batch_size).items():
+        legacy_body, fast_body = await legacy(), await fast()
+        if json.loads(legacy_body) != json.loads(fast_body):
+            raise AssertionError(f"The serialization paths disagree on '{case}':\n{legacy_body}\n{fast_body}")
+
+        case_iterations = iterations if "batch" not in case else max(1, iterations // batch_size)
+        legacy_us = await measure(legacy, case_iterations)
+        fast_us = await measure(fast, case_iterations)
+        results.append(dict(
+            case=case,
+            iterations=case_iterations,
+            body_bytes=len(fast_body),
+            legacy_us=round(legacy_us, 2),
+            fast_us=round(fast_us, 2),
+            saved_us=round(legacy_us - fast_us, 2),
+            speedup=round(legacy_us / fast_us, 2),
+        ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="Responses rendered per path (÷ batch size "
+                                                                       "for the batch case).")
+    parser.add_argument("--batch-size", type=int, default=100, help="Cards in the batch response.")
+    args = parser.parse_args()
+
+    for result in asyncio.run(run(args.iterations, args.batch_size)):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
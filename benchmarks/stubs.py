@@ -0,0 +1,75 @@
+"""
+Deterministic stand-ins of the payment gateway and the User/Company services for the benchmarks:
+every call succeeds after a fixed latency, so the measured variance comes from the service itself.
+"""
+import asyncio
+import itertools
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from src.domain.interfaces.company_service_adapter_interface import ICompanyServiceAdapter
+from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
+from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
+from src.domain.models.company_responses import CompanyResponseDTO
+from src.domain.models.user_responses import UserResponseDTO
+from src.domain.schemas import AddBankCardDTO, AddBankAccountDTO
+from src.presentation.schemas import RolesEnum
+
+
+async def _sleep_ms(latency_ms: float) -> None:
+    if latency_ms:
+        await asyncio.sleep(latency_ms / 1000)
+
+
+class StubPaymentGateway(IPaymentGateway):
+    def __init__(self, latency_ms: float = 0.0, token_prefix: str = "BENCH") -> None:
+        self._latency_ms = latency_ms
+        self._token_prefix = token_prefix
+        self._sequence = itertools.count()
+
+    async def get_payment_token(self, payment_method_info: AddBankCardDTO | AddBankAccountDTO) -> str:
+        await _sleep_ms(self._latency_ms)
+        # Payment tokens are unique in the database
+        return f"{self._token_prefix}-{next(self._sequence)}"
+
+    async def get_balance(self, token: str) -> Decimal:
+        await _sleep_ms(self._latency_ms)
+        return Decimal("10000.00")
+
+
+class StubUserServiceAdapter(IUserServiceAdapter):
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self._latency_ms = latency_ms
+
+    async def get_user_by_id(self, user_id: UUID) -> UserResponseDTO:
+        await _sleep_ms(self._latency_ms)
+        now = datetime.now()
+        return UserResponseDTO(
+            id=user_id,
+            first_name="John",
+            last_name="Doe",
+            roles=[RolesEnum.USER],
+            is_active=True,
+            email="example@gmail.com",
+            phone_number="+1234567890",
+            created_at=now,
+            updated_at=now,
+        )
+
+
+class StubCompanyServiceAdapter(ICompanyServiceAdapter):
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self._latency_ms = latency_ms
+
+    async def get_company_by_id(self, company_id: UUID) -> CompanyResponseDTO:
+        await _sleep_ms(self._latency_ms)
+        now = datetime.now()
+        return CompanyResponseDTO(
+            id=company_id,
+            name="OOO \"Naeb\" Ltd.",
+            is_active=True,
+            company_id=company_id,
+            created_at=now,
+            updated_at=now,
+        )
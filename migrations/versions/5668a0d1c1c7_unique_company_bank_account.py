@@ -0,0 +1,40 @@
+"""unique company bank account
+
+Revision ID: 5668a0d1c1c7
+Revises: 0dbbaa42710b
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5668a0d1c1c7'
+down_revision: Union[str, None] = '0dbbaa42710b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The former check-then-insert could register several accounts for a company. Which one to keep is not for
+    # a migration to decide (each has its own payment token and balance), so they must be resolved beforehand.
+    duplicates = op.get_bind().execute(sa.text(
+        'SELECT company_id, count(*) FROM bank_accounts GROUP BY company_id HAVING count(*) > 1 '
+        'ORDER BY company_id LIMIT 10'
+    )).all()
+    if duplicates:
+        companies = ', '.join(f'{company_id} ({count} accounts)' for company_id, count in duplicates)
+        raise RuntimeError(
+            f'Cannot make bank_accounts.company_id unique, some companies have several bank accounts: {companies}'
+            f'{" and more" if len(duplicates) == 10 else ""}. Keep a single account per company and upgrade again.'
+        )
+
+    # The unique index backs both the existence check and 'ON CONFLICT (company_id)' on insert
+    op.create_unique_constraint('uq_bank_accounts_company_id', 'bank_accounts', ['company_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_bank_accounts_company_id', 'bank_accounts', type_='unique')
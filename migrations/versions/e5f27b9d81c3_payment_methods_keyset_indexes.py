@@ -0,0 +1,33 @@
+"""payment methods keyset indexes
+
+Revision ID: e5f27b9d81c3
+Revises: c91d5a7e3b04
+Create Date: 2026-10-18 17:26:44.918402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f27b9d81c3'
+down_revision: Union[str, None] = 'c91d5a7e3b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Match the '(owner, created_at, id)' order of the listings, so a page is read straight off the index
+    op.create_index(
+        'ix_bank_cards_user_id_created_at_id', 'bank_cards', ['user_id', 'created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_bank_accounts_company_id_created_at_id', 'bank_accounts', ['company_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bank_accounts_company_id_created_at_id', table_name='bank_accounts')
+    op.drop_index('ix_bank_cards_user_id_created_at_id', table_name='bank_cards')
@@ -0,0 +1,110 @@
+"""hash partition bank_cards
+
+Revision ID: f3a8c6d19b52
+Revises: e5f27b9d81c3
+Create Date: 2026-10-18 19:02:37.651284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c6d19b52'
+down_revision: Union[str, None] = 'e5f27b9d81c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fixed once the table is partitioned: changing it means repartitioning every row
+PARTITIONS = 16
+
+COLUMNS = (
+    'id, card_holder_first_name, card_holder_last_name, card_last_four, expiration_date, payment_token, balance, '
+    'is_active, user_id, created_at, updated_at'
+)
+
+
+def bank_card_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('card_holder_first_name', sa.String(length=255), nullable=True),
+        sa.Column('card_holder_last_name', sa.String(length=255), nullable=True),
+        sa.Column('card_last_four', sa.String(length=4), nullable=True),
+        sa.Column('expiration_date', sa.String(length=5), nullable=True),
+        sa.Column('payment_token', sa.String(length=255), nullable=False),
+        sa.Column('balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    # The former table keeps its rows until they are copied; its constraint and index names are freed first
+    op.rename_table('bank_cards', 'bank_cards_unpartitioned')
+    op.execute(
+        'ALTER TABLE bank_cards_unpartitioned RENAME CONSTRAINT bank_cards_pkey TO bank_cards_unpartitioned_pkey'
+    )
+    op.execute(
+        'ALTER TABLE bank_cards_unpartitioned '
+        'RENAME CONSTRAINT bank_cards_payment_token_key TO bank_cards_unpartitioned_payment_token_key'
+    )
+    op.execute(
+        'ALTER INDEX ix_bank_cards_user_id_created_at_id RENAME TO ix_bank_cards_unpartitioned_user_id_created_at_id'
+    )
+
+    # Unique constraints of a partitioned table must include the partition key, so the payment tokens are kept
+    # unique across all users by a separate, unpartitioned table
+    op.create_table(
+        'bank_card_payment_tokens',
+        sa.Column('payment_token', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('payment_token', name='bank_card_payment_tokens_pkey'),
+    )
+    op.execute(
+        'INSERT INTO bank_card_payment_tokens (payment_token) SELECT payment_token FROM bank_cards_unpartitioned'
+    )
+    op.create_table(
+        'bank_cards',
+        *bank_card_columns(),
+        sa.PrimaryKeyConstraint('id', 'user_id', name='bank_cards_pkey'),
+        postgresql_partition_by='HASH (user_id)',
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f'CREATE TABLE bank_cards_p{remainder:02d} PARTITION OF bank_cards '
+            f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})'
+        )
+
+    # A single statement, in the migration's transaction. For very large tables, copy the rows in batches
+    # (by 'id' ranges) beforehand, and only the remainder here.
+    op.execute(f'INSERT INTO bank_cards ({COLUMNS}) SELECT {COLUMNS} FROM bank_cards_unpartitioned')
+    # Built once per partition after the copy, rather than maintained row by row during it
+    op.create_index(
+        'ix_bank_cards_user_id_created_at_id', 'bank_cards', ['user_id', 'created_at', 'id'], unique=False
+    )
+    op.drop_table('bank_cards_unpartitioned')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'bank_cards_unpartitioned',
+        *bank_card_columns(),
+        sa.PrimaryKeyConstraint('id', name='bank_cards_unpartitioned_pkey'),
+        sa.UniqueConstraint('payment_token', name='bank_cards_unpartitioned_payment_token_key'),
+    )
+    op.execute(f'INSERT INTO bank_cards_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM bank_cards')
+    op.drop_table('bank_cards')  # Drops the partitions too
+    op.drop_table('bank_card_payment_tokens')
+
+    op.rename_table('bank_cards_unpartitioned', 'bank_cards')
+    op.execute('ALTER TABLE bank_cards RENAME CONSTRAINT bank_cards_unpartitioned_pkey TO bank_cards_pkey')
+    op.execute(
+        'ALTER TABLE bank_cards '
+        'RENAME CONSTRAINT bank_cards_unpartitioned_payment_token_key TO bank_cards_payment_token_key'
+    )
+    op.create_index(
+        'ix_bank_cards_user_id_created_at_id', 'bank_cards', ['user_id', 'created_at', 'id'], unique=False
+    )
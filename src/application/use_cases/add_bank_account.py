@@ -1,9 +1,12 @@
+from typing import Callable
+
 from src.application.exceptions import InactiveCompanyError, CompanyNotFoundError, InvalidPaymentMethodError, \
     ExistingBankAccountError
 from src.core.logger import LoggerService
+from src.core.metrics import timed, USE_CASE_LATENCY
 from src.domain.interfaces.company_service_adapter_interface import ICompanyServiceAdapter
 from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
-from src.domain.interfaces.repositories_interfaces.bank_account_repository_interface import IBankAccountRepository
+from src.domain.interfaces.unit_of_work_interface import IUnitOfWork
 from src.domain.models.payment_methods import BankAccountPaymentMethod
 from src.domain.schemas import AddBankAccountDTO
 from src.infrastructure.exceptions import CompanyServiceError
@@ -16,37 +19,47 @@ class AddBankAccountUseCase:
     def __init__(
             self,
             payment_gateway: IPaymentGateway,
-            bank_account_repository: IBankAccountRepository,
+            unit_of_work_factory: Callable[..., IUnitOfWork],
             company_adapter: ICompanyServiceAdapter,
             logger: LoggerService,
     ) -> None:
         self._payment_gateway = payment_gateway
-        self._bank_account_repository = bank_account_repository
+        self._unit_of_work_factory = unit_of_work_factory
         self._company_adapter = company_adapter
         self._logger = logger
 
+    @timed(USE_CASE_LATENCY, "add_bank_account")
     async def execute(self, bank_account: AddBankAccountDTO) -> BankAccountPaymentMethod:
         try:
             # Check if this company is existing in the system
             company = await self._company_adapter.get_company_by_id(bank_account.company_id)
 
-            # Check if this company already has a bank account in the 'bank_accounts' table
-            bank_account_exists = await self._bank_account_repository.get_by_company_id(bank_account.company_id)
-            if bank_account_exists:
-                self._logger.warning(f"This company - {company.id} already has a bank account.")
-                raise ExistingBankAccountError()
+            async with self._unit_of_work_factory(callers=(bank_account.company_id,)) as uow:
+                # Check if this company already has a bank account in the 'bank_accounts' table
+                bank_account_exists = await uow.bank_accounts.exists_for_company(bank_account.company_id)
+                if bank_account_exists:
+                    self._logger.warning(f"This company - {company.id} already has a bank account.")
+                    raise ExistingBankAccountError()
+
+                # Check if this company is inactive
+                if not company.is_active:
+                    self._logger.warning(f"Company - {company.id} is not active.")
+                    raise InactiveCompanyError(
+                        status_code=403,
+                        message="Company is not active."
+                    )
+
+                bank_account = BankAccountPaymentMethod(**bank_account.to_dict())
 
-            # Check if this company is inactive
-            if not company.is_active:
-                self._logger.warning(f"Company - {company.id} is not active.")
-                raise InactiveCompanyError(
-                    status_code=403,
-                    message="Company is not active."
-                )
+                # A concurrent request may have added an account after the check above
+                created_bank_account = await uow.bank_accounts.create(bank_account)
+                if created_bank_account is None:
+                    self._logger.warning(f"This company - {company.id} already has a bank account.")
+                    raise ExistingBankAccountError()
 
-            bank_account = BankAccountPaymentMethod(**bank_account.to_dict())
+                await uow.commit()
 
-            return await self._bank_account_repository.create(bank_account)
+            return created_bank_account
         except (
                 CompanyServiceError,
                 InactiveCompanyError,
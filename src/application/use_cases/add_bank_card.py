@@ -1,7 +1,14 @@
+import asyncio
+from decimal import Decimal
+from typing import Callable, Tuple
+from uuid import UUID
+
 from src.application.exceptions import UserNotActiveError
+from src.core.logger import LoggerService
+from src.core.metrics import timed, USE_CASE_LATENCY
 from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
 from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
-from src.domain.interfaces.repositories_interfaces.bank_card_repository_interface import IBankCardRepository
+from src.domain.interfaces.unit_of_work_interface import IUnitOfWork
 from src.domain.models.payment_methods import CardPaymentMethod
 from src.domain.schemas import AddBankCardDTO
 
@@ -13,26 +20,33 @@ class AddBankCardUseCase:
     def __init__(
             self,
             payment_gateway: IPaymentGateway,
-            bank_card_repository: IBankCardRepository,
-            user_service_adapter: IUserServiceAdapter
+            unit_of_work_factory: Callable[..., IUnitOfWork],
+            user_service_adapter: IUserServiceAdapter,
+            logger: LoggerService,
     ) -> None:
         self._payment_gateway = payment_gateway
-        self._bank_card_repository = bank_card_repository
+        self._unit_of_work_factory = unit_of_work_factory
         self._user_service_adapter = user_service_adapter
+        self._logger = logger
 
+    @timed(USE_CASE_LATENCY, "add_bank_card")
     async def execute(self, card_info: AddBankCardDTO) -> CardPaymentMethod:
-        token = await self._payment_gateway.get_payment_token(card_info)
-        balance = await self._payment_gateway.get_balance(token)
+        # The user check and the tokenization run concurrently. The first failure cancels the sibling task,
+        # so an unknown or inactive user aborts the in-flight gateway calls instead of waiting for them.
+        # Deliberate trade-off: latency is max(user, gateway) rather than the sum, but the bank may already have
+        # accepted 'POST /tokens' when the cancellation arrives, so a bad user can still cost a tokenization.
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(self._check_user(card_info.user_id))
+                tokenization_task = task_group.create_task(self._tokenize(card_info))
+        except ExceptionGroup as exc_group:
+            # Both tasks may fail before either is cancelled; only the first error is surfaced
+            for exc in exc_group.exceptions[1:]:
+                self._logger.error(f"Adding a bank card for user {card_info.user_id} also failed with: {exc!r}.")
+            # Surface the original error, so it is handled as if the calls were sequential
+            raise exc_group.exceptions[0] from None
 
-        # Check if this user is existing in the system
-        user = await self._user_service_adapter.get_user_by_id(card_info.user_id)
-
-        # Check if this user is inactive
-        if not user.is_active:
-            raise UserNotActiveError(
-                status_code=403,
-                message="User is not active."
-            )
+        token, balance = tokenization_task.result()
 
         card = CardPaymentMethod(
             card_holder_first_name=card_info.card_holder_first_name,
@@ -44,4 +58,25 @@ class AddBankCardUseCase:
             user_id=card_info.user_id
         )
 
-        return await self._bank_card_repository.create(card)
\ No newline at end of file
+        async with self._unit_of_work_factory(callers=(card.user_id,)) as uow:
+            created_card = await uow.bank_cards.create(card)
+            await uow.commit()
+
+        return created_card
+
+    async def _check_user(self, user_id: UUID) -> None:
+        # Check if this user is existing in the system
+        user = await self._user_service_adapter.get_user_by_id(user_id)
+
+        # Check if this user is inactive
+        if not user.is_active:
+            raise UserNotActiveError(
+                status_code=403,
+                message="User is not active."
+            )
+
+    async def _tokenize(self, card_info: AddBankCardDTO) -> Tuple[str, Decimal]:
+        token = await self._payment_gateway.get_payment_token(card_info)
+        balance = await self._payment_gateway.get_balance(token)
+
+        return token, balance
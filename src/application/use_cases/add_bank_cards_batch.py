@@ -0,0 +1,127 @@
+import asyncio
+from typing import Callable, Dict, List, Awaitable, TypeVar
+from uuid import UUID
+
+from src.application.exceptions import UserNotActiveError, ApplicationError
+from src.core.exceptions import PaymentServiceError
+from src.core.metrics import timed, USE_CASE_LATENCY
+from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
+from src.domain.interfaces.unit_of_work_interface import IUnitOfWork
+from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
+from src.domain.models.payment_methods import CardPaymentMethod
+from src.domain.models.user_responses import UserResponseDTO
+from src.domain.schemas import AddBankCardDTO, AddBankCardResult
+from src.infrastructure.exceptions import UserServiceError, PaymentGatewayError
+
+T = TypeVar("T")
+
+
+class AddBankCardsBatchUseCase:
+    """
+    USE CASE: Create many payment methods (bank cards) at once.
+    Cards are tokenized at the payment gateway with a bounded concurrency and stored with a single bulk insert.
+    A failure of one card doesn't affect the others - the outcome is reported per card.
+    """
+
+    def __init__(
+            self,
+            payment_gateway: IPaymentGateway,
+            unit_of_work_factory: Callable[..., IUnitOfWork],
+            user_service_adapter: IUserServiceAdapter,
+            concurrency_limit: int,
+    ) -> None:
+        self._payment_gateway = payment_gateway
+        self._unit_of_work_factory = unit_of_work_factory
+        self._user_service_adapter = user_service_adapter
+        self._concurrency_limit = concurrency_limit
+
+    @timed(USE_CASE_LATENCY, "add_bank_cards_batch")
+    async def execute(self, cards_info: List[AddBankCardDTO]) -> List[AddBankCardResult]:
+        semaphore = asyncio.Semaphore(self._concurrency_limit)
+
+        async def bounded(coroutine: Awaitable[T]) -> T:
+            async with semaphore:
+                return await coroutine
+
+        # Each distinct user is checked only once, no matter how many cards they have in the batch
+        user_ids = list({card_info.user_id for card_info in cards_info})
+        user_outcomes = await self._gather(
+            [bounded(self._get_active_user(user_id)) for user_id in user_ids]
+        )
+        users: Dict[UUID, UserResponseDTO | Exception] = dict(zip(user_ids, user_outcomes))
+
+        async def tokenize(card_info: AddBankCardDTO) -> CardPaymentMethod:
+            user = users[card_info.user_id]
+            if isinstance(user, Exception):
+                raise user
+
+            token = await self._payment_gateway.get_payment_token(card_info)
+            balance = await self._payment_gateway.get_balance(token)
+
+            return CardPaymentMethod(
+                card_holder_first_name=card_info.card_holder_first_name,
+                card_holder_last_name=card_info.card_holder_last_name,
+                card_last_four=card_info.card_number[-4:],  # Last 4 digits of the card number
+                expiration_date=card_info.expiration_date,
+                balance=balance,
+                payment_token=token,
+                user_id=card_info.user_id
+            )
+
+        card_outcomes = await self._gather([bounded(tokenize(card_info)) for card_info in cards_info])
+        tokenized_cards = [outcome for outcome in card_outcomes if isinstance(outcome, CardPaymentMethod)]
+
+        created_cards = []
+        if tokenized_cards:
+            async with self._unit_of_work_factory(callers={card.user_id for card in tokenized_cards}) as uow:
+                created_cards = await uow.bank_cards.create_many(tokenized_cards)
+                await uow.commit()
+
+        # Matched by the (domain-generated) id: of several cards with the same token, only the first one is created
+        created_by_id = {card.id: card for card in created_cards}
+
+        results = []
+        for index, outcome in enumerate(card_outcomes):
+            if isinstance(outcome, Exception):
+                results.append(AddBankCardResult(index=index, error=self._error_message(outcome)))
+            elif outcome.id in created_by_id:
+                results.append(AddBankCardResult(index=index, card=created_by_id[outcome.id]))
+            else:
+                results.append(AddBankCardResult(index=index, error="This bank card is already registered."))
+
+        return results
+
+    async def _get_active_user(self, user_id: UUID) -> UserResponseDTO:
+        user = await self._user_service_adapter.get_user_by_id(user_id)
+
+        if not user.is_active:
+            raise UserNotActiveError(
+                status_code=403,
+                message="User is not active."
+            )
+
+        return user
+
+    @staticmethod
+    def _error_message(exc: Exception) -> str:
+        """Message reported for a failed card: the one of a known error, a generic one otherwise."""
+        if isinstance(exc, (ApplicationError, ValueError)):
+            return str(exc)
+        if isinstance(exc, UserServiceError):
+            # The details of a failed call (transport, broker) are internal
+            return "User Service is unavailable." if exc.status_code >= 500 else str(exc)
+        if isinstance(exc, PaymentGatewayError):
+            return "Payment gateway error."
+        if isinstance(exc, PaymentServiceError):
+            return exc.detail
+        return "Unhandled error occurred in the Payment Service."
+
+    @staticmethod
+    async def _gather(coroutines: List[Awaitable[T]]) -> List[T | Exception]:
+        """Run the coroutines concurrently, returning errors in place of results instead of raising them."""
+        outcomes = await asyncio.gather(*coroutines, return_exceptions=True)
+        for outcome in outcomes:
+            # Cancellation and interpreter exits are not per-item failures
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+        return outcomes
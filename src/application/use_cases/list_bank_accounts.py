@@ -0,0 +1,23 @@
+from typing import Callable, Optional
+from uuid import UUID
+
+from src.core.metrics import timed, USE_CASE_LATENCY
+from src.domain.interfaces.unit_of_work_interface import IUnitOfWork
+from src.domain.models.payment_methods import BankAccountPaymentMethod
+from src.domain.schemas import Page, PageCursor
+
+
+class ListBankAccountsUseCase:
+    """
+    USE CASE: List the payment methods (bank accounts) of a company, page by page, newest first.
+    """
+
+    def __init__(self, unit_of_work_factory: Callable[..., IUnitOfWork]) -> None:
+        self._unit_of_work_factory = unit_of_work_factory
+
+    @timed(USE_CASE_LATENCY, "list_bank_accounts")
+    async def execute(
+            self, company_id: UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[BankAccountPaymentMethod]:
+        async with self._unit_of_work_factory(read_only=True, callers=(company_id,)) as uow:
+            return await uow.bank_accounts.get_by_company_id(company_id, limit, after)
@@ -0,0 +1,21 @@
+from typing import Callable, Optional
+from uuid import UUID
+
+from src.core.metrics import timed, USE_CASE_LATENCY
+from src.domain.interfaces.unit_of_work_interface import IUnitOfWork
+from src.domain.models.payment_methods import CardPaymentMethod
+from src.domain.schemas import Page, PageCursor
+
+
+class ListBankCardsUseCase:
+    """
+    USE CASE: List the payment methods (bank cards) of a user, page by page, newest first.
+    """
+
+    def __init__(self, unit_of_work_factory: Callable[..., IUnitOfWork]) -> None:
+        self._unit_of_work_factory = unit_of_work_factory
+
+    @timed(USE_CASE_LATENCY, "list_bank_cards")
+    async def execute(self, user_id: UUID, limit: int, after: Optional[PageCursor] = None) -> Page[CardPaymentMethod]:
+        async with self._unit_of_work_factory(read_only=True, callers=(user_id,)) as uow:
+            return await uow.bank_cards.get_by_user_id(user_id, limit, after)
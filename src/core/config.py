@@ -1,4 +1,6 @@
+import logging
 import os
+from typing import Optional
 
 from pydantic.v1 import BaseSettings
 
@@ -8,12 +10,144 @@ class Settings(BaseSettings):
     RABBITMQ_PASSWORD: str = os.getenv('RABBITMQ_PASSWORD')
     RABBITMQ_HOST: str = os.getenv('RABBITMQ_HOST')
     RABBITMQ_PORT: int = int(os.getenv('RABBITMQ_PORT', 5672))
+    RABBITMQ_RPC_CHANNEL_POOL_SIZE: int = int(os.getenv('RABBITMQ_RPC_CHANNEL_POOL_SIZE', 8))
+    RABBITMQ_RPC_TIMEOUT: float = float(os.getenv('RABBITMQ_RPC_TIMEOUT', 5))
+
+    # If disabled, the DEV ONLY stub adapters are used instead of the User and Company services
+    USE_RABBITMQ_SERVICE_ADAPTERS: bool = os.getenv('USE_RABBITMQ_SERVICE_ADAPTERS', 'false').lower() == 'true'
+    ENABLE_PAYMENT_COMMANDS_LISTENER: bool = os.getenv('ENABLE_PAYMENT_COMMANDS_LISTENER', 'false').lower() == 'true'
+    PAYMENT_COMMANDS_QUEUE: str = os.getenv('PAYMENT_COMMANDS_QUEUE', 'payment_service_queue')
+    PAYMENT_COMMANDS_PREFETCH_COUNT: int = int(os.getenv('PAYMENT_COMMANDS_PREFETCH_COUNT', 32))
+    PAYMENT_COMMANDS_ACK_BATCH_SIZE: int = int(os.getenv('PAYMENT_COMMANDS_ACK_BATCH_SIZE', 16))
+    PAYMENT_COMMANDS_DRAIN_TIMEOUT: float = float(os.getenv('PAYMENT_COMMANDS_DRAIN_TIMEOUT', 30))
+
+    # With OUTBOX_ENABLED, 'bank_card.added' / 'bank_account.added' events are written to the outbox table with
+    # every change and stay there until a relay (on any instance) publishes them: enable it only along with
+    # ENABLE_OUTBOX_RELAY on at least one instance, or the table grows without bound
+    OUTBOX_ENABLED: bool = os.getenv('OUTBOX_ENABLED', 'false').lower() == 'true'
+    ENABLE_OUTBOX_RELAY: bool = os.getenv('ENABLE_OUTBOX_RELAY', 'false').lower() == 'true'
+    PAYMENT_EVENTS_QUEUE: str = os.getenv('PAYMENT_EVENTS_QUEUE', 'payment_events_queue')
+    OUTBOX_BATCH_SIZE: int = int(os.getenv('OUTBOX_BATCH_SIZE', 500))
+    OUTBOX_POLL_INTERVAL: float = float(os.getenv('OUTBOX_POLL_INTERVAL', 0.5))
+
+    USER_SERVICE_QUEUE: str = os.getenv('USER_SERVICE_QUEUE', 'user_service_queue')
+    COMPANY_SERVICE_QUEUE: str = os.getenv('COMPANY_SERVICE_QUEUE', 'company_service_queue')
 
     DB_USER: str = os.getenv('DB_USER')
     DB_PASSWORD: str = os.getenv('DB_PASSWORD')
     DB_HOST: str = os.getenv('DB_HOST')
     DB_PORT: int = int(os.getenv('DB_PORT', 5432))
     DB_NAME: str = os.getenv('DB_NAME')
+    DB_ECHO: bool = os.getenv('DB_ECHO', 'true').lower() == 'true'
+
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT: float = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_QUERY_INSTRUMENTATION: bool = os.getenv('DB_QUERY_INSTRUMENTATION', 'true').lower() == 'true'
+    DB_SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv('DB_SLOW_QUERY_THRESHOLD_MS', 200))
+
+    # Read replica (same user, password and database name as the primary), unused while 'DB_REPLICA_HOST' is empty.
+    # A caller reads from the primary for 'DB_REPLICA_PIN_DURATION' seconds after its last write.
+    DB_REPLICA_HOST: str = os.getenv('DB_REPLICA_HOST', '')
+    DB_REPLICA_PORT: int = int(os.getenv('DB_REPLICA_PORT', 5432))
+    DB_REPLICA_POOL_SIZE: int = int(os.getenv('DB_REPLICA_POOL_SIZE', 10))
+    DB_REPLICA_MAX_OVERFLOW: int = int(os.getenv('DB_REPLICA_MAX_OVERFLOW', 20))
+    DB_REPLICA_PIN_DURATION: float = float(os.getenv('DB_REPLICA_PIN_DURATION', 5))
+
+    LOG_ASYNC: bool = os.getenv('LOG_ASYNC', 'true').lower() == 'true'
+    LOG_JSON: bool = os.getenv('LOG_JSON', 'false').lower() == 'true'
+    LOG_MAX_BYTES: int = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT: int = int(os.getenv('LOG_BACKUP_COUNT', 5))
+    LOG_ROTATE_WHEN: str = os.getenv('LOG_ROTATE_WHEN', '')
+    LOG_QUEUE_SIZE: int = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+    # Responses replayed for a repeated 'Idempotency-Key' header (seconds)
+    IDEMPOTENCY_TTL: float = float(os.getenv('IDEMPOTENCY_TTL', 24 * 60 * 60))
+    IDEMPOTENCY_LOCK_TIMEOUT: float = float(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+    IDEMPOTENCY_WAIT_TIMEOUT: float = float(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT', 10))
+    IDEMPOTENCY_MEMORY_MAX_SIZE: int = int(os.getenv('IDEMPOTENCY_MEMORY_MAX_SIZE', 10000))
+    IDEMPOTENCY_PURGE_INTERVAL: float = float(os.getenv('IDEMPOTENCY_PURGE_INTERVAL', 300))
+
+    # Bank API behind 'HTTPBankPaymentGateway' (empty = the built-in stub gateway), timeouts in seconds
+    BANK_API_URL: str = os.getenv('BANK_API_URL', '')
+    BANK_API_KEY: str = os.getenv('BANK_API_KEY', '')
+    BANK_API_CONNECT_TIMEOUT: float = float(os.getenv('BANK_API_CONNECT_TIMEOUT', 1))
+    BANK_API_READ_TIMEOUT: float = float(os.getenv('BANK_API_READ_TIMEOUT', 5))
+    BANK_API_CALL_TIMEOUT: float = float(os.getenv('BANK_API_CALL_TIMEOUT', 10))
+    BANK_API_MAX_CONNECTIONS: int = int(os.getenv('BANK_API_MAX_CONNECTIONS', 100))
+    BANK_API_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv('BANK_API_MAX_KEEPALIVE_CONNECTIONS', 20))
+    BANK_API_KEEPALIVE_EXPIRY: float = float(os.getenv('BANK_API_KEEPALIVE_EXPIRY', 30))
+    BANK_API_MAX_ATTEMPTS: int = int(os.getenv('BANK_API_MAX_ATTEMPTS', 3))
+    BANK_API_BACKOFF_BASE: float = float(os.getenv('BANK_API_BACKOFF_BASE', 0.05))
+    BANK_API_BACKOFF_CAP: float = float(os.getenv('BANK_API_BACKOFF_CAP', 1))
+    # Retries allowed on top of the calls: 'ratio' of them, but at least 'min per second'
+    BANK_API_RETRY_BUDGET_RATIO: float = float(os.getenv('BANK_API_RETRY_BUDGET_RATIO', 0.1))
+    BANK_API_RETRY_BUDGET_MIN_PER_SECOND: float = float(os.getenv('BANK_API_RETRY_BUDGET_MIN_PER_SECOND', 5))
+    BANK_API_BREAKER_FAILURE_RATE: float = float(os.getenv('BANK_API_BREAKER_FAILURE_RATE', 0.5))
+    BANK_API_BREAKER_MINIMUM_CALLS: int = int(os.getenv('BANK_API_BREAKER_MINIMUM_CALLS', 20))
+    BANK_API_BREAKER_WINDOW: float = float(os.getenv('BANK_API_BREAKER_WINDOW', 10))
+    BANK_API_BREAKER_OPEN_DURATION: float = float(os.getenv('BANK_API_BREAKER_OPEN_DURATION', 5))
+
+    # Latency, errors and timeouts injected into the external calls, for load tests only (empty = none).
+    # See 'FaultInjector.from_spec', e.g. 'latency=lognormal:20:0.8;errors=UserServiceError/503:0.01;timeout_ms=500'
+    FAULT_INJECTION_PAYMENT_GATEWAY: str = os.getenv('FAULT_INJECTION_PAYMENT_GATEWAY', '')
+    FAULT_INJECTION_USER_SERVICE: str = os.getenv('FAULT_INJECTION_USER_SERVICE', '')
+    FAULT_INJECTION_COMPANY_SERVICE: str = os.getenv('FAULT_INJECTION_COMPANY_SERVICE', '')
+
+    # Latency of every HTTP request, use case, gateway/adapter and repository call, exposed on '/metrics'
+    METRICS_ENABLED: bool = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # Comma-separated IPv4/IPv6 networks in CIDR notation
+    ALLOWED_CLIENT_NETWORKS: str = os.getenv('ALLOWED_CLIENT_NETWORKS', '127.0.0.1/32,::1/128')
+    TRUSTED_PROXY_NETWORKS: str = os.getenv('TRUSTED_PROXY_NETWORKS', '')
+    IP_FILTER_CACHE_SIZE: int = int(os.getenv('IP_FILTER_CACHE_SIZE', 4096))
+
+    BANK_CARD_BATCH_MAX_SIZE: int = int(os.getenv('BANK_CARD_BATCH_MAX_SIZE', 5000))
+    BANK_CARD_BATCH_CONCURRENCY: int = int(os.getenv('BANK_CARD_BATCH_CONCURRENCY', 20))
+
+    # Balance snapshots per payment token (seconds): served fresh, then stale while being refreshed in the background.
+    # Tokens read 'HOT_MIN_READS' times are refreshed once 'REFRESH_AHEAD' of the fresh TTL has passed.
+    BALANCE_CACHE_MAX_SIZE: int = int(os.getenv('BALANCE_CACHE_MAX_SIZE', 100000))
+    BALANCE_CACHE_FRESH_TTL: float = float(os.getenv('BALANCE_CACHE_FRESH_TTL', 60))
+    BALANCE_CACHE_STALE_TTL: float = float(os.getenv('BALANCE_CACHE_STALE_TTL', 300))
+    BALANCE_CACHE_REFRESH_AHEAD: float = float(os.getenv('BALANCE_CACHE_REFRESH_AHEAD', 0.8))
+    BALANCE_CACHE_HOT_MIN_READS: int = int(os.getenv('BALANCE_CACHE_HOT_MIN_READS', 2))
+    BALANCE_CACHE_REFRESH_INTERVAL: float = float(os.getenv('BALANCE_CACHE_REFRESH_INTERVAL', 1))
+    BALANCE_CACHE_MAX_REFRESHES_PER_SECOND: float = float(os.getenv('BALANCE_CACHE_MAX_REFRESHES_PER_SECOND', 50))
+
+    # Bulkheads (calls in flight, seconds a call may queue for a slot) and circuit breakers of the User/Company services
+    USER_SERVICE_MAX_CONCURRENT_CALLS: int = int(os.getenv('USER_SERVICE_MAX_CONCURRENT_CALLS', 50))
+    USER_SERVICE_BULKHEAD_MAX_WAIT: float = float(os.getenv('USER_SERVICE_BULKHEAD_MAX_WAIT', 0.5))
+    USER_SERVICE_BREAKER_FAILURE_RATE: float = float(os.getenv('USER_SERVICE_BREAKER_FAILURE_RATE', 0.5))
+    USER_SERVICE_BREAKER_MINIMUM_CALLS: int = int(os.getenv('USER_SERVICE_BREAKER_MINIMUM_CALLS', 20))
+    USER_SERVICE_BREAKER_OPEN_DURATION: float = float(os.getenv('USER_SERVICE_BREAKER_OPEN_DURATION', 5))
+    COMPANY_SERVICE_MAX_CONCURRENT_CALLS: int = int(os.getenv('COMPANY_SERVICE_MAX_CONCURRENT_CALLS', 20))
+    COMPANY_SERVICE_BULKHEAD_MAX_WAIT: float = float(os.getenv('COMPANY_SERVICE_BULKHEAD_MAX_WAIT', 0.5))
+    COMPANY_SERVICE_BREAKER_FAILURE_RATE: float = float(os.getenv('COMPANY_SERVICE_BREAKER_FAILURE_RATE', 0.5))
+    COMPANY_SERVICE_BREAKER_MINIMUM_CALLS: int = int(os.getenv('COMPANY_SERVICE_BREAKER_MINIMUM_CALLS', 20))
+    COMPANY_SERVICE_BREAKER_OPEN_DURATION: float = float(os.getenv('COMPANY_SERVICE_BREAKER_OPEN_DURATION', 5))
+
+    # Payment methods per page of the listings
+    PAGE_DEFAULT_LIMIT: int = int(os.getenv('PAGE_DEFAULT_LIMIT', 20))
+    PAGE_MAX_LIMIT: int = int(os.getenv('PAGE_MAX_LIMIT', 100))
+
+    # Bank cards/accounts read by ID, cached in process (seconds bound the staleness of other instances' writes)
+    BANK_CARD_REPOSITORY_CACHE_ENABLED: bool = os.getenv('BANK_CARD_REPOSITORY_CACHE_ENABLED', 'true').lower() == 'true'
+    BANK_CARD_REPOSITORY_CACHE_MAX_SIZE: int = int(os.getenv('BANK_CARD_REPOSITORY_CACHE_MAX_SIZE', 50000))
+    BANK_CARD_REPOSITORY_CACHE_TTL: float = float(os.getenv('BANK_CARD_REPOSITORY_CACHE_TTL', 30))
+    BANK_ACCOUNT_REPOSITORY_CACHE_ENABLED: bool = \
+        os.getenv('BANK_ACCOUNT_REPOSITORY_CACHE_ENABLED', 'true').lower() == 'true'
+    BANK_ACCOUNT_REPOSITORY_CACHE_MAX_SIZE: int = int(os.getenv('BANK_ACCOUNT_REPOSITORY_CACHE_MAX_SIZE', 10000))
+    BANK_ACCOUNT_REPOSITORY_CACHE_TTL: float = float(os.getenv('BANK_ACCOUNT_REPOSITORY_CACHE_TTL', 30))
+
+    USER_CACHE_MAX_SIZE: int = int(os.getenv('USER_CACHE_MAX_SIZE', 10000))
+    USER_CACHE_TTL: float = float(os.getenv('USER_CACHE_TTL', 30))
+    USER_CACHE_NEGATIVE_TTL: float = float(os.getenv('USER_CACHE_NEGATIVE_TTL', 5))
+    COMPANY_CACHE_MAX_SIZE: int = int(os.getenv('COMPANY_CACHE_MAX_SIZE', 10000))
+    COMPANY_CACHE_TTL: float = float(os.getenv('COMPANY_CACHE_TTL', 30))
+    COMPANY_CACHE_NEGATIVE_TTL: float = float(os.getenv('COMPANY_CACHE_NEGATIVE_TTL', 5))
 
     @property
     def SCOPES(self) -> dict:
@@ -25,6 +159,17 @@ class Settings(BaseSettings):
 
         return scopes_dict
 
+    @property
+    def LOG_SAMPLING(self) -> dict:
+        """Fraction of records to keep per level, from e.g. 'DEBUG:0.01,INFO:0.5'."""
+        sampling_dict = {}
+        sampling_from_env_variables = os.getenv("LOG_SAMPLING", "")
+        for level_rate in filter(None, sampling_from_env_variables.split(',')):
+            level_name, rate = level_rate.split(':')
+            sampling_dict[logging.getLevelName(level_name.strip().upper())] = float(rate)
+
+        return sampling_dict
+
     @property
     def RABBITMQ_URL(self) -> str:
         return f'amqp://{self.RABBITMQ_LOGIN}:{self.RABBITMQ_PASSWORD}@{self.RABBITMQ_HOST}:{self.RABBITMQ_PORT}/'
@@ -33,5 +178,12 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
 
+    @property
+    def REPLICA_DATABASE_URL(self) -> Optional[str]:
+        if not self.DB_REPLICA_HOST:
+            return None
+        return (f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT}'
+                f'/{self.DB_NAME}')
+
 
 settings = Settings()
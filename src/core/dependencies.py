@@ -1,49 +1,367 @@
+import logging
+from functools import partial
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from starlette.requests import Request
 
 from src.application.use_cases.add_bank_account import AddBankAccountUseCase
 from src.application.use_cases.add_bank_card import AddBankCardUseCase
+from src.application.use_cases.add_bank_cards_batch import AddBankCardsBatchUseCase
+from src.application.use_cases.list_bank_accounts import ListBankAccountsUseCase
+from src.application.use_cases.list_bank_cards import ListBankCardsUseCase
+from src.core.config import settings
 from src.core.logger import LoggerService
+from src.core.metrics import metrics, instrument
+from src.domain.interfaces.company_service_adapter_interface import ICompanyServiceAdapter
+from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
+from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
 from src.infrastructure.adapters.bank_payment_gateway import BankPaymentGateway
+from src.infrastructure.adapters.cached_balance_payment_gateway import CachedBalancePaymentGateway
+from src.infrastructure.adapters.cached_company_service_adapter import CachedCompanyServiceAdapter
+from src.infrastructure.adapters.cached_user_service_adapter import CachedUserServiceAdapter
 from src.infrastructure.adapters.company_service_adapter import CompanyServiceAdapter
+from src.infrastructure.adapters.fault_injecting_company_service_adapter import FaultInjectingCompanyServiceAdapter
+from src.infrastructure.adapters.fault_injecting_payment_gateway import FaultInjectingPaymentGateway
+from src.infrastructure.adapters.fault_injecting_user_service_adapter import FaultInjectingUserServiceAdapter
+from src.infrastructure.adapters.http_bank_payment_gateway import HTTPBankPaymentGateway
+from src.infrastructure.adapters.rabbitmq_company_service_adapter import RabbitMQCompanyServiceAdapter
+from src.infrastructure.adapters.rabbitmq_user_service_adapter import RabbitMQUserServiceAdapter
+from src.infrastructure.adapters.resilient_company_service_adapter import ResilientCompanyServiceAdapter
+from src.infrastructure.adapters.resilient_user_service_adapter import ResilientUserServiceAdapter
 from src.infrastructure.adapters.user_service_adapter import UserServiceAdapter
-from src.infrastructure.database.database import get_async_session
-from src.infrastructure.repositories.bank_account_repository import BankAccountRepository
-from src.infrastructure.repositories.bank_card_repository import BankCardRepository
+from src.infrastructure.cache.balance_snapshot_cache import BalanceSnapshotCache
+from src.infrastructure.cache.repository_cache import RepositoryCache
+from src.infrastructure.database.database import async_session_maker, engine, collect_pool_metrics, \
+    replica_engine, replica_session_maker, get_replica_pool_usage
+from src.infrastructure.database.replica_router import ReplicaRouter
+from src.infrastructure.database.query_instrumentation import QueryInstrumentation
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.fault_injection.fault_injector import FaultInjector
+from src.infrastructure.idempotency.idempotency_store import IdempotencyStore
+from src.infrastructure.messaging.outbox_relay import OutboxRelay
+from src.infrastructure.messaging.rabbitmq_rpc_client import RabbitMQRPCClient
+from src.infrastructure.resilience.bulkhead import Bulkhead
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from src.infrastructure.resilience.retry_budget import RetryBudget
+from src.presentation.messaging.payment_commands_listener import PaymentCommandsListener
+
+
+async def setup_dependencies(
+        database_engine: AsyncEngine = engine,
+        payment_gateway: Optional[IPaymentGateway] = None,
+        user_service_adapter: Optional[IUserServiceAdapter] = None,
+        company_service_adapter: Optional[ICompanyServiceAdapter] = None,
+        logger: Optional[LoggerService] = None,
+):
+    """
+    Initialize all dependencies.
+
+    The database, the external services and the logger can be replaced (e.g. by the benchmarks). A replaced
+    service still gets the fault injection, resilience, caching and instrumentation layers of the real one.
+    """
+    session_maker = async_session_maker if database_engine is engine else async_sessionmaker(
+        database_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    http_payment_gateway = None
+    if payment_gateway is None and settings.BANK_API_URL:
+        http_payment_gateway = HTTPBankPaymentGateway(
+            settings.BANK_API_URL,
+            api_key=settings.BANK_API_KEY,
+            connect_timeout=settings.BANK_API_CONNECT_TIMEOUT,
+            read_timeout=settings.BANK_API_READ_TIMEOUT,
+            call_timeout=settings.BANK_API_CALL_TIMEOUT,
+            max_connections=settings.BANK_API_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.BANK_API_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.BANK_API_KEEPALIVE_EXPIRY,
+            max_attempts=settings.BANK_API_MAX_ATTEMPTS,
+            backoff_base=settings.BANK_API_BACKOFF_BASE,
+            backoff_cap=settings.BANK_API_BACKOFF_CAP,
+            retry_budget=RetryBudget(
+                ratio=settings.BANK_API_RETRY_BUDGET_RATIO,
+                min_retries_per_second=settings.BANK_API_RETRY_BUDGET_MIN_PER_SECOND,
+            ),
+            circuit_breaker=CircuitBreaker(
+                failure_rate_threshold=settings.BANK_API_BREAKER_FAILURE_RATE,
+                minimum_calls=settings.BANK_API_BREAKER_MINIMUM_CALLS,
+                window=settings.BANK_API_BREAKER_WINDOW,
+                open_duration=settings.BANK_API_BREAKER_OPEN_DURATION,
+            ),
+        )
+    payment_method_gateway = payment_gateway or http_payment_gateway or BankPaymentGateway()
+    if settings.FAULT_INJECTION_PAYMENT_GATEWAY:
+        payment_method_gateway = FaultInjectingPaymentGateway(
+            payment_method_gateway, FaultInjector.from_spec(settings.FAULT_INJECTION_PAYMENT_GATEWAY)
+        )
+    payment_method_gateway = instrument(payment_method_gateway, "payment_gateway", settings.METRICS_ENABLED)
+
+    rpc_client = None
+    if user_service_adapter is not None and company_service_adapter is not None:
+        upstream_user_service_adapter = user_service_adapter
+        upstream_company_service_adapter = company_service_adapter
+    elif settings.USE_RABBITMQ_SERVICE_ADAPTERS:
+        rpc_client = RabbitMQRPCClient(
+            settings.RABBITMQ_URL,
+            channel_pool_size=settings.RABBITMQ_RPC_CHANNEL_POOL_SIZE,
+            default_timeout=settings.RABBITMQ_RPC_TIMEOUT,
+        )
+        await rpc_client.connect()
+        upstream_user_service_adapter = user_service_adapter or RabbitMQUserServiceAdapter(
+            rpc_client, settings.USER_SERVICE_QUEUE
+        )
+        upstream_company_service_adapter = company_service_adapter or RabbitMQCompanyServiceAdapter(
+            rpc_client, settings.COMPANY_SERVICE_QUEUE
+        )
+    else:
+        upstream_user_service_adapter = user_service_adapter or UserServiceAdapter()
+        upstream_company_service_adapter = company_service_adapter or CompanyServiceAdapter()
+
+    # Faults are injected below the caches, where the real remote calls happen
+    if settings.FAULT_INJECTION_USER_SERVICE:
+        upstream_user_service_adapter = FaultInjectingUserServiceAdapter(
+            upstream_user_service_adapter, FaultInjector.from_spec(settings.FAULT_INJECTION_USER_SERVICE)
+        )
+    if settings.FAULT_INJECTION_COMPANY_SERVICE:
+        upstream_company_service_adapter = FaultInjectingCompanyServiceAdapter(
+            upstream_company_service_adapter, FaultInjector.from_spec(settings.FAULT_INJECTION_COMPANY_SERVICE)
+        )
+
+    # Also below the caches: cache hits must not take a bulkhead slot, nor be rejected by an open circuit
+    upstream_user_service_adapter = ResilientUserServiceAdapter(
+        upstream_user_service_adapter,
+        Bulkhead(settings.USER_SERVICE_MAX_CONCURRENT_CALLS, max_wait=settings.USER_SERVICE_BULKHEAD_MAX_WAIT),
+        CircuitBreaker(
+            failure_rate_threshold=settings.USER_SERVICE_BREAKER_FAILURE_RATE,
+            minimum_calls=settings.USER_SERVICE_BREAKER_MINIMUM_CALLS,
+            open_duration=settings.USER_SERVICE_BREAKER_OPEN_DURATION,
+        ),
+    )
+    upstream_company_service_adapter = ResilientCompanyServiceAdapter(
+        upstream_company_service_adapter,
+        Bulkhead(settings.COMPANY_SERVICE_MAX_CONCURRENT_CALLS, max_wait=settings.COMPANY_SERVICE_BULKHEAD_MAX_WAIT),
+        CircuitBreaker(
+            failure_rate_threshold=settings.COMPANY_SERVICE_BREAKER_FAILURE_RATE,
+            minimum_calls=settings.COMPANY_SERVICE_BREAKER_MINIMUM_CALLS,
+            open_duration=settings.COMPANY_SERVICE_BREAKER_OPEN_DURATION,
+        ),
+    )
+
+    cached_user_service_adapter = CachedUserServiceAdapter(
+        upstream_user_service_adapter,
+        max_size=settings.USER_CACHE_MAX_SIZE,
+        ttl=settings.USER_CACHE_TTL,
+        negative_ttl=settings.USER_CACHE_NEGATIVE_TTL,
+    )
+    user_service_adapter = instrument(cached_user_service_adapter, "user_service", settings.METRICS_ENABLED)
+    logger = logger or LoggerService(
+        __name__,
+        "payment_service_log.log",
+        async_mode=settings.LOG_ASYNC,
+        json_format=settings.LOG_JSON,
+        max_bytes=settings.LOG_MAX_BYTES,
+        backup_count=settings.LOG_BACKUP_COUNT,
+        rotate_when=settings.LOG_ROTATE_WHEN or None,
+        sampling=settings.LOG_SAMPLING,
+        queue_size=settings.LOG_QUEUE_SIZE,
+        capture_loggers=("sqlalchemy.engine",),
+    )
+
+    query_instrumentation = None
+    if settings.DB_QUERY_INSTRUMENTATION:
+        # Slow queries go to their own file, apart from the application log
+        slow_query_logger = LoggerService(
+            "payment_service.slow_queries",
+            "slow_queries.log",
+            console_level=logging.WARNING,
+            file_level=logging.WARNING,
+            async_mode=settings.LOG_ASYNC,
+            json_format=settings.LOG_JSON,
+            max_bytes=settings.LOG_MAX_BYTES,
+            backup_count=settings.LOG_BACKUP_COUNT,
+            rotate_when=settings.LOG_ROTATE_WHEN or None,
+            queue_size=settings.LOG_QUEUE_SIZE,
+        )
+        query_instrumentation = QueryInstrumentation(settings.DB_SLOW_QUERY_THRESHOLD_MS, slow_query_logger)
+        query_instrumentation.attach(database_engine)
+        if replica_engine is not None:
+            query_instrumentation.attach(replica_engine)
 
+    cached_company_service_adapter = CachedCompanyServiceAdapter(
+        upstream_company_service_adapter,
+        max_size=settings.COMPANY_CACHE_MAX_SIZE,
+        ttl=settings.COMPANY_CACHE_TTL,
+        negative_ttl=settings.COMPANY_CACHE_NEGATIVE_TTL,
+    )
+    rabbitmq_company_adapter = instrument(cached_company_service_adapter, "company_service", settings.METRICS_ENABLED)
 
-async def setup_dependencies():
-    """Initialize all dependencies."""
-    payment_method_gateway = BankPaymentGateway()
-    user_service_adapter = UserServiceAdapter()
-    logger = LoggerService(__name__, "payment_service_log.log")
-    async_session = await get_async_session().__anext__()
-    rabbitmq_company_adapter = CompanyServiceAdapter()
+    # Above the instrumentation, so the 'payment_gateway' stage latencies are those of the real bank calls
+    balance_cache = BalanceSnapshotCache(
+        logger,
+        max_size=settings.BALANCE_CACHE_MAX_SIZE,
+        fresh_ttl=settings.BALANCE_CACHE_FRESH_TTL,
+        stale_ttl=settings.BALANCE_CACHE_STALE_TTL,
+        refresh_ahead=settings.BALANCE_CACHE_REFRESH_AHEAD,
+        hot_min_reads=settings.BALANCE_CACHE_HOT_MIN_READS,
+        max_refreshes_per_second=settings.BALANCE_CACHE_MAX_REFRESHES_PER_SECOND,
+    )
+    balance_cache.start_refreshing(settings.BALANCE_CACHE_REFRESH_INTERVAL)
+    payment_method_gateway = CachedBalancePaymentGateway(payment_method_gateway, balance_cache)
 
-    bank_card_repository = BankCardRepository(async_session)
-    bank_account_repository = BankAccountRepository(async_session)
+    # Every use case execution opens its own unit of work (and session), so concurrent requests don't share one
+    # Each repository's cache can be switched off on its own, the unit of work then reads it from Postgres
+    bank_card_repository_cache = RepositoryCache(
+        max_size=settings.BANK_CARD_REPOSITORY_CACHE_MAX_SIZE, ttl=settings.BANK_CARD_REPOSITORY_CACHE_TTL
+    ) if settings.BANK_CARD_REPOSITORY_CACHE_ENABLED else None
+    bank_account_repository_cache = RepositoryCache(
+        max_size=settings.BANK_ACCOUNT_REPOSITORY_CACHE_MAX_SIZE, ttl=settings.BANK_ACCOUNT_REPOSITORY_CACHE_TTL
+    ) if settings.BANK_ACCOUNT_REPOSITORY_CACHE_ENABLED else None
+    replica_router = ReplicaRouter(
+        replica_session_maker, pin_duration=settings.DB_REPLICA_PIN_DURATION
+    ) if replica_session_maker is not None else None
+    unit_of_work_factory = partial(
+        SQLAlchemyUnitOfWork,
+        session_maker,
+        instrumented=settings.METRICS_ENABLED,
+        bank_card_cache=bank_card_repository_cache,
+        bank_account_cache=bank_account_repository_cache,
+        replica_router=replica_router,
+        balance_gateway=payment_method_gateway,
+    )
 
-    add_bank_card_use_case = AddBankCardUseCase(payment_method_gateway, bank_card_repository, user_service_adapter)
+    add_bank_card_use_case = AddBankCardUseCase(
+        payment_method_gateway, unit_of_work_factory, user_service_adapter, logger
+    )
+    add_bank_cards_batch_use_case = AddBankCardsBatchUseCase(
+        payment_method_gateway, unit_of_work_factory, user_service_adapter, settings.BANK_CARD_BATCH_CONCURRENCY
+    )
     add_bank_account_use_case = AddBankAccountUseCase(
-        payment_method_gateway, bank_account_repository, rabbitmq_company_adapter, logger
+        payment_method_gateway, unit_of_work_factory, rabbitmq_company_adapter, logger
     )
 
+    payment_commands_listener = None
+    if settings.ENABLE_PAYMENT_COMMANDS_LISTENER:
+        payment_commands_listener = PaymentCommandsListener(
+            settings.RABBITMQ_URL,
+            settings.PAYMENT_COMMANDS_QUEUE,
+            add_bank_card_use_case,
+            add_bank_account_use_case,
+            logger,
+            prefetch_count=settings.PAYMENT_COMMANDS_PREFETCH_COUNT,
+            ack_batch_size=settings.PAYMENT_COMMANDS_ACK_BATCH_SIZE,
+        )
+        await payment_commands_listener.connect()
+        await payment_commands_listener.start_listening()
+
+    outbox_relay = None
+    if settings.ENABLE_OUTBOX_RELAY:
+        outbox_relay = OutboxRelay(
+            settings.RABBITMQ_URL,
+            settings.PAYMENT_EVENTS_QUEUE,
+            session_maker,
+            logger,
+            batch_size=settings.OUTBOX_BATCH_SIZE,
+            poll_interval=settings.OUTBOX_POLL_INTERVAL,
+        )
+        await outbox_relay.connect()
+        outbox_relay.start()
+
+    idempotency_store = IdempotencyStore(
+        session_maker,
+        logger,
+        ttl=settings.IDEMPOTENCY_TTL,
+        lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT,
+        memory_max_size=settings.IDEMPOTENCY_MEMORY_MAX_SIZE,
+    )
+    idempotency_store.start_purging(settings.IDEMPOTENCY_PURGE_INTERVAL)
+
+    metrics.register_collector("db_pool", partial(collect_pool_metrics, database_engine))
+
     dependencies = {
         "add_bank_card_use_case": add_bank_card_use_case,
+        "add_bank_cards_batch_use_case": add_bank_cards_batch_use_case,
         "add_bank_account_use_case": add_bank_account_use_case,
+        "list_bank_cards_use_case": ListBankCardsUseCase(unit_of_work_factory),
+        "list_bank_accounts_use_case": ListBankAccountsUseCase(unit_of_work_factory),
+        "user_service_adapter": cached_user_service_adapter,
+        "company_service_adapter": cached_company_service_adapter,
+        "http_payment_gateway": http_payment_gateway,
+        "dependency_guards": {
+            "user_service": upstream_user_service_adapter.guard,
+            "company_service": upstream_company_service_adapter.guard,
+        },
+        "balance_cache": balance_cache,
+        "bank_card_repository_cache": bank_card_repository_cache,
+        "bank_account_repository_cache": bank_account_repository_cache,
+        "replica_router": replica_router,
+        "rpc_client": rpc_client,
+        "payment_commands_listener": payment_commands_listener,
+        "outbox_relay": outbox_relay,
+        "query_instrumentation": query_instrumentation,
+        "idempotency_store": idempotency_store,
+        "database_engine": database_engine,
         "logger": logger
     }
 
     return dependencies
 
 
+async def shutdown_dependencies(dependencies: dict) -> None:
+    """Release the resources acquired by 'setup_dependencies'."""
+    # Commands being processed still need the RPC client and the database, so they are drained first
+    if dependencies["payment_commands_listener"] is not None:
+        await dependencies["payment_commands_listener"].stop(drain_timeout=settings.PAYMENT_COMMANDS_DRAIN_TIMEOUT)
+
+    if dependencies["rpc_client"] is not None:
+        await dependencies["rpc_client"].close()
+
+    if dependencies["outbox_relay"] is not None:
+        await dependencies["outbox_relay"].stop()
+
+    await dependencies["idempotency_store"].close()
+    await dependencies["balance_cache"].close()
+
+    if dependencies["http_payment_gateway"] is not None:
+        await dependencies["http_payment_gateway"].close()
+
+    database_engine = dependencies["database_engine"]
+    dependencies["logger"].info(f"Database pool usage on shutdown: {database_engine.pool.usage()}")
+    if replica_engine is not None:
+        dependencies["logger"].info(f"Replica pool usage on shutdown: {get_replica_pool_usage()}")
+    query_instrumentation = dependencies["query_instrumentation"]
+    if query_instrumentation is not None:
+        dependencies["logger"].info(f"Database statements on shutdown: {query_instrumentation.snapshot()['statements']}")
+        query_instrumentation.detach()
+        query_instrumentation.slow_query_logger.close()
+    metrics.unregister_collector("db_pool")
+    await database_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+    dependencies["logger"].close()
+
+
 def get_add_bank_card_use_case(request: Request) -> AddBankCardUseCase:
     return request.app.state.dependencies["add_bank_card_use_case"]
 
 
+def get_add_bank_cards_batch_use_case(request: Request) -> AddBankCardsBatchUseCase:
+    return request.app.state.dependencies["add_bank_cards_batch_use_case"]
+
+
 def get_add_bank_account_use_case(request: Request) -> AddBankAccountUseCase:
     return request.app.state.dependencies["add_bank_account_use_case"]
 
 
+def get_list_bank_cards_use_case(request: Request) -> ListBankCardsUseCase:
+    return request.app.state.dependencies["list_bank_cards_use_case"]
+
+
+def get_list_bank_accounts_use_case(request: Request) -> ListBankAccountsUseCase:
+    return request.app.state.dependencies["list_bank_accounts_use_case"]
+
+
 def get_logger(request: Request) -> LoggerService:
     return request.app.state.dependencies["logger"]
 
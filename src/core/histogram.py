@@ -0,0 +1,54 @@
+import bisect
+from typing import Optional, Sequence
+
+# Upper bounds (in milliseconds) of the latency buckets
+DEFAULT_LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of observed values (e.g. latencies in milliseconds).
+    Recording is a bisect and a few integer increments, so it is cheap enough for every request.
+    """
+
+    __slots__ = ("buckets", "bucket_counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS) -> None:
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        # The last bucket counts the values above the highest bound
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket containing the given fraction of the observations."""
+        if not self.count:
+            return None
+        threshold = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            seen += bucket_count
+            if seen >= threshold:
+                return float(bound)
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return dict(
+            count=self.count,
+            mean=round(self.sum / self.count, 3) if self.count else 0.0,
+            max=round(self.max, 3),
+            p50=self.percentile(0.50),
+            p95=self.percentile(0.95),
+            p99=self.percentile(0.99),
+        )
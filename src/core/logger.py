@@ -1,6 +1,74 @@
+import json
 import logging
 import os
-from logging import Logger, Formatter, StreamHandler, FileHandler
+import queue
+import random
+from datetime import datetime, timezone
+from logging import Logger, Formatter, StreamHandler, FileHandler, Handler, LogRecord
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Iterable, Optional
+
+# Background writers of the loggers created in the asynchronous mode, by logger name
+_queue_listeners: dict[str, QueueListener] = {}
+
+
+class JSONFormatter(Formatter):
+    """Formats every record as a single-line JSON object."""
+
+    def format(self, record: LogRecord) -> str:
+        entry = dict(
+            timestamp=datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            level=record.levelname,
+            logger=record.name,
+            message=record.getMessage(),
+        )
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Lets through only the given fraction of records of each level, e.g. {logging.DEBUG: 0.01}."""
+
+    def __init__(self, rates: dict[int, float]) -> None:
+        super().__init__()
+        self._rates = rates
+
+    def filter(self, record: LogRecord) -> bool:
+        rate = self._rates.get(record.levelno)
+        return rate is None or random.random() < rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps the caller's work to a minimum: records are handed over unformatted,
+    and dropped instead of blocking the caller when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # The arguments may change after the call returns, so only they are merged into the message here.
+        # Formatting is left to the background thread's handlers.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _BlockingStopQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room in a full queue instead of failing."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 class LoggerService:
@@ -13,7 +81,15 @@ class LoggerService:
             date_format: str = '%Y-%m-%d %H:%M:%S',
             console_level: int = logging.INFO,
             file_level: int = logging.ERROR,
-            base_level: int = logging.DEBUG
+            base_level: int = logging.DEBUG,
+            async_mode: bool = False,
+            json_format: bool = False,
+            max_bytes: int = 0,
+            backup_count: int = 5,
+            rotate_when: Optional[str] = None,
+            sampling: Optional[dict[int, float]] = None,
+            queue_size: int = 10000,
+            capture_loggers: Iterable[str] = (),
     ) -> None:
         """
         Creates a customized logger that outputs logs to both the console and a file.
@@ -27,6 +103,14 @@ class LoggerService:
             console_level (int): Console logging level.
             file_level (int): File logging level.
             base_level (int): Base logging level.
+            async_mode (bool): Only enqueue records on the calling thread; a background thread writes them.
+            json_format (bool): Write records as JSON objects instead of 'log_format' lines.
+            max_bytes (int): Rotate the log file when it reaches this size. 0 disables size-based rotation.
+            backup_count (int): Number of rotated log files to keep.
+            rotate_when (str): Rotate the log file by time instead ('midnight', 'H', ...), see TimedRotatingFileHandler.
+            sampling (dict): Fraction of records to keep per level, e.g. {logging.DEBUG: 0.01}.
+            queue_size (int): Max records waiting for the background thread; newer records are dropped when full.
+            capture_loggers (Iterable[str]): Other loggers (e.g. 'sqlalchemy.engine') to output through this one.
         """
         self.logger: Logger = logging.getLogger(name)
         self.logger.setLevel(base_level)
@@ -35,20 +119,54 @@ class LoggerService:
             if not os.path.exists(log_dir):
                 os.makedirs(log_dir)
 
-            formatter = Formatter(log_format, datefmt=date_format)
+            formatter = JSONFormatter() if json_format else Formatter(log_format, datefmt=date_format)
 
             # Console handler setting up
             console_handler = StreamHandler()
             console_handler.setLevel(console_level)
             console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
 
             # File handler setting up
             file_path = os.path.join(log_dir, f"{log_file_name}")
-            file_handler = FileHandler(file_path)
+            if rotate_when:
+                file_handler = TimedRotatingFileHandler(file_path, when=rotate_when, backupCount=backup_count)
+            elif max_bytes:
+                file_handler = RotatingFileHandler(file_path, maxBytes=max_bytes, backupCount=backup_count)
+            else:
+                file_handler = FileHandler(file_path)
             file_handler.setLevel(file_level)
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+
+            handlers: list[Handler] = [console_handler, file_handler]
+            if async_mode:
+                log_queue = queue.Queue(maxsize=queue_size)
+                listener = _BlockingStopQueueListener(
+                    log_queue, console_handler, file_handler, respect_handler_level=True
+                )
+                listener.start()
+                _queue_listeners[name] = listener
+
+                queue_handler = DroppingQueueHandler(log_queue)
+                # Records no output handler would write are dropped before being enqueued
+                queue_handler.setLevel(min(console_level, file_level))
+                handlers = [queue_handler]
+
+            for handler in handlers:
+                if sampling:
+                    handler.addFilter(SamplingFilter(sampling))
+                self.logger.addHandler(handler)
+
+            for captured_logger_name in capture_loggers:
+                captured_logger = logging.getLogger(captured_logger_name)
+                captured_logger.propagate = False
+                for handler in handlers:
+                    captured_logger.addHandler(handler)
+
+    def close(self) -> None:
+        """Write out the records still queued and stop the background thread of the asynchronous mode."""
+        listener = _queue_listeners.pop(self.logger.name, None)
+        if listener is not None:
+            listener.stop()
 
     def debug(self, message: str) -> None:
         self.logger.debug(message)
@@ -0,0 +1,210 @@
+import inspect
+import time
+from functools import wraps
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from src.core.config import settings
+from src.core.histogram import Histogram, DEFAULT_LATENCY_BUCKETS_MS
+
+# Prometheus convention: durations are exposed in seconds
+DEFAULT_LATENCY_BUCKETS_SECONDS = tuple(bound / 1000 for bound in DEFAULT_LATENCY_BUCKETS_MS)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+_INF_BUCKET_LABEL = 'le="+Inf"'
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_histogram(
+        name: str,
+        histogram: Histogram,
+        label_names: Sequence[str] = (),
+        label_values: Sequence[Any] = (),
+        scale: float = 1.0,
+) -> Iterator[str]:
+    """Sample lines of one histogram; 'scale' converts its values, e.g. 0.001 for milliseconds to seconds."""
+    cumulative = 0
+    for bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+        cumulative += bucket_count
+        le = f'le="{_format_value(bound * scale)}"'
+        yield f"{name}_bucket{_format_labels(label_names, label_values, le)} {cumulative}"
+    yield f"{name}_bucket{_format_labels(label_names, label_values, _INF_BUCKET_LABEL)} {histogram.count}"
+    yield f"{name}_sum{_format_labels(label_names, label_values)} {_format_value(histogram.sum * scale)}"
+    yield f"{name}_count{_format_labels(label_names, label_values)} {histogram.count}"
+
+
+def render_family(name: str, metric_type: str, documentation: str) -> Iterator[str]:
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {metric_type}"
+
+
+def render_gauge(name: str, documentation: str, value: float) -> Iterator[str]:
+    yield from render_family(name, "gauge", documentation)
+    yield f"{name} {_format_value(value)}"
+
+
+class HistogramVec:
+    """Family of histograms, one per combination of label values."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SECONDS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._children: dict[tuple, Histogram] = {}
+
+    def labels(self, *label_values: Any) -> Histogram:
+        histogram = self._children.get(label_values)
+        if histogram is None:
+            histogram = self._children.setdefault(label_values, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, value: float, *label_values: Any) -> None:
+        self.labels(*label_values).observe(value)
+
+    def render(self) -> Iterator[str]:
+        yield from render_family(self.name, "histogram", self.documentation)
+        for label_values, histogram in list(self._children.items()):
+            yield from render_histogram(self.name, histogram, self.label_names, label_values)
+
+
+class CounterVec:
+    """Family of monotonically increasing counters, one per combination of label values."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values: Any, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield from render_family(self.name, "counter", self.documentation)
+        for label_values, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """
+    In-process metrics exposed in the Prometheus text format.
+
+    Recording only touches plain dicts and integers from the event loop thread, so it needs no locks.
+    Values that already live elsewhere (e.g. pool occupancy) are read by collectors at scrape time instead.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, HistogramVec | CounterVec] = {}
+        self._collectors: dict[str, Callable[[], Iterable[str]]] = {}
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str],
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SECONDS) -> HistogramVec:
+        return self._metrics.setdefault(name, HistogramVec(name, documentation, label_names, buckets))  # type: ignore
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str]) -> CounterVec:
+        return self._metrics.setdefault(name, CounterVec(name, documentation, label_names))  # type: ignore
+
+    def register_collector(self, key: str, collector: Callable[[], Iterable[str]]) -> None:
+        """Registers (or replaces) a function yielding sample lines on every scrape."""
+        self._collectors[key] = collector
+
+    def unregister_collector(self, key: str) -> None:
+        self._collectors.pop(key, None)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in list(self._collectors.values()):
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def timed(histogram_vec: HistogramVec, *label_values: Any) -> Callable:
+    """Decorator recording the duration of every call of a coroutine function, unless 'METRICS_ENABLED' is off."""
+    histogram = histogram_vec.labels(*label_values)
+
+    def decorator(func: Callable) -> Callable:
+        # Checked once, when the function is decorated: disabled metrics cost nothing per call
+        if not settings.METRICS_ENABLED:
+            return func
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+class TimedProxy:
+    """
+    Transparent proxy recording the duration of every coroutine method call of the wrapped object,
+    labeled with the given stage name and the method name.
+    """
+
+    def __init__(self, target: Any, histogram_vec: HistogramVec, stage: str) -> None:
+        self._target = target
+        self._histogram_vec = histogram_vec
+        self._stage = stage
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if inspect.iscoroutinefunction(attribute):
+            attribute = timed(self._histogram_vec, self._stage, name)(attribute)
+            # Cached on the proxy, so later lookups don't go through '__getattr__' again
+            setattr(self, name, attribute)
+        return attribute
+
+
+metrics = MetricsRegistry()
+
+REQUEST_LATENCY = metrics.histogram(
+    "payment_service_http_request_duration_seconds",
+    "HTTP request latency by route handler, method and status code.",
+    ("handler", "method", "status"),
+)
+USE_CASE_LATENCY = metrics.histogram(
+    "payment_service_use_case_duration_seconds",
+    "Use case execution latency.",
+    ("use_case",),
+)
+STAGE_LATENCY = metrics.histogram(
+    "payment_service_stage_duration_seconds",
+    "Latency of the calls to the payment gateway, the User/Company services and the repositories.",
+    ("stage", "operation"),
+)
+ERRORS = metrics.counter(
+    "payment_service_errors_total",
+    "Errors converted into HTTP responses, by the exception class they were mapped from.",
+    ("exception", "status"),
+)
+
+
+def instrument(target: Any, stage: str, enabled: bool = True) -> Any:
+    """Wraps 'target' into a 'TimedProxy' of the 'STAGE_LATENCY' histograms, if enabled."""
+    return TimedProxy(target, STAGE_LATENCY, stage) if enabled else target
+
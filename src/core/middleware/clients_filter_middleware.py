@@ -1,28 +1,58 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from typing import Iterable, Optional
 
-from src.core.exceptions import PaymentServiceError
-
-ALLOWED_IPS = ('localhost', '127.0.0.1')
-
-
-# ALLOWED_PORTS = (8000, 8001, 56182)
+from starlette.types import ASGIApp, Scope, Receive, Send
 
-class IPFilterMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        # client_port = request.client.port
-
-        if client_ip != "127.0.0.1":
-            raise PaymentServiceError(
-                status_code=403,
-                detail="Access denied: your IP is not allowed."
-            )
-
-        # if client_ip not in ALLOWED_IPS or client_port not in ALLOWED_PORTS:
-        #     raise PaymentServiceError(
-        #         status_code=403,
-        #         detail="Access denied: your IP and port are not allowed."
-        #     )
-
-        return await call_next(request)
+from src.core.exceptions import PaymentServiceError
+from src.core.middleware.ip_allowlist import IPAllowlist
+
+
+class IPFilterMiddleware:
+    """
+    Pure ASGI middleware rejecting HTTP requests from clients outside the allowed networks.
+
+    If the request comes from a trusted proxy (e.g. a load balancer), the client address is taken from the
+    'X-Forwarded-For' header: the right-most address that is not a trusted proxy itself.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            allowed_networks: Iterable[str] = ("127.0.0.1/32", "::1/128"),
+            trusted_proxies: Iterable[str] = (),
+            cache_size: int = 4096,
+    ) -> None:
+        self.app = app
+        self._allowlist = IPAllowlist(allowed_networks, cache_size=cache_size)
+        self._trusted_proxies = IPAllowlist(trusted_proxies, cache_size=cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            client_ip = self._client_ip(scope)
+
+            if client_ip is None or not self._allowlist.contains(client_ip):
+                raise PaymentServiceError(
+                    status_code=403,
+                    detail="Access denied: your IP is not allowed."
+                )
+
+        await self.app(scope, receive, send)
+
+    def _client_ip(self, scope: Scope) -> Optional[str]:
+        client = scope.get("client")
+        peer_ip = client[0] if client else None
+        if peer_ip is None or not self._trusted_proxies or not self._trusted_proxies.contains(peer_ip):
+            return peer_ip
+
+        forwarded_for = [
+            value.decode("latin-1") for name, value in scope["headers"] if name == b"x-forwarded-for"
+        ]
+        if not forwarded_for:
+            return peer_ip
+
+        # Every proxy appends the address it received the request from, so the chain is walked from the right
+        hops = [hop.strip() for hop in ",".join(forwarded_for).split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not self._trusted_proxies.contains(hop):
+                return hop
+
+        return hops[0] if hops else peer_ip
@@ -1,54 +1,102 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 from starlette import status
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
 from src.application.exceptions import InactiveCompanyError, ExistingBankAccountError, UserNotActiveError
 from src.core.exceptions import PaymentServiceError
+from src.core.metrics import ERRORS
 from src.infrastructure.exceptions import CompanyServiceError, UserServiceError
 
 
-class ExceptionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class ExceptionMiddleware:
+    """
+    Pure ASGI middleware converting exceptions raised while handling a request into JSON error responses.
+    Unlike 'BaseHTTPMiddleware' it doesn't spawn a task nor buffer the response stream per request.
+    """
+
+    # Exception classes with a dedicated response, in the order 'to_response' checks them
+    MAPPED_EXCEPTIONS = (
+        PaymentServiceError,
+        CompanyServiceError,
+        InactiveCompanyError,
+        ExistingBankAccountError,
+        UserServiceError,
+        UserNotActiveError,
+        ValueError,
+    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
-        except PaymentServiceError as exc:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Once the headers are sent, the status can't be changed anymore
+            if response_started:
+                raise
+            response = self.to_response(exc)
+            ERRORS.inc(self.mapped_exception_name(exc), response.status_code)
+            await response(scope, receive, send)
+
+    @classmethod
+    def mapped_exception_name(cls, exc: Exception) -> str:
+        for exception_class in cls.MAPPED_EXCEPTIONS:
+            if isinstance(exc, exception_class):
+                return exception_class.__name__
+        return Exception.__name__
+
+    @staticmethod
+    def to_response(exc: Exception) -> JSONResponse:
+        if isinstance(exc, PaymentServiceError):
             return JSONResponse(
                 status_code=exc.status_code,
                 content={"success": False, "message": exc.detail},
             )
-        except CompanyServiceError as exc:
+        if isinstance(exc, CompanyServiceError):
             return JSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
+                # The service being unavailable (e.g. shed by its bulkhead or circuit breaker) is not a 'not found'
+                status_code=exc.status_code if exc.status_code >= 500 else status.HTTP_404_NOT_FOUND,
                 content={"detail": str(exc)}
             )
-        except InactiveCompanyError as exc:
+        if isinstance(exc, InactiveCompanyError):
             return JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": str(exc)}
             )
-        except ExistingBankAccountError as exc:
+        if isinstance(exc, ExistingBankAccountError):
             return JSONResponse(
                 status_code=status.HTTP_409_CONFLICT,
                 content={"detail": str(exc)}
             )
-        except UserServiceError as exc:
+        if isinstance(exc, UserServiceError):
             return JSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
+                status_code=exc.status_code if exc.status_code >= 500 else status.HTTP_404_NOT_FOUND,
                 content={"detail": f"User service error occurred: {exc}"}
             )
-        except UserNotActiveError as exc:
+        if isinstance(exc, UserNotActiveError):
             return JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": str(exc)}
             )
-        except ValueError as exc:
+        if isinstance(exc, ValueError):
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"detail": f"Error while adding the payment method: {exc}"}
             )
-        except Exception as exc:
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"detail": f"Unhandled error occurred in the Payment Service: {exc}"}
-            )
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": f"Unhandled error occurred in the Payment Service: {exc}"}
+        )
@@ -0,0 +1,106 @@
+import hashlib
+from typing import Iterable
+
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from src.core.exceptions import PaymentServiceError
+from src.infrastructure.idempotency.idempotency_store import IdempotencyStore, StoredResponse, UnsuccessfulResponse
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI middleware making POST requests with an 'Idempotency-Key' header safe to retry.
+
+    The successful response of the first request with a key is stored (see 'IdempotencyStore') and replayed,
+    byte for byte, to every later request with the same key - without running the endpoint again.
+    Replays are marked with the 'Idempotent-Replayed: true' header.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str]) -> None:
+        self.app = app
+        self._paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self._paths:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == b"idempotency-key"), None
+        )
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise PaymentServiceError(
+                status_code=400,
+                detail=f"Idempotency-Key must contain 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters."
+            )
+
+        body = await self._read_body(receive)
+        # A key reused for another endpoint or another payload is rejected
+        request_line = f"{scope['method']} {scope['path']}\n".encode()
+        request_hash = hashlib.sha256(request_line + body).hexdigest()
+
+        store: IdempotencyStore = scope["app"].state.dependencies["idempotency_store"]
+        try:
+            response, replayed = await store.run(
+                idempotency_key, request_hash, lambda: self._call_app(scope, body, request_hash)
+            )
+        except UnsuccessfulResponse as unsuccessful:
+            response, replayed = unsuccessful.response, False
+
+        await self._send_response(send, response, replayed)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def _call_app(self, scope: Scope, body: bytes, request_hash: str) -> StoredResponse:
+        """Runs the endpoint on the already read body and buffers its response."""
+        body_sent = False
+        status_code = 500
+        response_chunks = []
+
+        async def receive() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return {"type": "http.disconnect"}
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return StoredResponse(
+            request_hash=request_hash,
+            status_code=status_code,
+            body=b"".join(response_chunks),
+        )
+
+    @staticmethod
+    async def _send_response(send: Send, response: StoredResponse, replayed: bool) -> None:
+        # Every endpoint behind this middleware responds with JSON
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(response.body)).encode()),
+        ]
+        if replayed:
+            headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": response.body})
@@ -0,0 +1,48 @@
+import ipaddress
+from functools import lru_cache
+from typing import Iterable
+
+
+class IPAllowlist:
+    """
+    Set of IPv4/IPv6 networks (CIDR notation) with O(1) membership checks.
+
+    The networks are compiled once into one hash set of network addresses per prefix length, so a lookup masks
+    the address with each prefix length in use (at most 33 for IPv4, 129 for IPv6) instead of scanning every range.
+    Decisions are additionally memoized per address in a bounded LRU cache.
+    """
+
+    def __init__(self, networks: Iterable[str], cache_size: int = 4096) -> None:
+        self._prefixes: dict[int, dict[int, set[int]]] = {4: {}, 6: {}}
+        for network in networks:
+            network = network.strip()
+            if not network:
+                continue
+            parsed = ipaddress.ip_network(network, strict=False)
+            self._prefixes[parsed.version].setdefault(parsed.prefixlen, set()).add(int(parsed.network_address))
+
+        self._max_bits = {4: 32, 6: 128}
+        # Longest prefixes first: the most specific ranges are usually the most used ones
+        self._masked_lookups = {
+            version: [
+                (((1 << self._max_bits[version]) - 1) ^ ((1 << (self._max_bits[version] - prefix_length)) - 1),
+                 network_addresses)
+                for prefix_length, network_addresses in sorted(prefixes.items(), reverse=True)
+            ]
+            for version, prefixes in self._prefixes.items()
+        }
+        self.contains = lru_cache(maxsize=cache_size)(self._contains)
+
+    def _contains(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+
+        ip_int = int(ip)
+        return any(ip_int & mask in network_addresses for mask, network_addresses in self._masked_lookups[ip.version])
+
+    def __bool__(self) -> bool:
+        return bool(self._prefixes[4] or self._prefixes[6])
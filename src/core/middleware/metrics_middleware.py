@@ -0,0 +1,39 @@
+import time
+
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from src.core.metrics import REQUEST_LATENCY
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording the latency of every HTTP request into 'REQUEST_LATENCY'.
+
+    Requests are labeled by the name of the route handler (e.g. 'add_bank_card') rather than by the raw path,
+    which keeps the number of label combinations bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched endpoint into the (shared) scope
+            endpoint = scope.get("endpoint")
+            handler = getattr(endpoint, "__name__", "unmatched") if endpoint is not None else "unmatched"
+            REQUEST_LATENCY.observe(time.perf_counter() - started, handler, scope["method"], status_code)
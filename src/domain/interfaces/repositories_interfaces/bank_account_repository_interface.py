@@ -3,14 +3,15 @@ from typing import Optional
 from uuid import UUID
 
 from src.domain.models.payment_methods import BankAccountPaymentMethod
+from src.domain.schemas import Page, PageCursor
 
 
 class IBankAccountRepository(ABC):
     """Repository interface for bank cards."""
 
     @abstractmethod
-    async def create(self, bank_account: BankAccountPaymentMethod) -> BankAccountPaymentMethod:
-        """Create a new bank account."""
+    async def create(self, bank_account: BankAccountPaymentMethod) -> Optional[BankAccountPaymentMethod]:
+        """Create a new bank account. Returns None if the company already has one."""
         pass
 
     @abstractmethod
@@ -19,8 +20,15 @@ class IBankAccountRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_company_id(self, company_id: UUID) -> BankAccountPaymentMethod:
-        """Get bank account for a certain company."""
+    async def get_by_company_id(
+            self, company_id: UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[BankAccountPaymentMethod]:
+        """Get a page of a company's bank accounts, newest first, starting after the 'after' cursor."""
+        pass
+
+    @abstractmethod
+    async def exists_for_company(self, company_id: UUID) -> bool:
+        """Check whether a certain company already has a bank account."""
         pass
 
     @abstractmethod
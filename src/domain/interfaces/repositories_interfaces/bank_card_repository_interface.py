@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 
 from src.domain.models.payment_methods import CardPaymentMethod
+from src.domain.schemas import Page, PageCursor
 
 
 class IBankCardRepository(ABC):
@@ -14,23 +15,23 @@ class IBankCardRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_id(self, bank_card_id: UUID) -> Optional[CardPaymentMethod]:
-        """Get a bank card by ID."""
+    async def create_many(self, bank_cards: List[CardPaymentMethod]) -> List[CardPaymentMethod]:
+        """Create several bank cards at once. Cards with an already registered payment token are skipped."""
         pass
 
-    # Temporarily commented out due to the lack of implementation in the repository
-
-    # @abstractmethod
-    # async def get_by_user_id(self, user_id: UUID) -> List[CardPaymentMethod]:
-    #     """Get all bank cards for a user."""
-    #     pass
+    @abstractmethod
+    async def get_by_id(self, bank_card_id: UUID, user_id: Optional[UUID] = None) -> Optional[CardPaymentMethod]:
+        """Get a bank card by ID. Knowing its user, if possible, narrows the lookup down to that user's cards."""
+        pass
 
     @abstractmethod
-    async def update(self, bank_card: CardPaymentMethod) -> CardPaymentMethod:
-        """Update a bank card."""
+    async def get_by_user_id(
+            self, user_id: UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[CardPaymentMethod]:
+        """Get a page of a user's bank cards, newest first, starting after the 'after' cursor."""
         pass
 
     @abstractmethod
-    async def delete(self, bank_card_id: UUID) -> None:
-        """Delete a bank card."""
+    async def update(self, bank_card: CardPaymentMethod) -> CardPaymentMethod:
+        """Update a bank card."""
         pass
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+
+from src.domain.interfaces.repositories_interfaces.bank_account_repository_interface import IBankAccountRepository
+from src.domain.interfaces.repositories_interfaces.bank_card_repository_interface import IBankCardRepository
+
+
+class IUnitOfWork(ABC):
+    """
+    Interface of a unit of work: one database session and transaction shared by
+    the repositories that take part in a single business operation.
+
+    Usage:
+        async with unit_of_work_factory() as uow:
+            await uow.bank_cards.create(card)
+            await uow.commit()
+
+    Leaving the context without a commit rolls the transaction back.
+
+    The factory also takes 'read_only=True' for operations that only read, and 'callers' - the owners of the
+    rows read or written (user/company IDs) - so the reads may be served by a replica without losing sight
+    of the callers' own recent writes:
+        async with unit_of_work_factory(read_only=True, callers=(user_id,)) as uow:
+            page = await uow.bank_cards.get_by_user_id(user_id, limit)
+    """
+    bank_cards: IBankCardRepository
+    bank_accounts: IBankAccountRepository
+
+    async def __aenter__(self) -> "IUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.rollback()
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
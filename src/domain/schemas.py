@@ -1,9 +1,13 @@
-import re
 from dataclasses import dataclass
-from datetime import date
-from typing import Tuple, Optional, Union
+from datetime import datetime
+from typing import Tuple, Optional, Union, Generic, TypeVar, List
 from uuid import UUID
 
+from src.domain.models.payment_methods import CardPaymentMethod
+from src.domain.validation import parse_expiration_date
+
+PageItem = TypeVar("PageItem")
+
 
 @dataclass
 class RabbitMQResponse:
@@ -38,6 +42,7 @@ class RabbitMQResponse:
 class AddBankCardDTO:
     """
     Domain DTO schema for adding a bank card to the user's account.
+    Built from an already validated request (see 'src.domain.validation'), so it doesn't validate again.
     """
     user_id: UUID
     card_holder_first_name: str
@@ -46,29 +51,9 @@ class AddBankCardDTO:
     expiration_date: str  # Format: MM/YY
     cvv_code: str  # 3 digits
 
-    def __post_init__(self):
-        self._validate()
-
-    def _validate(self) -> None:
-        """Validate card information."""
-        if not (11 <= len(self.card_number) <= 16):
-            raise ValueError("Card number must be between 11 and 16 digits")
-
-        if not re.match(r"^(0[1-9]|1[0-2])/\d{2}$", self.expiration_date):
-            raise ValueError("Invalid expiration date format. Use MM/YY")
-
-        if len(self.cvv_code) != 3:
-            raise ValueError("CVV must be 3 digits")
-
-        month, year = self._parse_expiration()
-        exp_date = date(2000 + year, month, 1)
-        if exp_date < date.today():
-            raise ValueError("Expiration date must be in the future")
-
     def _parse_expiration(self) -> Tuple[int, int]:
-        """Parse expiration date into month and year."""
-        month, year = map(int, self.expiration_date.split('/'))
-        return month, year
+        """Parse expiration date into month and four-digit year."""
+        return parse_expiration_date(self.expiration_date)
 
     @property
     def expiration_month(self) -> int:
@@ -78,7 +63,7 @@ class AddBankCardDTO:
     @property
     def expiration_year(self) -> int:
         """Get expiration year as four-digit year."""
-        return 2000 + self._parse_expiration()[1]
+        return self._parse_expiration()[1]
 
     @property
     def last_four_digits(self) -> str:
@@ -101,17 +86,12 @@ class AddBankCardDTO:
 class AddBankAccountDTO:
     """
     Domain DTO schema for adding a bank account to the company's account.
+    Built from an already validated request (see 'src.domain.validation'), so it doesn't validate again.
     """
     account_holder_name: str
     account_number: str
     company_id: UUID
 
-    def __post_init__(self) -> None:
-        if not self.account_holder_name.strip():
-            raise ValueError("account_holder_name cannot be empty or consist only of spaces.")
-        if not self.account_number.strip():
-            raise ValueError("account_number cannot be empty or consist only of spaces.")
-
     def to_dict(self) -> dict:
         """
         Convert the domain DTO object to a dictionary.
@@ -121,3 +101,47 @@ class AddBankAccountDTO:
             account_number=self.account_number,
             company_id= str(self.company_id)
         )
+
+
+@dataclass(frozen=True)
+class AddBankCardResult:
+    """
+    Outcome of adding a single bank card within a batch.
+    """
+    index: int  # Position of the card in the batch
+    card: Optional[CardPaymentMethod] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.card is not None
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Position of the last item of a page in the listings' order (newest first: 'created_at' then 'id' descending).
+    The next page starts right after it, whatever was inserted meanwhile.
+    """
+    created_at: datetime
+    id: UUID
+
+
+@dataclass(frozen=True)
+class Page(Generic[PageItem]):
+    """
+    One page of a listing. 'next_cursor' is None on the last page.
+    """
+    items: List[PageItem]
+    next_cursor: Optional[PageCursor] = None
+
+    @classmethod
+    def from_rows(cls, rows: List[PageItem], limit: int) -> "Page[PageItem]":
+        """
+        Page of payment methods from up to 'limit + 1' rows: the extra row only tells that there is a next page,
+        so no COUNT query is needed.
+        """
+        if len(rows) <= limit:
+            return cls(items=rows)
+        last = rows[limit - 1]
+        return cls(items=rows[:limit], next_cursor=PageCursor(created_at=last.created_at, id=last.id))
@@ -0,0 +1,96 @@
+"""
+Validation rules of the card and bank account input, shared by every entry point (HTTP requests, RabbitMQ commands).
+
+The input is validated once, by the request schemas in 'src.presentation.schemas', before any I/O happens.
+The DTOs and domain models built from a validated request trust it and don't check it again.
+All patterns are compiled once, at import.
+"""
+import re
+from datetime import date
+from typing import Optional, Tuple
+
+CARD_NUMBER_PATTERN = re.compile(r"\d{11,16}")
+EXPIRATION_DATE_PATTERN = re.compile(r"(0[1-9]|1[0-2])/(\d{2})")
+CVV_CODE_PATTERN = re.compile(r"\d{3}")
+# Kazakhstan IBAN: 'KZ', 2 check digits and 16 more digits (bank code and account number)
+KZ_IBAN_PATTERN = re.compile(r"KZ\d{18}")
+
+# IBAN letters are checked as numbers: A = 10, B = 11, ..., Z = 35
+_IBAN_LETTER_VALUES = str.maketrans({chr(code): str(code - ord("A") + 10) for code in range(ord("A"), ord("Z") + 1)})
+
+
+def luhn_checksum(digits: str) -> int:
+    """Luhn (mod 10) checksum of a string of digits; 0 for a valid card number."""
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        value = ord(digit) - 48
+        if position % 2:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10
+
+
+def luhn_check_digit(partial_number: str) -> str:
+    """Digit to append to 'partial_number' to make it pass the Luhn check."""
+    return str((10 - luhn_checksum(partial_number + "0")) % 10)
+
+
+def iban_remainder(iban: str) -> int:
+    """ISO 13616 mod-97 remainder of an IBAN; 1 for a valid one."""
+    rearranged = iban[4:] + iban[:4]
+    return int(rearranged.translate(_IBAN_LETTER_VALUES)) % 97
+
+
+def iban_check_digits(country_code: str, bban: str) -> str:
+    """The two check digits of the IBAN of the country and the basic bank account number."""
+    return f"{98 - iban_remainder(country_code + '00' + bban):02d}"
+
+
+def validate_card_number(value: str) -> str:
+    if not CARD_NUMBER_PATTERN.fullmatch(value):
+        raise ValueError("Card number must contain only digits, 11 to 16 of them.")
+    if luhn_checksum(value):
+        raise ValueError("Card number is invalid (checksum mismatch).")
+    return value
+
+
+def parse_expiration_date(value: str) -> Optional[Tuple[int, int]]:
+    """Month and four-digit year of an 'MM/YY' expiration date, None if it isn't one."""
+    match = EXPIRATION_DATE_PATTERN.fullmatch(value)
+    if not match:
+        return None
+    return int(match[1]), 2000 + int(match[2])
+
+
+def validate_expiration_date(value: str, today: Optional[date] = None) -> str:
+    parsed = parse_expiration_date(value)
+    if parsed is None:
+        raise ValueError("Invalid expiration date format. Use MM/YY instead.")
+    month, year = parsed
+    today = today or date.today()
+    # Same rule as 'CardPaymentMethod.is_expired': the date stands for the first day of the month
+    if (year, month, 1) < (today.year, today.month, today.day):
+        raise ValueError("Expiration date must be in the future.")
+    return value
+
+
+def validate_cvv_code(value: str) -> str:
+    if not CVV_CODE_PATTERN.fullmatch(value):
+        raise ValueError("CVV code must contain exactly 3 digits.")
+    return value
+
+
+def validate_not_blank(value: str) -> str:
+    if not value.strip():
+        raise ValueError("Field cannot be empty or consist only of spaces.")
+    return value
+
+
+def validate_kz_iban(value: str) -> str:
+    if not KZ_IBAN_PATTERN.fullmatch(value):
+        raise ValueError("Account number must be a valid Kazakhstan IBAN (e.g., 'KZ' followed by 18 digits).")
+    if iban_remainder(value) != 1:
+        raise ValueError("Account number is not a valid IBAN (check digits mismatch).")
+    return value
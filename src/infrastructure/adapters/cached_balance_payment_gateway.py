@@ -0,0 +1,27 @@
+from decimal import Decimal
+
+from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
+from src.domain.schemas import AddBankCardDTO, AddBankAccountDTO
+from src.infrastructure.cache.balance_snapshot_cache import BalanceSnapshotCache
+
+
+class CachedBalancePaymentGateway(IPaymentGateway):
+    """
+    Decorator of an IPaymentGateway serving 'get_balance' from a 'BalanceSnapshotCache'.
+    Tokenization always goes to the wrapped gateway. The cards read from the database get their balance from
+    'balance_snapshot' (see 'BalanceSnapshotBankCardRepository').
+    """
+
+    def __init__(self, payment_gateway: IPaymentGateway, balance_cache: BalanceSnapshotCache) -> None:
+        self._payment_gateway = payment_gateway
+        self.balance_cache = balance_cache
+
+    async def get_payment_token(self, payment_method_info: AddBankCardDTO | AddBankAccountDTO) -> str:
+        return await self._payment_gateway.get_payment_token(payment_method_info)
+
+    async def get_balance(self, token: str) -> Decimal:
+        return await self.balance_cache.get(token, lambda: self._payment_gateway.get_balance(token))
+
+    def balance_snapshot(self, token: str, last_known: Decimal) -> Decimal:
+        """Balance of 'token' served locally, never waiting for the bank (see 'BalanceSnapshotCache.read')."""
+        return self.balance_cache.read(token, last_known, lambda: self._payment_gateway.get_balance(token))
@@ -0,0 +1,31 @@
+from uuid import UUID
+
+from src.domain.interfaces.company_service_adapter_interface import ICompanyServiceAdapter
+from src.domain.models.company_responses import CompanyResponseDTO
+from src.infrastructure.cache.ttl_cache import AsyncTTLCache
+from src.infrastructure.exceptions import CompanyServiceError
+
+
+class CachedCompanyServiceAdapter(ICompanyServiceAdapter):
+    """
+    Caching decorator for an ICompanyServiceAdapter.
+    'Not found' answers are cached too (for 'negative_ttl' seconds), concurrent lookups of one company are coalesced.
+    """
+
+    def __init__(self, adapter: ICompanyServiceAdapter, max_size: int, ttl: float, negative_ttl: float) -> None:
+        self._adapter = adapter
+        self._cache: AsyncTTLCache[UUID, CompanyResponseDTO] = AsyncTTLCache(
+            max_size=max_size,
+            ttl=ttl,
+            negative_ttl=negative_ttl,
+            is_negative=lambda exc: isinstance(exc, CompanyServiceError) and exc.status_code == 404,
+        )
+
+    async def get_company_by_id(self, company_id: UUID) -> CompanyResponseDTO:
+        return await self._cache.get_or_load(company_id, lambda: self._adapter.get_company_by_id(company_id))
+
+    def invalidate(self, company_id: UUID) -> None:
+        self._cache.invalidate(company_id)
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
@@ -0,0 +1,31 @@
+from uuid import UUID
+
+from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
+from src.domain.models.user_responses import UserResponseDTO
+from src.infrastructure.cache.ttl_cache import AsyncTTLCache
+from src.infrastructure.exceptions import UserServiceError
+
+
+class CachedUserServiceAdapter(IUserServiceAdapter):
+    """
+    Caching decorator for an IUserServiceAdapter.
+    'Not found' answers are cached too (for 'negative_ttl' seconds), concurrent lookups of one user are coalesced.
+    """
+
+    def __init__(self, adapter: IUserServiceAdapter, max_size: int, ttl: float, negative_ttl: float) -> None:
+        self._adapter = adapter
+        self._cache: AsyncTTLCache[UUID, UserResponseDTO] = AsyncTTLCache(
+            max_size=max_size,
+            ttl=ttl,
+            negative_ttl=negative_ttl,
+            is_negative=lambda exc: isinstance(exc, UserServiceError) and exc.status_code == 404,
+        )
+
+    async def get_user_by_id(self, user_id: UUID) -> UserResponseDTO:
+        return await self._cache.get_or_load(user_id, lambda: self._adapter.get_user_by_id(user_id))
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._cache.invalidate(user_id)
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
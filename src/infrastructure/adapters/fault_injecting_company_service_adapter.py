@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from src.domain.interfaces.company_service_adapter_interface import ICompanyServiceAdapter
+from src.domain.models.company_responses import CompanyResponseDTO
+from src.infrastructure.exceptions import CompanyServiceError
+from src.infrastructure.fault_injection.fault_injector import FaultInjector
+
+
+class FaultInjectingCompanyServiceAdapter(ICompanyServiceAdapter):
+    """
+    Decorator of an ICompanyServiceAdapter adding latency, errors and timeouts, see 'FaultInjector'.
+    Meant for load tests and benchmarks, to reproduce production-like Company Service behavior.
+    """
+
+    def __init__(self, adapter: ICompanyServiceAdapter, fault_injector: FaultInjector) -> None:
+        self._adapter = adapter
+        self.fault_injector = fault_injector
+
+    async def get_company_by_id(self, company_id: UUID) -> CompanyResponseDTO:
+        return await self.fault_injector.run(
+            lambda: self._adapter.get_company_by_id(company_id),
+            timeout_error=lambda: CompanyServiceError(detail="Company Service timed out.", status_code=504),
+        )
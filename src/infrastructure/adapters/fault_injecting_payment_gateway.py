@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
+from src.domain.schemas import AddBankCardDTO, AddBankAccountDTO
+from src.infrastructure.exceptions import PaymentGatewayError
+from src.infrastructure.fault_injection.fault_injector import FaultInjector
+
+
+class FaultInjectingPaymentGateway(IPaymentGateway):
+    """
+    Decorator of an IPaymentGateway adding latency, errors and timeouts, see 'FaultInjector'.
+    Meant for load tests and benchmarks, to reproduce production-like bank API behavior.
+    """
+
+    def __init__(self, payment_gateway: IPaymentGateway, fault_injector: FaultInjector) -> None:
+        self._payment_gateway = payment_gateway
+        self.fault_injector = fault_injector
+
+    async def get_payment_token(self, payment_method_info: AddBankCardDTO | AddBankAccountDTO) -> str:
+        return await self.fault_injector.run(
+            lambda: self._payment_gateway.get_payment_token(payment_method_info),
+            timeout_error=self._timeout_error,
+        )
+
+    async def get_balance(self, token: str) -> Decimal:
+        return await self.fault_injector.run(
+            lambda: self._payment_gateway.get_balance(token),
+            timeout_error=self._timeout_error,
+        )
+
+    @staticmethod
+    def _timeout_error() -> PaymentGatewayError:
+        return PaymentGatewayError(detail="Payment gateway timed out.")
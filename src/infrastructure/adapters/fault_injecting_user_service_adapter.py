@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
+from src.domain.models.user_responses import UserResponseDTO
+from src.infrastructure.exceptions import UserServiceError
+from src.infrastructure.fault_injection.fault_injector import FaultInjector
+
+
+class FaultInjectingUserServiceAdapter(IUserServiceAdapter):
+    """
+    Decorator of an IUserServiceAdapter adding latency, errors and timeouts, see 'FaultInjector'.
+    Meant for load tests and benchmarks, to reproduce production-like User Service behavior.
+    """
+
+    def __init__(self, adapter: IUserServiceAdapter, fault_injector: FaultInjector) -> None:
+        self._adapter = adapter
+        self.fault_injector = fault_injector
+
+    async def get_user_by_id(self, user_id: UUID) -> UserResponseDTO:
+        return await self.fault_injector.run(
+            lambda: self._adapter.get_user_by_id(user_id),
+            timeout_error=lambda: UserServiceError(detail="User Service timed out.", status_code=504),
+        )
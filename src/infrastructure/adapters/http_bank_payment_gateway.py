@@ -0,0 +1,144 @@
+import asyncio
+import uuid
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+import httpx
+
+from src.domain.interfaces.payment_gateway_interface import IPaymentGateway
+from src.domain.schemas import AddBankCardDTO, AddBankAccountDTO
+from src.infrastructure.exceptions import PaymentGatewayError
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from src.infrastructure.resilience.retry_budget import RetryBudget, jittered_backoff
+
+# Answers meaning the bank is (temporarily) unable to process the call, so it may succeed when retried
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class _RetryableError(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class HTTPBankPaymentGateway(IPaymentGateway):
+    """
+    IPaymentGateway calling the bank's HTTP API through one shared pool of keep-alive connections.
+
+    - Every attempt is bounded by the connect/read timeouts, the whole call (retries included) by 'call_timeout'.
+    - Connection errors, timeouts and 429/502/503/504 answers are retried with jittered exponential backoff,
+      as long as the shared 'RetryBudget' allows it. Tokenization requests carry an 'Idempotency-Key',
+      so a retried tokenization is not executed twice by the bank.
+    - The 'CircuitBreaker' tracks the failed attempts; while it is open, calls fail fast with 'PaymentGatewayError'.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            api_key: str = "",
+            connect_timeout: float = 1.0,
+            read_timeout: float = 5.0,
+            call_timeout: float = 10.0,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30.0,
+            max_attempts: int = 3,
+            backoff_base: float = 0.05,
+            backoff_cap: float = 1.0,
+            retry_budget: Optional[RetryBudget] = None,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+        self._call_timeout = call_timeout
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
+        self.retry_budget = retry_budget if retry_budget is not None else RetryBudget()
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+
+    async def get_payment_token(self, payment_method_info: AddBankCardDTO | AddBankAccountDTO) -> str:
+        if isinstance(payment_method_info, AddBankCardDTO):
+            payload = dict(type="card", **payment_method_info.to_dict())
+        else:
+            payload = dict(type="account", **payment_method_info.to_dict())
+
+        body = await self._request(
+            "POST", "/tokens", json=payload, headers={"Idempotency-Key": str(uuid.uuid4())}
+        )
+        try:
+            return str(body["token"])
+        except (KeyError, TypeError):
+            raise PaymentGatewayError(detail="Payment gateway returned no payment token.")
+
+    async def get_balance(self, token: str) -> Decimal:
+        body = await self._request("GET", f"/tokens/{token}/balance")
+        try:
+            return Decimal(str(body["balance"]))
+        except (KeyError, TypeError, InvalidOperation):
+            raise PaymentGatewayError(detail="Payment gateway returned no valid balance.")
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        self.retry_budget.record_call()
+        try:
+            async with asyncio.timeout(self._call_timeout):
+                attempt = 0
+                while True:
+                    try:
+                        return await self._attempt(method, path, **kwargs)
+                    except _RetryableError as exc:
+                        attempt += 1
+                        if attempt >= self._max_attempts or not self.retry_budget.try_acquire_retry():
+                            raise PaymentGatewayError(detail=f"Payment gateway is unavailable: {exc.reason}.")
+                        await asyncio.sleep(jittered_backoff(attempt - 1, self._backoff_base, self._backoff_cap))
+        except TimeoutError:
+            # Unlike a cancellation by the caller, the bank not answering in time is a failure of the bank
+            self.circuit_breaker.record_failure()
+            raise PaymentGatewayError(detail="Payment gateway timed out.") from None
+
+    async def _attempt(self, method: str, path: str, **kwargs) -> dict:
+        if not self.circuit_breaker.allow_request():
+            raise PaymentGatewayError(detail="Payment gateway is unavailable (circuit open).")
+
+        try:
+            response = await self._client.request(method, path, **kwargs)
+        except httpx.TransportError as exc:
+            self.circuit_breaker.record_failure()
+            raise _RetryableError(type(exc).__name__)
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. the client disconnected), that says nothing about the bank;
+            # an expired 'call_timeout' is recorded by '_request'
+            self.circuit_breaker.cancel_request()
+            raise
+
+        if response.status_code in RETRYABLE_STATUS_CODES or response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                raise _RetryableError(f"HTTP {response.status_code}")
+            raise PaymentGatewayError(detail=f"Payment gateway error: HTTP {response.status_code}.")
+
+        # The bank is healthy even if it rejects this particular request
+        self.circuit_breaker.record_success()
+        if response.status_code >= 400:
+            raise PaymentGatewayError(detail=f"Payment gateway rejected the request: HTTP {response.status_code}.")
+        try:
+            return response.json()
+        except ValueError:
+            raise PaymentGatewayError(detail="Payment gateway returned an invalid response.")
+
+    def stats(self) -> dict:
+        return dict(circuit_breaker=self.circuit_breaker.stats(), retry_budget=self.retry_budget.stats())
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,44 @@
+from datetime import datetime
+from uuid import UUID
+
+from src.domain.interfaces.company_service_adapter_interface import ICompanyServiceAdapter
+from src.domain.models.company_responses import CompanyResponseDTO
+from src.domain.schemas import RabbitMQResponse
+from src.infrastructure.exceptions import CompanyServiceError, RabbitMQError
+from src.infrastructure.messaging.rabbitmq_rpc_client import RabbitMQRPCClient
+
+
+class RabbitMQCompanyServiceAdapter(ICompanyServiceAdapter):
+    """Company Service adapter talking to the Company Service over RabbitMQ RPC."""
+
+    def __init__(self, rpc_client: RabbitMQRPCClient, queue_name: str, timeout: float | None = None) -> None:
+        self._rpc_client = rpc_client
+        self._queue_name = queue_name
+        self._timeout = timeout
+
+    async def get_company_by_id(self, company_id: UUID) -> CompanyResponseDTO:
+        try:
+            raw_response = await self._rpc_client.call(
+                self._queue_name,
+                {"action": "get_company_by_id", "company_id": str(company_id)},
+                timeout=self._timeout,
+            )
+        except RabbitMQError as e:
+            raise CompanyServiceError(detail=e.detail, status_code=e.status_code) from e
+
+        response = RabbitMQResponse(**raw_response)
+        if not response.success:
+            raise CompanyServiceError(
+                detail=response.error_message or f"Company with ID: {company_id} not found.",
+                status_code=response.status_code,
+            )
+
+        company = response.body
+        return CompanyResponseDTO(
+            id=UUID(company["id"]),
+            company_id=UUID(company["company_id"]),
+            name=company["name"],
+            is_active=company["is_active"],
+            created_at=datetime.fromisoformat(company["created_at"]),
+            updated_at=datetime.fromisoformat(company["updated_at"]),
+        )
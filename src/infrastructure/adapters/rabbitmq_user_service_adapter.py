@@ -0,0 +1,48 @@
+from datetime import datetime
+from uuid import UUID
+
+from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
+from src.domain.models.user_responses import UserResponseDTO
+from src.domain.schemas import RabbitMQResponse
+from src.infrastructure.exceptions import UserServiceError, RabbitMQError
+from src.infrastructure.messaging.rabbitmq_rpc_client import RabbitMQRPCClient
+from src.presentation.schemas import RolesEnum
+
+
+class RabbitMQUserServiceAdapter(IUserServiceAdapter):
+    """User Service adapter talking to the User Service over RabbitMQ RPC."""
+
+    def __init__(self, rpc_client: RabbitMQRPCClient, queue_name: str, timeout: float | None = None) -> None:
+        self._rpc_client = rpc_client
+        self._queue_name = queue_name
+        self._timeout = timeout
+
+    async def get_user_by_id(self, user_id: UUID) -> UserResponseDTO:
+        try:
+            raw_response = await self._rpc_client.call(
+                self._queue_name,
+                {"action": "get_user_by_id", "user_id": str(user_id)},
+                timeout=self._timeout,
+            )
+        except RabbitMQError as e:
+            raise UserServiceError(detail=e.detail, status_code=e.status_code) from e
+
+        response = RabbitMQResponse(**raw_response)
+        if not response.success:
+            raise UserServiceError(
+                detail=response.error_message or f"User with ID: {user_id} not found.",
+                status_code=response.status_code,
+            )
+
+        user = response.body
+        return UserResponseDTO(
+            id=UUID(user["id"]),
+            first_name=user["first_name"],
+            last_name=user["last_name"],
+            roles=[RolesEnum(role) for role in user["roles"]],
+            is_active=user["is_active"],
+            email=user["email"],
+            phone_number=user["phone_number"],
+            created_at=datetime.fromisoformat(user["created_at"]),
+            updated_at=datetime.fromisoformat(user["updated_at"]),
+        )
@@ -0,0 +1,33 @@
+from uuid import UUID
+
+from src.domain.interfaces.company_service_adapter_interface import ICompanyServiceAdapter
+from src.domain.models.company_responses import CompanyResponseDTO
+from src.infrastructure.exceptions import CompanyServiceError
+from src.infrastructure.resilience.bulkhead import Bulkhead
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from src.infrastructure.resilience.dependency_guard import DependencyGuard
+
+
+def _is_company_service_failure(exc: BaseException) -> bool:
+    # Client errors (e.g. 404 'company not found') are valid answers of a healthy Company Service
+    return not isinstance(exc, CompanyServiceError) or exc.status_code >= 500
+
+
+class ResilientCompanyServiceAdapter(ICompanyServiceAdapter):
+    """
+    Decorator of an ICompanyServiceAdapter limiting the calls in flight (see 'Bulkhead') and
+    failing fast while the Company Service is degraded (see 'CircuitBreaker').
+    Rejected calls raise 'CompanyServiceError' with status 503.
+    """
+
+    def __init__(self, adapter: ICompanyServiceAdapter, bulkhead: Bulkhead, circuit_breaker: CircuitBreaker) -> None:
+        self._adapter = adapter
+        self.guard = DependencyGuard(bulkhead, circuit_breaker, is_failure=_is_company_service_failure)
+
+    async def get_company_by_id(self, company_id: UUID) -> CompanyResponseDTO:
+        return await self.guard.run(
+            lambda: self._adapter.get_company_by_id(company_id),
+            unavailable_error=lambda reason: CompanyServiceError(
+                detail=f"Company Service is unavailable ({reason}).", status_code=503
+            ),
+        )
@@ -0,0 +1,33 @@
+from uuid import UUID
+
+from src.domain.interfaces.user_service_adapter_interface import IUserServiceAdapter
+from src.domain.models.user_responses import UserResponseDTO
+from src.infrastructure.exceptions import UserServiceError
+from src.infrastructure.resilience.bulkhead import Bulkhead
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from src.infrastructure.resilience.dependency_guard import DependencyGuard
+
+
+def _is_user_service_failure(exc: BaseException) -> bool:
+    # Client errors (e.g. 404 'user not found') are valid answers of a healthy User Service
+    return not isinstance(exc, UserServiceError) or exc.status_code >= 500
+
+
+class ResilientUserServiceAdapter(IUserServiceAdapter):
+    """
+    Decorator of an IUserServiceAdapter limiting the calls in flight (see 'Bulkhead') and
+    failing fast while the User Service is degraded (see 'CircuitBreaker').
+    Rejected calls raise 'UserServiceError' with status 503.
+    """
+
+    def __init__(self, adapter: IUserServiceAdapter, bulkhead: Bulkhead, circuit_breaker: CircuitBreaker) -> None:
+        self._adapter = adapter
+        self.guard = DependencyGuard(bulkhead, circuit_breaker, is_failure=_is_user_service_failure)
+
+    async def get_user_by_id(self, user_id: UUID) -> UserResponseDTO:
+        return await self.guard.run(
+            lambda: self._adapter.get_user_by_id(user_id),
+            unavailable_error=lambda reason: UserServiceError(
+                detail=f"User Service is unavailable ({reason}).", status_code=503
+            ),
+        )
@@ -0,0 +1,195 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Awaitable, Callable, Optional
+
+from src.core.logger import LoggerService
+
+
+@dataclass(slots=True)
+class _Snapshot:
+    balance: Decimal
+    fetched_at: float
+    reads: int = 0  # Reads since the snapshot was fetched, a token read at least 'hot_min_reads' times is hot
+
+
+class BalanceSnapshotCache:
+    """
+    Last known balance per payment token, so balance reads don't each cost a bank round trip.
+
+    - Fresh (younger than 'fresh_ttl'): served from memory.
+    - Stale (up to 'stale_ttl' seconds older): still served from memory, and queued for a background refresh
+      (stale-while-revalidate).
+    - Expired or unknown: loaded from the bank before answering ('get'); concurrent loads of one token are
+      coalesced. Reads that must not wait for the bank ('read') get the last known balance instead, which is kept
+      as a stale snapshot and queued for a background refresh.
+
+    Hot tokens (read 'hot_min_reads' times since their last fetch) are refreshed ahead, once they are
+    'refresh_ahead' of their freshness window old, so their readers keep getting fresh snapshots.
+    Background refreshes are made by 'start_refreshing' at most 'max_refreshes_per_second', so the bank sees a
+    bounded, steady call rate however many readers there are.
+    """
+
+    def __init__(
+            self,
+            logger: LoggerService,
+            max_size: int,
+            fresh_ttl: float,
+            stale_ttl: float,
+            refresh_ahead: float = 0.8,
+            hot_min_reads: int = 2,
+            max_refreshes_per_second: float = 50.0,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._logger = logger
+        self._max_size = max_size
+        self._fresh_ttl = fresh_ttl
+        self._stale_ttl = stale_ttl
+        self._refresh_ahead_age = fresh_ttl * refresh_ahead
+        self._hot_min_reads = hot_min_reads
+        self._max_refreshes_per_second = max_refreshes_per_second
+        self._clock = clock
+
+        self._snapshots: OrderedDict[str, _Snapshot] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Tokens to refresh in the background, with the loader of their balance; insertion order = priority
+        self._pending: OrderedDict[str, Callable[[], Awaitable[Decimal]]] = OrderedDict()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._stats = dict(fresh_hits=0, stale_hits=0, misses=0, coalesced=0, seeded=0, refreshes=0,
+                           refresh_errors=0, evictions=0)
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    async def get(self, token: str, loader: Callable[[], Awaitable[Decimal]]) -> Decimal:
+        balance = self._serve(token, loader)
+        if balance is not None:
+            return balance
+
+        load = self._inflight.get(token)
+        if load is not None:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["misses"] += 1
+            load = asyncio.ensure_future(self._load(token, loader))
+            # Mark the error as retrieved even if every caller was cancelled before the load finished
+            load.add_done_callback(lambda future: future.cancelled() or future.exception())
+            self._inflight[token] = load
+
+        # A cancelled caller must not cancel the load the other callers are waiting for
+        return await asyncio.shield(load)
+
+    def read(self, token: str, last_known: Decimal, loader: Callable[[], Awaitable[Decimal]]) -> Decimal:
+        """
+        Balance of 'token' without waiting for the bank: its snapshot, or else 'last_known' (e.g. the balance stored
+        with the card), kept as a stale snapshot so the background refresh fetches the current one.
+        """
+        balance = self._serve(token, loader)
+        if balance is not None:
+            return balance
+
+        self._stats["seeded"] += 1
+        self._store(token, last_known, fetched_at=self._clock() - self._fresh_ttl)
+        if token in self._snapshots:
+            self._pending[token] = loader
+        return last_known
+
+    def _serve(self, token: str, loader: Callable[[], Awaitable[Decimal]]) -> Optional[Decimal]:
+        """The balance of a fresh or stale snapshot (queueing its refresh when due), None if there is none."""
+        snapshot = self._snapshots.get(token)
+        if snapshot is None:
+            return None
+        age = self._clock() - snapshot.fetched_at
+        if age >= self._fresh_ttl + self._stale_ttl:
+            return None
+
+        self._snapshots.move_to_end(token)
+        snapshot.reads += 1
+        if age >= self._fresh_ttl:
+            self._stats["stale_hits"] += 1
+            self._pending[token] = loader
+        else:
+            self._stats["fresh_hits"] += 1
+            if age >= self._refresh_ahead_age and snapshot.reads >= self._hot_min_reads:
+                self._pending.setdefault(token, loader)
+        return snapshot.balance
+
+    def put(self, token: str, balance: Decimal) -> None:
+        """Stores a balance learned elsewhere (e.g. from a bank notification) as a fresh snapshot."""
+        self._store(token, balance)
+
+    def invalidate(self, token: str) -> None:
+        self._snapshots.pop(token, None)
+        self._pending.pop(token, None)
+
+    async def _load(self, token: str, loader: Callable[[], Awaitable[Decimal]]) -> Decimal:
+        try:
+            balance = await loader()
+            self._store(token, balance)
+            return balance
+        finally:
+            if self._inflight.get(token) is asyncio.current_task():
+                del self._inflight[token]
+
+    def _store(self, token: str, balance: Decimal, fetched_at: Optional[float] = None) -> None:
+        if fetched_at is None:
+            fetched_at = self._clock()
+        self._snapshots[token] = _Snapshot(balance=balance, fetched_at=fetched_at)
+        self._snapshots.move_to_end(token)
+        while len(self._snapshots) > self._max_size:
+            evicted, _ = self._snapshots.popitem(last=False)
+            self._pending.pop(evicted, None)
+            self._stats["evictions"] += 1
+
+    def start_refreshing(self, interval: float = 1.0) -> None:
+        """Refresh the queued stale and hot tokens in the background, every 'interval' seconds."""
+        self._refresh_task = asyncio.create_task(self._refresh_periodically(interval))
+
+    async def _refresh_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh_pending(max(1, int(self._max_refreshes_per_second * interval)))
+
+    async def refresh_pending(self, limit: int) -> int:
+        """Refreshes up to 'limit' queued tokens, oldest request first. Returns the number refreshed."""
+        batch = []
+        while self._pending and len(batch) < limit:
+            batch.append(self._pending.popitem(last=False))
+        if not batch:
+            return 0
+
+        results = await asyncio.gather(
+            *(self._refresh(token, loader) for token, loader in batch), return_exceptions=True
+        )
+        return sum(1 for result in results if result is True)
+
+    async def _refresh(self, token: str, loader: Callable[[], Awaitable[Decimal]]) -> bool:
+        # Dropped (evicted or invalidated) since it was queued, or being loaded by a reader right now
+        if token not in self._snapshots or token in self._inflight:
+            return False
+        try:
+            balance = await loader()
+        except Exception as e:
+            # The stale snapshot stays in place and is served until it expires
+            self._stats["refresh_errors"] += 1
+            self._logger.warning(f"Failed to refresh the balance snapshot of a payment token: {str(e)}.")
+            return False
+        if token in self._snapshots:
+            self._store(token, balance)
+        self._stats["refreshes"] += 1
+        return True
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def stats(self) -> dict:
+        return dict(size=len(self._snapshots), max_size=self._max_size, pending_refreshes=len(self._pending),
+                    **self._stats)
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar, Callable, Optional, Hashable
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(slots=True)
+class _RepositoryEntry(Generic[V]):
+    value: V
+    updated_at: Optional[datetime]  # Version of the row the value was read from
+    cached_at: float
+
+
+class RepositoryCache(Generic[K, V]):
+    """
+    Bounded, process-wide LRU of domain objects read from a repository, keyed by their ID.
+
+    Shared by the caching repository decorators of every unit of work, it only ever holds committed rows:
+    - A read stores its result only if the ID wasn't invalidated since the read started ('begin_read' /
+      'store'), so a read racing a write can't put the pre-write row back. A read from a replica, given the
+      replica's 'lag', is not stored either if the ID was invalidated less than 'lag' seconds before it started.
+    - An entry is never replaced by a row with an older 'updated_at'.
+    - Entries expire 'ttl' seconds after they were cached, which bounds the staleness of rows written by
+      other processes; the writes of this process invalidate their entries right away.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+
+        self._entries: OrderedDict[K, _RepositoryEntry[V]] = OrderedDict()
+        # Bumped by every invalidation, a read started before the last one must not be stored
+        self._generation = 0
+        self._invalidated_at: dict[K, tuple[int, float]] = {}  # Generation and time of the last invalidation
+        self._forgotten_through = -1  # Last generation whose invalidation mark was dropped
+        self._stats = dict(hits=0, misses=0, expirations=0, evictions=0, invalidations=0, discarded_reads=0,
+                           stale_rows=0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._clock() - entry.cached_at < self._ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry.value
+            del self._entries[key]
+            self._stats["expirations"] += 1
+        self._stats["misses"] += 1
+        return None
+
+    def updated_at(self, key: K) -> Optional[datetime]:
+        """'updated_at' of the cached row, to tell whether an object read elsewhere is older than the cache's."""
+        entry = self._entries.get(key)
+        return entry.updated_at if entry is not None else None
+
+    def begin_read(self) -> int:
+        """Marks the start of a read of the repository; pass the result to 'store' once the read returns."""
+        return self._generation
+
+    def store(self, key: K, value: V, updated_at: Optional[datetime], read_started: int, lag: float = 0.0) -> bool:
+        """Caches a row read since 'read_started', from a database up to 'lag' seconds behind the primary."""
+        invalidated_generation, invalidated_time = self._invalidated_at.get(key, (-1, float("-inf")))
+        if max(invalidated_generation, self._forgotten_through) >= read_started \
+                or (lag and self._clock() - invalidated_time < lag):
+            self._stats["discarded_reads"] += 1
+            return False
+
+        entry = self._entries.get(key)
+        if entry is not None and None not in (entry.updated_at, updated_at) and updated_at < entry.updated_at:
+            self._stats["stale_rows"] += 1
+            return False
+
+        self._entries[key] = _RepositoryEntry(value=value, updated_at=updated_at, cached_at=self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+        return True
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+        self._invalidated_at.pop(key, None)
+        self._invalidated_at[key] = (self._generation, self._clock())
+        self._generation += 1
+        self._stats["invalidations"] += 1
+        # Only the reads in flight need the marks: the oldest are dropped, and every read started before a
+        # dropped mark is then discarded, as if its own ID had been invalidated
+        if len(self._invalidated_at) > self._max_size:
+            oldest = next(iter(self._invalidated_at))
+            self._forgotten_through, _ = self._invalidated_at.pop(oldest)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return dict(size=len(self._entries), max_size=self._max_size, **self._stats)
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Generic, TypeVar, Callable, Awaitable, Optional, Hashable
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Counters of an AsyncTTLCache, used to tune its size and TTLs."""
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # Lookups that waited for an already running load instead of starting their own
+    evictions: int = 0  # Entries dropped because the cache was full
+    expirations: int = 0  # Entries dropped because their TTL ran out
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class _CacheEntry(Generic[V]):
+    expires_at: float
+    value: Optional[V] = None
+    error: Optional[Exception] = None
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache for results of async lookups.
+
+    - Every entry expires 'ttl' seconds after it was loaded.
+    - Errors accepted by 'is_negative' (e.g. 'not found') are cached for 'negative_ttl' seconds and re-raised on hit.
+    - Concurrent lookups of a missing key are coalesced: only one load runs and every caller gets its result.
+    """
+
+    def __init__(
+            self,
+            max_size: int,
+            ttl: float,
+            negative_ttl: float = 0.0,
+            is_negative: Callable[[Exception], bool] = lambda exc: False,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._is_negative = is_negative
+        self._clock = clock
+
+        self._entries: OrderedDict[K, _CacheEntry[V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Future] = {}
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > self._clock():
+                self._entries.move_to_end(key)
+                if entry.error is not None:
+                    self._stats.negative_hits += 1
+                    # Drop the previous traceback, so it doesn't grow with every hit
+                    raise entry.error.with_traceback(None)
+                self._stats.hits += 1
+                return entry.value
+
+            del self._entries[key]
+            self._stats.expirations += 1
+
+        load = self._inflight.get(key)
+        if load is not None:
+            self._stats.coalesced += 1
+        else:
+            self._stats.misses += 1
+            load = asyncio.ensure_future(self._load(key, loader))
+            # Mark the error as retrieved even if every caller was cancelled before the load finished
+            load.add_done_callback(lambda future: future.cancelled() or future.exception())
+            self._inflight[key] = load
+
+        # A cancelled caller must not cancel the load the other callers are waiting for
+        return await asyncio.shield(load)
+
+    async def _load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await loader()
+        except Exception as exc:
+            if self._is_negative(exc) and self._negative_ttl > 0:
+                self._store(key, _CacheEntry(expires_at=self._clock() + self._negative_ttl, error=exc))
+            raise
+        else:
+            self._store(key, _CacheEntry(expires_at=self._clock() + self._ttl, value=value))
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _store(self, key: K, entry: _CacheEntry[V]) -> None:
+        # The key was invalidated while it was being loaded, so the loaded value may already be stale
+        if self._inflight.get(key) is not asyncio.current_task():
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    def stats(self) -> dict:
+        return dict(size=len(self._entries), max_size=self._max_size, **self._stats.to_dict())
@@ -2,23 +2,46 @@ import datetime
 from typing import Optional, List
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import select, update, exists, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.domain.schemas import PageCursor
+from src.infrastructure.dao.outbox_event_dao import OutboxEventDAO, BANK_ACCOUNT_ADDED, event_payload
 from src.infrastructure.database.models import BankAccountModel
 
+# Fields of a bank account published in its 'bank_account.added' event; the account number stays private
+BANK_ACCOUNT_EVENT_FIELDS = ("id", "company_id", "account_holder_name", "bank_name", "bank_bic", "created_at")
+
 
 class BankAccountDAO:
     """Data Access Object for bank accounts."""
 
     def __init__(self, async_session: AsyncSession):
         self._async_session = async_session
+        self._outbox = OutboxEventDAO(async_session)
 
-    async def create(self, model: BankAccountModel) -> BankAccountModel:
-        self._async_session.add(model)
-        await self._async_session.commit()
-        await self._async_session.refresh(model)
-        return model
+    async def create(self, model: BankAccountModel) -> Optional[BankAccountModel]:
+        """
+        Insert the bank account in a single round trip.
+        Returns None if the company already has a bank account ('uq_bank_accounts_company_id' conflict).
+        """
+        values = {column.key: getattr(model, column.key) for column in BankAccountModel.__table__.columns}
+        result = await self._async_session.execute(
+            insert(BankAccountModel)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[BankAccountModel.company_id])
+            .returning(BankAccountModel)
+        )
+        created_model = result.scalar_one_or_none()
+        if created_model is not None:
+            await self._outbox.add_many([dict(
+                event_type=BANK_ACCOUNT_ADDED,
+                aggregate_id=created_model.id,
+                payload=event_payload(created_model, BANK_ACCOUNT_EVENT_FIELDS),
+            )])
+        # Committing is up to the unit of work the session belongs to
+        return created_model
 
     async def get_by_id(self, bank_account_id: UUID) -> Optional[BankAccountModel]:
         result = await self._async_session.execute(
@@ -26,13 +49,27 @@ class BankAccountDAO:
         )
         return result.scalar_one_or_none()
 
-    async def get_by_company_id(self, company_id: UUID) -> List[BankAccountModel]:
+    async def get_by_company_id(
+            self, company_id: UUID, limit: Optional[int] = None, after: Optional[PageCursor] = None
+    ) -> List[BankAccountModel]:
+        """
+        The company's bank accounts, newest first. With 'after', only the accounts following that position
+        (keyset pagination on the 'ix_bank_accounts_company_id_created_at_id' index).
+        """
+        query = select(BankAccountModel).where(BankAccountModel.company_id == company_id)
+        if after is not None:
+            query = query.where(
+                tuple_(BankAccountModel.created_at, BankAccountModel.id) < (after.created_at, after.id)
+            )
+        query = query.order_by(BankAccountModel.created_at.desc(), BankAccountModel.id.desc()).limit(limit)
+        result = await self._async_session.execute(query)
+        return list(result.scalars().all())
+
+    async def exists_for_company(self, company_id: UUID) -> bool:
         result = await self._async_session.execute(
-            select(BankAccountModel)
-            .where(BankAccountModel.company_id == company_id)
-            .order_by(BankAccountModel.created_at.desc())
+            select(exists().where(BankAccountModel.company_id == company_id))
         )
-        return list(result.scalars().all())
+        return bool(result.scalar())
 
     async def update(self, model: BankAccountModel) -> BankAccountModel:
         await self._async_session.merge(model)
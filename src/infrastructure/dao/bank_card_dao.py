@@ -1,48 +1,107 @@
-import datetime
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.infrastructure.database.models import BankCardModel
+from src.domain.schemas import PageCursor
+from src.infrastructure.dao.outbox_event_dao import OutboxEventDAO, BANK_CARD_ADDED, event_payload
+from src.infrastructure.database.models import BankCardModel, BankCardPaymentTokenModel
+
+# Fields of a card published in its 'bank_card.added' event; the payment token stays private
+BANK_CARD_EVENT_FIELDS = (
+    "id", "user_id", "card_holder_first_name", "card_holder_last_name", "card_last_four", "expiration_date",
+    "created_at",
+)
 
 
 class BankCardDAO:
     """Data Access Object for bank cards."""
 
+    # asyncpg allows at most 32767 bind parameters per statement, i.e. ~2900 rows of 11 columns
+    BULK_INSERT_CHUNK_SIZE = 1000
+
     def __init__(self, async_session: AsyncSession):
         self._async_session = async_session
+        self._outbox = OutboxEventDAO(async_session)
+
+    @staticmethod
+    def _added_event(model: BankCardModel) -> dict:
+        return dict(
+            event_type=BANK_CARD_ADDED, aggregate_id=model.id, payload=event_payload(model, BANK_CARD_EVENT_FIELDS)
+        )
 
     async def create(self, model: BankCardModel) -> BankCardModel:
+        # Fails with an 'IntegrityError' if the payment token is already bound to a card, of any user
+        self._async_session.add(BankCardPaymentTokenModel(payment_token=model.payment_token))
         self._async_session.add(model)
-        await self._async_session.commit()
-        await self._async_session.refresh(model)
+        # Committing is up to the unit of work the session belongs to
+        await self._async_session.flush()
+        await self._outbox.add_many([self._added_event(model)])
         return model
 
-    async def get_by_id(self, bank_card_id: UUID) -> Optional[BankCardModel]:
-        result = await self._async_session.execute(
-            select(BankCardModel).where(BankCardModel.id == bank_card_id)
-        )
-        return result.scalar_one_or_none()
+    async def create_many(self, models: List[BankCardModel]) -> List[BankCardModel]:
+        """
+        Insert the bank cards with multi-row 'INSERT ... RETURNING' statements (two per chunk).
+        The payment tokens are claimed first, in 'bank_card_payment_tokens'; the cards whose token is already
+        registered (for any user, or earlier in the batch) are skipped and not returned.
+        """
+        columns = BankCardModel.__table__.columns
+        created_models = []
+        for start in range(0, len(models), self.BULK_INSERT_CHUNK_SIZE):
+            chunk = models[start:start + self.BULK_INSERT_CHUNK_SIZE]
+            claimed_tokens = set((await self._async_session.execute(
+                insert(BankCardPaymentTokenModel)
+                .values([{"payment_token": model.payment_token} for model in chunk])
+                .on_conflict_do_nothing(index_elements=[BankCardPaymentTokenModel.payment_token])
+                .returning(BankCardPaymentTokenModel.payment_token)
+            )).scalars().all())
+            claiming_models = []
+            for model in chunk:
+                if model.payment_token in claimed_tokens:
+                    claimed_tokens.remove(model.payment_token)
+                    claiming_models.append(model)
+            if not claiming_models:
+                continue
+
+            result = await self._async_session.execute(
+                insert(BankCardModel)
+                .values([{column.key: getattr(model, column.key) for column in columns} for model in claiming_models])
+                .returning(BankCardModel)
+            )
+            created_models.extend(result.scalars().all())
+        await self._outbox.add_many([self._added_event(model) for model in created_models])
+        # Committing is up to the unit of work the session belongs to
+        return created_models
 
-    # Temporarily commented out due to the lack of a user_id field in the BankCardModel
+    async def get_by_id(self, bank_card_id: UUID, user_id: Optional[UUID] = None) -> Optional[BankCardModel]:
+        """
+        With the 'user_id' of the card, only the partition of that user is searched;
+        without it, the primary key index of every partition is.
+        """
+        query = select(BankCardModel).where(BankCardModel.id == bank_card_id)
+        if user_id is not None:
+            query = query.where(BankCardModel.user_id == user_id)
+        result = await self._async_session.execute(query)
+        return result.scalar_one_or_none()
 
-    # async def get_by_user_id(self, user_id: UUID) -> List[BankCardModel]:
-    #     result = await self._async_session.execute(
-    #         select(BankCardModel)
-    #         .where(BankCardModel.user_id == user_id)
-    #         .order_by(BankCardModel.created_at.desc())
-    #     )
-    #     return list(result.scalars().all())
+    async def get_by_user_id(
+            self, user_id: UUID, limit: Optional[int] = None, after: Optional[PageCursor] = None
+    ) -> List[BankCardModel]:
+        """
+        The user's cards, newest first. With 'after', only the cards following that position (keyset pagination):
+        the 'ix_bank_cards_user_id_created_at_id' index is entered right there, so every page costs the same.
+        The 'user_id' equality prunes the scan to the partition of the user.
+        """
+        query = select(BankCardModel).where(BankCardModel.user_id == user_id)
+        if after is not None:
+            query = query.where(tuple_(BankCardModel.created_at, BankCardModel.id) < (after.created_at, after.id))
+        query = query.order_by(BankCardModel.created_at.desc(), BankCardModel.id.desc()).limit(limit)
+        result = await self._async_session.execute(query)
+        return list(result.scalars().all())
 
     async def update(self, model: BankCardModel) -> BankCardModel:
+        # The primary key is '(id, user_id)', so merging looks the card up in its user's partition only
         await self._async_session.merge(model)
         return model
-
-    async def delete(self, payment_method_id: UUID) -> None:
-        await self._async_session.execute(
-            update(BankCardModel)
-            .where(BankCardModel.id == payment_method_id)
-            .values(deleted_at=datetime.datetime.now(datetime.UTC))
-        )
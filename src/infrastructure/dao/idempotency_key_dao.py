@@ -0,0 +1,56 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.database.models import IdempotencyKeyModel
+
+
+class IdempotencyKeyDAO:
+    """Data Access Object for the stored idempotent responses."""
+
+    def __init__(self, async_session: AsyncSession):
+        self._async_session = async_session
+
+    async def claim(self, key: str, request_hash: str, expires_at: datetime.datetime) -> bool:
+        """
+        Insert the key as 'in progress' in a single round trip.
+        Returns False if the key already exists (completed, or claimed by a concurrent request).
+        """
+        result = await self._async_session.execute(
+            insert(IdempotencyKeyModel)
+            .values(key=key, request_hash=request_hash, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[IdempotencyKeyModel.key])
+            .returning(IdempotencyKeyModel.key)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def get(self, key: str) -> Optional[IdempotencyKeyModel]:
+        result = await self._async_session.execute(
+            select(IdempotencyKeyModel).where(IdempotencyKeyModel.key == key)
+        )
+        return result.scalar_one_or_none()
+
+    async def complete(self, key: str, status_code: int, response_body: bytes, expires_at: datetime.datetime) -> None:
+        await self._async_session.execute(
+            update(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.key == key)
+            .values(status_code=status_code, response_body=response_body, expires_at=expires_at)
+        )
+
+    async def release(self, key: str) -> None:
+        """Delete the key if it is still in progress, so the request can be retried."""
+        await self._async_session.execute(
+            delete(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.key == key, IdempotencyKeyModel.status_code.is_(None))
+        )
+
+    async def delete_expired(self, now: datetime.datetime, key: Optional[str] = None) -> int:
+        """Delete the expired keys (or only 'key', if it has expired). Returns the number of deleted keys."""
+        statement = delete(IdempotencyKeyModel).where(IdempotencyKeyModel.expires_at <= now)
+        if key is not None:
+            statement = statement.where(IdempotencyKeyModel.key == key)
+        result = await self._async_session.execute(statement)
+        return result.rowcount
@@ -0,0 +1,61 @@
+import datetime
+import uuid
+from typing import Any, List, Sequence
+
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.infrastructure.database.models import OutboxEventModel
+
+BANK_CARD_ADDED = "bank_card.added"
+BANK_ACCOUNT_ADDED = "bank_account.added"
+
+
+def event_payload(model: Any, fields: Sequence[str]) -> dict:
+    """JSON-compatible snapshot of the given fields of a database model."""
+    payload = {}
+    for field in fields:
+        value = getattr(model, field)
+        if isinstance(value, datetime.date):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        payload[field] = value
+    return payload
+
+
+class OutboxEventDAO:
+    """Data Access Object for the transactional outbox."""
+
+    def __init__(self, async_session: AsyncSession):
+        self._async_session = async_session
+
+    async def add_many(self, events: List[dict]) -> None:
+        """
+        Insert the events ('event_type', 'aggregate_id' and 'payload' dicts) in a single statement.
+        Committing is up to the unit of work the session belongs to: the events become visible
+        together with the change they describe, or not at all.
+        Nothing is written unless 'OUTBOX_ENABLED': without a relay, nothing would ever delete them.
+        """
+        if events and settings.OUTBOX_ENABLED:
+            await self._async_session.execute(insert(OutboxEventModel), events)
+
+    async def lock_batch(self, limit: int) -> List[OutboxEventModel]:
+        """
+        Oldest events, locked until the end of the transaction.
+        Rows locked by another relay are skipped, so concurrent relays drain disjoint batches.
+        """
+        result = await self._async_session.execute(
+            select(OutboxEventModel)
+            .order_by(OutboxEventModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete_many(self, event_ids: List[int]) -> None:
+        if event_ids:
+            await self._async_session.execute(
+                delete(OutboxEventModel).where(OutboxEventModel.id.in_(event_ids))
+            )
@@ -1,15 +1,83 @@
-from typing import Any, AsyncGenerator
+import logging
+from typing import Any, AsyncGenerator, Iterator, Optional
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
 from src.core.config import settings
+from src.core.metrics import render_family, render_gauge, render_histogram
+from src.infrastructure.database.pool import InstrumentedAsyncQueuePool
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+# Instead of 'echo=True', which writes every statement synchronously to stdout, SQL is logged through
+# the 'sqlalchemy.engine' logger, which LoggerService captures into its (non-blocking) pipeline
+if settings.DB_ECHO:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Engine of the read replica, used by the read-only units of work (see 'ReplicaRouter'), None without a replica
+replica_engine = create_async_engine(
+    settings.REPLICA_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.DB_REPLICA_POOL_SIZE,
+    max_overflow=settings.DB_REPLICA_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+) if settings.REPLICA_DATABASE_URL else None
+replica_session_maker = async_sessionmaker(
+    replica_engine, class_=AsyncSession, expire_on_commit=False
+) if replica_engine is not None else None
+
 Base = declarative_base()
 
 async def get_async_session() -> AsyncGenerator[AsyncSession | Any, Any]:
     async with async_session_maker() as session:
         yield session
+
+
+def get_pool_usage() -> dict:
+    """Occupancy and checkout wait statistics of the engine's connection pool."""
+    return engine.pool.usage()  # type: ignore
+
+
+def get_replica_pool_usage() -> Optional[dict]:
+    """Occupancy and checkout wait statistics of the replica's connection pool, None without a replica."""
+    return replica_engine.pool.usage() if replica_engine is not None else None  # type: ignore
+
+
+def collect_pool_metrics(database_engine: AsyncEngine) -> Iterator[str]:
+    """Prometheus samples of the occupancy and checkout waits of the engine's pool, read at scrape time."""
+    usage = database_engine.pool.usage()  # type: ignore
+    yield from render_gauge("payment_service_db_pool_size", "Configured number of pooled connections.", usage["size"])
+    yield from render_gauge(
+        "payment_service_db_pool_checked_out", "Connections currently in use.", usage["checked_out"]
+    )
+    yield from render_gauge(
+        "payment_service_db_pool_checked_in", "Idle connections available in the pool.", usage["checked_in"]
+    )
+    yield from render_gauge(
+        "payment_service_db_pool_overflow", "Connections opened above the pool size (negative while the pool is not full).", usage["overflow"]
+    )
+    yield from render_family(
+        "payment_service_db_pool_checkout_timeouts_total", "counter", "Checkouts that timed out waiting for a connection."
+    )
+    yield f"payment_service_db_pool_checkout_timeouts_total {usage['timeouts']}"
+
+    yield from render_family(
+        "payment_service_db_pool_checkout_wait_seconds", "histogram", "Time spent waiting for a pooled connection."
+    )
+    yield from render_histogram(
+        "payment_service_db_pool_checkout_wait_seconds",
+        database_engine.pool.checkout_stats.wait_ms,  # type: ignore
+        scale=0.001,
+    )
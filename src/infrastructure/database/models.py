@@ -1,18 +1,37 @@
 import datetime
 import uuid
 from decimal import Decimal
+from typing import Optional
 
-from sqlalchemy import String, TIMESTAMP, Boolean, ForeignKey, Numeric
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import (
+    String, TIMESTAMP, Boolean, ForeignKey, Numeric, UniqueConstraint, SmallInteger, LargeBinary, BigInteger, Identity,
+    Index, Table, Connection, func, event,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.infrastructure.database.database import Base
 
 metadata = Base.metadata
 
+# Hash partitions of 'bank_cards', the same number as created by the migration 'f3a8c6d19b52'
+BANK_CARD_PARTITIONS = 16
+
+
 class BankCardModel(Base):
-    """SQLAlchemy model for bank cards."""
+    """
+    SQLAlchemy model for bank cards.
+
+    The table is hash-partitioned on 'user_id': a query filtering on 'user_id = ...' only touches the partition
+    of that user. Every unique constraint must include the partition key, hence the '(id, user_id)' primary key;
+    the payment tokens are kept unique across all users by 'bank_card_payment_tokens' instead.
+    """
     __tablename__ = 'bank_cards'
+    __table_args__ = (
+        # Keyset pagination of a user's cards (see 'BankCardDAO.get_by_user_id')
+        Index('ix_bank_cards_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        {'postgresql_partition_by': 'HASH (user_id)'},
+    )
     metadata = metadata
 
     id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -20,11 +39,11 @@ class BankCardModel(Base):
     card_holder_last_name: Mapped[str] = mapped_column(String(255), nullable=True)
     card_last_four: Mapped[str] = mapped_column(String(4), nullable=True)
     expiration_date: Mapped[str] = mapped_column(String(5), nullable=True)
-    payment_token: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    payment_token: Mapped[str] = mapped_column(String(255), nullable=False)
     balance: Mapped[Numeric] = mapped_column(Numeric(precision=12, scale=2), default=Decimal(0.00), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
-    user_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     created_at: Mapped[datetime.datetime] = mapped_column(
         TIMESTAMP(timezone=True),
@@ -40,9 +59,50 @@ class BankCardModel(Base):
         return f"<BankCard(id={self.id}, user_id={self.user_id}, balance={self.balance})>"
 
 
+class BankCardPaymentTokenModel(Base):
+    """
+    SQLAlchemy model for the payment tokens of the bank cards, written in the same transaction as the card.
+
+    Not partitioned, so its primary key keeps a payment token bound to a single card across all users,
+    which a unique constraint of the partitioned 'bank_cards' can't (it would have to include 'user_id').
+    """
+    __tablename__ = 'bank_card_payment_tokens'
+    metadata = metadata
+
+    payment_token: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    def __repr__(self):
+        return f"<BankCardPaymentToken(payment_token={self.payment_token})>"
+
+
+@event.listens_for(BankCardModel.__table__, "after_create")
+def create_bank_card_partitions(table: Table, connection: Connection, **kwargs) -> None:
+    """
+    A hash-partitioned table can't take rows before its partitions exist, so 'metadata.create_all'
+    (e.g. '--create-schema' of the benchmarks) creates them along with the table.
+    """
+    if connection.dialect.name != "postgresql" or not table.dialect_options["postgresql"]["partition_by"]:
+        return
+    schema = connection.get_execution_options().get("schema_translate_map", {}).get(table.schema, table.schema)
+    preparer = connection.dialect.identifier_preparer
+    prefix = f"{preparer.quote_schema(schema)}." if schema else ""
+    for remainder in range(BANK_CARD_PARTITIONS):
+        connection.exec_driver_sql(
+            f"CREATE TABLE {prefix}{preparer.quote(f'{table.name}_p{remainder:02d}')} "
+            f"PARTITION OF {prefix}{preparer.quote(table.name)} "
+            f"FOR VALUES WITH (MODULUS {BANK_CARD_PARTITIONS}, REMAINDER {remainder})"
+        )
+
+
 class BankAccountModel(Base):
     """SQLAlchemy model for bank accounts."""
     __tablename__ = 'bank_accounts'
+    __table_args__ = (
+        # A company can have only one bank account
+        UniqueConstraint('company_id', name='uq_bank_accounts_company_id'),
+        # Keyset pagination of a company's bank accounts (see 'BankAccountDAO.get_by_company_id')
+        Index('ix_bank_accounts_company_id_created_at_id', 'company_id', 'created_at', 'id'),
+    )
     metadata = metadata
 
     id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -67,3 +127,41 @@ class BankAccountModel(Base):
 
     def __repr__(self):
         return f"<BankAccount(id={self.id}, company_id={self.company_id}, balance={self.balance})>"
+
+
+class IdempotencyKeyModel(Base):
+    """SQLAlchemy model for the responses stored per 'Idempotency-Key' header."""
+    __tablename__ = 'idempotency_keys'
+    metadata = metadata
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # SHA-256 of the method, path and body of the request the key was first used with
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # NULL while the first request is still being processed
+    status_code: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    response_body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    expires_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key}, status_code={self.status_code}, expires_at={self.expires_at})>"
+
+
+class OutboxEventModel(Base):
+    """
+    SQLAlchemy model for the events waiting to be published to RabbitMQ (transactional outbox).
+    Rows are written in the transaction of the change they describe and deleted once the broker confirmed them.
+    """
+    __tablename__ = 'outbox_events'
+    metadata = metadata
+
+    # Ascending, so the relay publishes the events in the order they were committed (per writer)
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    aggregate_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, event_type={self.event_type}, aggregate_id={self.aggregate_id})>"
@@ -0,0 +1,86 @@
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from src.core.histogram import Histogram
+
+
+class PoolCheckoutStats:
+    """
+    Accumulates connection checkout wait times of a pool.
+
+    Wait time is measured from the moment a connection is requested until the pool hands it out,
+    so it includes queueing for a free slot, opening overflow connections and the pre-ping.
+    """
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self) -> None:
+        self.wait_ms = Histogram(self.BUCKETS_MS)
+        self.timeouts: int = 0
+
+    @property
+    def checkouts(self) -> int:
+        return self.wait_ms.count
+
+    def reset(self) -> None:
+        self.wait_ms.reset()
+        self.timeouts = 0
+
+    def record(self, wait_ms: float) -> None:
+        self.wait_ms.observe(wait_ms)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bucket bound (ms) under which the given fraction of checkouts completed."""
+        return self.wait_ms.percentile(fraction)
+
+    def snapshot(self) -> dict:
+        wait_ms = self.wait_ms.snapshot()
+        return dict(
+            checkouts=wait_ms["count"],
+            timeouts=self.timeouts,
+            mean_wait_ms=wait_ms["mean"],
+            max_wait_ms=wait_ms["max"],
+            p50_wait_ms=wait_ms["p50"],
+            p95_wait_ms=wait_ms["p95"],
+            p99_wait_ms=wait_ms["p99"],
+        )
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long every checkout waited for a connection."""
+
+    def __init__(self, *args, checkout_stats: Optional[PoolCheckoutStats] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = checkout_stats if checkout_stats is not None else PoolCheckoutStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.checkout_stats.record_timeout()
+            raise
+        self.checkout_stats.record((time.perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+    def usage(self) -> dict:
+        """Current pool occupancy together with the accumulated checkout wait statistics."""
+        return dict(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow(),
+            max_overflow=self._max_overflow,
+            **self.checkout_stats.snapshot(),
+        )
@@ -0,0 +1,176 @@
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.histogram import Histogram
+from src.core.logger import LoggerService
+
+# Statements with more distinct shapes than this are accounted under one shared entry
+MAX_STATEMENT_SHAPES = 500
+OTHER_STATEMENTS_SHAPE = "<other statements>"
+
+# Bound parameters are described one by one up to this count, and summarized by type above it
+MAX_DESCRIBED_PARAMETERS = 20
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Positional ($1, ?) and named (%(name)s, :name) DBAPI placeholders
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):\w+|\?")
+# Multi-row VALUES lists, e.g. "VALUES (?, ?), (?, ?), (?, ?)"
+_REPEATED_ROWS_RE = re.compile(r"(\((?:\?, )*\?\))(?:, \1)+")
+# Expanded IN lists, e.g. "IN (?, ?, ?)"
+_IN_LIST_RE = re.compile(r"\bIN \((?:\?, )+\?\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """
+    Normalizes a statement so that all its executions share one entry, whatever the values and
+    the number of rows or IN list items they bind.
+    """
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_RE.sub("?", shape)
+    shape = _REPEATED_ROWS_RE.sub(r"\1, ...", shape)
+    return _IN_LIST_RE.sub("IN (...)", shape)
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describes bound parameters by their names and types only, never by their values."""
+    if executemany:
+        parameter_sets = list(parameters or ())
+        if not parameter_sets:
+            return "[]"
+        return f"[{len(parameter_sets)} x {parameters_shape(parameter_sets[0])}]"
+
+    if not parameters:
+        return "()"
+    if isinstance(parameters, dict):
+        if len(parameters) > MAX_DESCRIBED_PARAMETERS:
+            return _summarize_types(parameters.values())
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in parameters.items()) + "}"
+    if len(parameters) > MAX_DESCRIBED_PARAMETERS:
+        return _summarize_types(parameters)
+    return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+
+
+def _summarize_types(values) -> str:
+    type_counts = Counter(type(value).__name__ for value in values)
+    total = sum(type_counts.values())
+    return f"({total} parameters: " + ", ".join(f"{name} x {count}" for name, count in type_counts.most_common()) + ")"
+
+
+class StatementStats:
+    """Accumulated executions of one statement shape."""
+
+    __slots__ = ("latency_ms", "rows", "errors")
+
+    def __init__(self) -> None:
+        self.latency_ms = Histogram()
+        self.rows: int = 0
+        self.errors: int = 0
+
+    def snapshot(self) -> dict:
+        latency_ms = self.latency_ms.snapshot()
+        return dict(
+            executions=latency_ms.pop("count"),
+            errors=self.errors,
+            rows=self.rows,
+            total_ms=round(self.latency_ms.sum, 3),
+            **{f"{name}_ms": value for name, value in latency_ms.items()},
+        )
+
+
+class QueryInstrumentation:
+    """
+    Records latency, returned rows and errors of every statement executed by an engine, per statement shape,
+    using the engine's cursor execution events.
+    Statements slower than the threshold are written to a separate slow-query logger, with the shapes of
+    their bound parameters only.
+    """
+
+    def __init__(
+            self,
+            slow_query_threshold_ms: float,
+            slow_query_logger: Optional[LoggerService] = None,
+            max_shapes: int = MAX_STATEMENT_SHAPES,
+    ) -> None:
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.slow_query_logger = slow_query_logger
+        self.max_shapes = max_shapes
+        self.slow_queries: int = 0
+        self._statements: dict[str, StatementStats] = {}
+        self._engines: list[AsyncEngine] = []
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+        self._engines.append(engine)
+
+    def detach(self) -> None:
+        for engine in self._engines:
+            sync_engine = engine.sync_engine
+            event.remove(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+            event.remove(sync_engine, "handle_error", self._handle_error)
+        self._engines.clear()
+
+    def reset(self) -> None:
+        self._statements.clear()
+        self.slow_queries = 0
+
+    def snapshot(self) -> dict:
+        """Statistics per statement shape, the most time-consuming first, with the pools' checkout waits."""
+        statements = sorted(self._statements.items(), key=lambda item: item[1].latency_ms.sum, reverse=True)
+        return dict(
+            slow_query_threshold_ms=self.slow_query_threshold_ms,
+            slow_queries=self.slow_queries,
+            statements={shape: stats.snapshot() for shape, stats in statements},
+            pools=[engine.pool.usage() for engine in self._engines if hasattr(engine.pool, "usage")],
+        )
+
+    def _stats_for(self, statement: str) -> StatementStats:
+        shape = statement_shape(statement)
+        stats = self._statements.get(shape)
+        if stats is None:
+            if len(self._statements) >= self.max_shapes:
+                shape = OTHER_STATEMENTS_SHAPE
+                stats = self._statements.get(shape)
+            if stats is None:
+                stats = self._statements[shape] = StatementStats()
+        return stats
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._query_started_at = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started_at = getattr(context, "_query_started_at", None)
+        if started_at is None:
+            return
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+        stats = self._stats_for(statement)
+        stats.latency_ms.observe(elapsed_ms)
+        # -1 when the driver can't tell
+        rows = cursor.rowcount
+        if rows > 0:
+            stats.rows += rows
+
+        if elapsed_ms >= self.slow_query_threshold_ms:
+            self.slow_queries += 1
+            if self.slow_query_logger is not None:
+                self.slow_query_logger.warning(
+                    f"Slow query ({elapsed_ms:.1f} ms, {max(rows, 0)} rows): {statement_shape(statement)} "
+                    f"| parameters: {parameters_shape(parameters, executemany)}"
+                )
+
+    def _handle_error(self, exception_context) -> None:
+        if exception_context.statement is not None:
+            self._stats_for(exception_context.statement).errors += 1
+
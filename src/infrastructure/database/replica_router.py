@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Collection, Hashable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class ReplicaRouter:
+    """
+    Sends the read-only units of work to a read replica, unless one of their callers wrote recently.
+
+    A caller is whoever owns the rows (a user or a company ID): once a unit of work writing for it commits, the
+    caller is pinned to the primary for 'pin_duration' seconds, which should exceed the usual replication lag.
+    Its reads then see its own writes, while everyone else's reads keep going to the replica.
+    Pins are kept in process; a caller whose requests are spread over several instances may still read from
+    the replica on another one.
+    """
+
+    def __init__(
+            self,
+            replica_session_maker: async_sessionmaker[AsyncSession],
+            pin_duration: float = 5.0,
+            max_pinned: int = 100000,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            replica_session_maker (async_sessionmaker): Factory of the sessions of the replica.
+            pin_duration (float): Seconds a caller reads from the primary after its last write.
+            max_pinned (int): Callers pinned at most; beyond that, the oldest pins are dropped early.
+            clock (Callable): Monotonic clock, in seconds.
+        """
+        self.replica_session_maker = replica_session_maker
+        self.pin_duration = pin_duration
+        self._max_pinned = max_pinned
+        self._clock = clock
+
+        self._pinned_until: OrderedDict[Hashable, float] = OrderedDict()
+        self._stats = dict(replica_reads=0, pinned_reads=0, pins=0)
+
+    def pin(self, callers: Collection[Hashable]) -> None:
+        """Routes the reads of 'callers' to the primary for the next 'pin_duration' seconds."""
+        pinned_until = self._clock() + self.pin_duration
+        for caller in callers:
+            self._pinned_until[caller] = pinned_until
+            self._pinned_until.move_to_end(caller)
+            self._stats["pins"] += 1
+        while len(self._pinned_until) > self._max_pinned:
+            self._pinned_until.popitem(last=False)
+
+    def is_pinned(self, caller: Hashable) -> bool:
+        pinned_until = self._pinned_until.get(caller)
+        if pinned_until is None:
+            return False
+        if pinned_until <= self._clock():
+            del self._pinned_until[caller]
+            return False
+        return True
+
+    def read_session_maker(self, callers: Collection[Hashable]) -> Optional[async_sessionmaker[AsyncSession]]:
+        """Session factory of the replica for a read on behalf of 'callers', None if it must go to the primary."""
+        if any(self.is_pinned(caller) for caller in callers):
+            self._stats["pinned_reads"] += 1
+            return None
+        self._stats["replica_reads"] += 1
+        return self.replica_session_maker
+
+    def stats(self) -> dict:
+        return dict(pinned_callers=len(self._pinned_until), pin_duration=self.pin_duration, **self._stats)
@@ -0,0 +1,105 @@
+from typing import Optional, Collection, Hashable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.metrics import instrument
+from src.domain.interfaces.unit_of_work_interface import IUnitOfWork
+from src.domain.models.payment_methods import CardPaymentMethod, BankAccountPaymentMethod
+from src.infrastructure.adapters.cached_balance_payment_gateway import CachedBalancePaymentGateway
+from src.infrastructure.cache.repository_cache import RepositoryCache
+from src.infrastructure.database.replica_router import ReplicaRouter
+from src.infrastructure.repositories.balance_snapshot_bank_card_repository import BalanceSnapshotBankCardRepository
+from src.infrastructure.repositories.bank_account_repository import BankAccountRepository
+from src.infrastructure.repositories.bank_card_repository import BankCardRepository
+from src.infrastructure.repositories.cached_bank_account_repository import CachedBankAccountRepository
+from src.infrastructure.repositories.cached_bank_card_repository import CachedBankCardRepository
+
+
+class SQLAlchemyUnitOfWork(IUnitOfWork):
+    """
+    Unit of work backed by its own AsyncSession.
+
+    A new instance must be created for every business operation (see 'unit_of_work_factory'
+    in 'src.core.dependencies'), so concurrent requests never share a session or a connection.
+
+    With a 'ReplicaRouter', a 'read_only' unit of work runs on the read replica, unless one of its 'callers'
+    is pinned to the primary. A writing unit of work always runs on the primary and pins its 'callers' on commit.
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            instrumented: bool = False,
+            bank_card_cache: Optional[RepositoryCache[UUID, CardPaymentMethod]] = None,
+            bank_account_cache: Optional[RepositoryCache[UUID, BankAccountPaymentMethod]] = None,
+            replica_router: Optional[ReplicaRouter] = None,
+            read_only: bool = False,
+            callers: Collection[Hashable] = (),
+            balance_gateway: Optional[CachedBalancePaymentGateway] = None,
+    ) -> None:
+        """
+        Args:
+            session_maker (async_sessionmaker): Factory of the sessions.
+            instrumented (bool): Record the latency of every repository call into the stage metrics.
+            bank_card_cache (Optional[RepositoryCache]): Serve the bank cards read by ID from this cache.
+            bank_account_cache (Optional[RepositoryCache]): Serve the bank accounts read by ID from this cache.
+            replica_router (Optional[ReplicaRouter]): Route the read-only units of work to the read replica.
+            read_only (bool): The business operation only reads, it may run on the replica.
+            callers (Collection[Hashable]): Owners of the rows read or written (user/company IDs).
+            balance_gateway (Optional[CachedBalancePaymentGateway]): Give the bank cards read their balance snapshot.
+        """
+        self._session_maker = session_maker
+        self._instrumented = instrumented
+        self._bank_card_cache = bank_card_cache
+        self._bank_account_cache = bank_account_cache
+        self._replica_router = replica_router
+        self._read_only = read_only
+        self._callers = callers
+        self._balance_gateway = balance_gateway
+        self._session: Optional[AsyncSession] = None
+        self._cached_repositories: list[CachedBankCardRepository | CachedBankAccountRepository] = []
+
+    async def __aenter__(self) -> "SQLAlchemyUnitOfWork":
+        session_maker, replica_lag = self._session_maker, 0.0
+        if self._read_only and self._replica_router is not None:
+            replica_session_maker = self._replica_router.read_session_maker(self._callers)
+            if replica_session_maker is not None:
+                session_maker, replica_lag = replica_session_maker, self._replica_router.pin_duration
+        self._session = session_maker()
+        self._cached_repositories = []
+
+        bank_cards = BankCardRepository(self._session)
+        if self._bank_card_cache is not None:
+            bank_cards = CachedBankCardRepository(bank_cards, self._bank_card_cache, replica_lag)
+            self._cached_repositories.append(bank_cards)
+        if self._balance_gateway is not None:
+            # Above the repository cache, which keeps the rows as stored, whatever their balance snapshot
+            bank_cards = BalanceSnapshotBankCardRepository(bank_cards, self._balance_gateway)
+        bank_accounts = BankAccountRepository(self._session)
+        if self._bank_account_cache is not None:
+            bank_accounts = CachedBankAccountRepository(bank_accounts, self._bank_account_cache, replica_lag)
+            self._cached_repositories.append(bank_accounts)
+
+        self.bank_cards = instrument(bank_cards, "bank_card_repository", self._instrumented)
+        self.bank_accounts = instrument(bank_accounts, "bank_account_repository", self._instrumented)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            # Anything not committed explicitly is discarded
+            await self.rollback()
+        finally:
+            await self._session.close()
+            self._session = None
+
+    async def commit(self) -> None:
+        await self._session.commit()
+        # The committed rows may have been cached by other units of work while this one was writing them
+        for repository in self._cached_repositories:
+            repository.invalidate_written()
+        if self._replica_router is not None and not self._read_only:
+            self._replica_router.pin(self._callers)
+
+    async def rollback(self) -> None:
+        await self._session.rollback()
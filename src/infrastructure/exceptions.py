@@ -19,6 +19,24 @@ class PaymentGatewayError(PaymentServiceError):
         super().__init__(detail=detail, status_code=500)
 
 
+class IdempotencyKeyInProgressError(PaymentServiceError):
+    """Exception for a request repeating an 'Idempotency-Key' whose first request is still being processed."""
+    def __init__(self, detail: str = "A request with this Idempotency-Key is still being processed. Retry later."):
+        super().__init__(detail=detail, status_code=409)
+
+
+class IdempotencyKeyMismatchError(PaymentServiceError):
+    """Exception for an 'Idempotency-Key' reused with a different request."""
+    def __init__(self, detail: str = "This Idempotency-Key was already used with a different request."):
+        super().__init__(detail=detail, status_code=422)
+
+
+class InvalidCursorError(PaymentServiceError):
+    """Exception for a pagination cursor that wasn't issued by this service."""
+    def __init__(self, detail: str = "Invalid pagination cursor."):
+        super().__init__(detail=detail, status_code=400)
+
+
 class UserServiceError(Exception):
     """Exception for User Service's responses errors."""
     def __init__(self, detail: str = "An error occurred in the User Service.", status_code: int = 500):
@@ -0,0 +1,181 @@
+import asyncio
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional, Sequence, TypeVar
+
+from src.infrastructure.exceptions import UserServiceError, CompanyServiceError, PaymentGatewayError, RabbitMQError
+
+T = TypeVar("T")
+
+
+class LatencyDistribution(ABC):
+    @abstractmethod
+    def sample(self, rng: random.Random) -> float:
+        """Latency in milliseconds."""
+
+
+class NoLatency(LatencyDistribution):
+    def sample(self, rng: random.Random) -> float:
+        return 0.0
+
+
+class FixedLatency(LatencyDistribution):
+    def __init__(self, latency_ms: float) -> None:
+        self.latency_ms = latency_ms
+
+    def sample(self, rng: random.Random) -> float:
+        return self.latency_ms
+
+
+class NormalLatency(LatencyDistribution):
+    def __init__(self, mean_ms: float, stddev_ms: float) -> None:
+        self.mean_ms = mean_ms
+        self.stddev_ms = stddev_ms
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, rng.gauss(self.mean_ms, self.stddev_ms))
+
+
+class LongTailLatency(LatencyDistribution):
+    """
+    Log-normal latency: most calls take about 'median_ms', a few take many times longer.
+    The larger 'sigma', the heavier the tail (p99 is ~ median * e^(2.33 * sigma)).
+    """
+
+    def __init__(self, median_ms: float, sigma: float) -> None:
+        self.median_ms = median_ms
+        self.sigma = sigma
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median_ms), self.sigma)
+
+
+# Exceptions that can be injected, by name; the optional argument is the status code
+INJECTABLE_ERRORS: dict[str, Callable[[int], Exception]] = {
+    "UserServiceError": lambda status_code: UserServiceError(
+        detail="Injected User Service fault.", status_code=status_code or 500
+    ),
+    "CompanyServiceError": lambda status_code: CompanyServiceError(
+        detail="Injected Company Service fault.", status_code=status_code or 500
+    ),
+    "PaymentGatewayError": lambda status_code: PaymentGatewayError(detail="Injected payment gateway fault."),
+    "RabbitMQError": lambda status_code: RabbitMQError(detail="Injected RabbitMQ fault."),
+    "ConnectionError": lambda status_code: ConnectionError("Injected connection fault."),
+}
+
+
+class FaultInjector:
+    """
+    Delays calls by a sampled latency, fails a fraction of them with the configured exceptions
+    and abandons the ones exceeding the timeout.
+    Samples are drawn from a seeded generator, so a run with the same call sequence is reproducible.
+    """
+
+    def __init__(
+            self,
+            latency: LatencyDistribution = NoLatency(),
+            errors: Sequence[tuple[Callable[[], Exception], float]] = (),
+            timeout_ms: Optional[float] = None,
+            seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            latency (LatencyDistribution): Latency added before every call.
+            errors (Sequence): Pairs of an exception factory and the fraction of calls failing with it.
+            timeout_ms (float): Calls (injected latency included) taking longer fail with the timeout error.
+            seed (int): Seed of the random generator.
+        """
+        if sum(rate for _, rate in errors) > 1:
+            raise ValueError("The error rates must not add up to more than 1.")
+        self._latency = latency
+        self._errors = list(errors)
+        self._timeout = timeout_ms / 1000 if timeout_ms is not None else None
+        self._rng = random.Random(seed)
+        self.calls: int = 0
+        self.injected_errors: int = 0
+        self.timeouts: int = 0
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "FaultInjector":
+        """
+        Creates an injector from a specification like
+        'latency=lognormal:20:0.8;errors=UserServiceError/503:0.01,ConnectionError:0.001;timeout_ms=500;seed=42'.
+
+        Latencies: 'fixed:<ms>', 'normal:<mean ms>:<stddev ms>', 'lognormal:<median ms>:<sigma>'.
+        Errors: '<name>[/<status code>]:<rate>', the names are the keys of 'INJECTABLE_ERRORS'.
+        """
+        options = {}
+        for option in filter(None, (part.strip() for part in spec.split(';'))):
+            name, _, value = option.partition('=')
+            options[name.strip()] = value.strip()
+
+        unknown_options = set(options) - {"latency", "errors", "timeout_ms", "seed"}
+        if unknown_options:
+            raise ValueError(f"Unknown fault injection options: {', '.join(sorted(unknown_options))}.")
+
+        return cls(
+            latency=cls._parse_latency(options.get("latency", "")),
+            errors=cls._parse_errors(options.get("errors", "")),
+            timeout_ms=float(options["timeout_ms"]) if options.get("timeout_ms") else None,
+            seed=int(options["seed"]) if options.get("seed") else None,
+        )
+
+    @staticmethod
+    def _parse_latency(value: str) -> LatencyDistribution:
+        if not value or value == "none":
+            return NoLatency()
+        kind, *parameters = value.split(':')
+        arguments = [float(parameter) for parameter in parameters]
+        distributions = {"fixed": (FixedLatency, 1), "normal": (NormalLatency, 2), "lognormal": (LongTailLatency, 2)}
+        if kind not in distributions or len(arguments) != distributions[kind][1]:
+            raise ValueError(f"Invalid latency distribution: '{value}'.")
+        return distributions[kind][0](*arguments)
+
+    @staticmethod
+    def _parse_errors(value: str) -> list[tuple[Callable[[], Exception], float]]:
+        errors = []
+        for error in filter(None, (part.strip() for part in value.split(','))):
+            exception_spec, _, rate = error.rpartition(':')
+            exception_name, _, status_code = exception_spec.partition('/')
+            if exception_name not in INJECTABLE_ERRORS:
+                raise ValueError(f"Exception '{exception_name}' can't be injected.")
+            factory = INJECTABLE_ERRORS[exception_name]
+            code = int(status_code) if status_code else 0
+            errors.append((lambda factory=factory, code=code: factory(code), float(rate)))
+        return errors
+
+    async def run(self, call: Callable[[], Awaitable[T]], timeout_error: Callable[[], Exception]) -> T:
+        """Awaits 'call()' with the injected latency, errors and timeout."""
+        self.calls += 1
+        delay_ms = self._latency.sample(self._rng)
+        error = self._pick_error()
+
+        timeout = asyncio.timeout(self._timeout)
+        try:
+            async with timeout:
+                if delay_ms > 0:
+                    await asyncio.sleep(delay_ms / 1000)
+                if error is not None:
+                    self.injected_errors += 1
+                    raise error
+                return await call()
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            self.timeouts += 1
+            raise timeout_error() from None
+
+    def _pick_error(self) -> Optional[Exception]:
+        if not self._errors:
+            return None
+        draw = self._rng.random()
+        cumulative = 0.0
+        for factory, rate in self._errors:
+            cumulative += rate
+            if draw < cumulative:
+                return factory()
+        return None
+
+    def stats(self) -> dict:
+        return dict(calls=self.calls, injected_errors=self.injected_errors, timeouts=self.timeouts)
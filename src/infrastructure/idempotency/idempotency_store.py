@@ -0,0 +1,188 @@
+import asyncio
+import datetime
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.logger import LoggerService
+from src.infrastructure.cache.ttl_cache import AsyncTTLCache
+from src.infrastructure.dao.idempotency_key_dao import IdempotencyKeyDAO
+from src.infrastructure.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyMismatchError
+
+
+@dataclass(frozen=True, slots=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: bytes
+
+    @property
+    def success(self) -> bool:
+        return 200 <= self.status_code < 300
+
+
+class UnsuccessfulResponse(Exception):
+    """Carries a response that must not be stored (e.g. a validation error), so the request can be retried."""
+
+    def __init__(self, response: StoredResponse) -> None:
+        super().__init__(response.status_code)
+        self.response = response
+
+
+class IdempotencyStore:
+    """
+    Successful responses per 'Idempotency-Key', kept in the 'idempotency_keys' table with an in-memory tier in front.
+
+    The first request with a key claims it in the table, so a duplicate arriving on any instance waits for its
+    result instead of redoing the work. Within one instance, concurrent duplicates share the first request's
+    execution directly (see 'AsyncTTLCache'). A failed request releases the key, so it can be retried.
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            logger: LoggerService,
+            ttl: float,
+            lock_timeout: float,
+            wait_timeout: float,
+            memory_max_size: int,
+            poll_interval: float = 0.05,
+    ) -> None:
+        """
+        Args:
+            session_maker (async_sessionmaker): Factory of the sessions.
+            logger (LoggerService): Logger.
+            ttl (float): Seconds a completed response is replayed for.
+            lock_timeout (float): Seconds after which a key still in progress is considered abandoned (crashed instance).
+            wait_timeout (float): Max seconds a duplicate waits for the first request before getting a 409 response.
+            memory_max_size (int): Max responses kept in memory.
+            poll_interval (float): Seconds between the checks of a key claimed by another instance.
+        """
+        self._session_maker = session_maker
+        self._logger = logger
+        self._ttl = ttl
+        self._lock_timeout = lock_timeout
+        self._wait_timeout = wait_timeout
+        self._poll_interval = poll_interval
+        self._memory: AsyncTTLCache[str, StoredResponse] = AsyncTTLCache(max_size=memory_max_size, ttl=ttl)
+        self._purge_task: Optional[asyncio.Task] = None
+
+    async def run(
+            self,
+            key: str,
+            request_hash: str,
+            handler: Callable[[], Awaitable[StoredResponse]],
+    ) -> tuple[StoredResponse, bool]:
+        """
+        Returns the response stored for 'key', or the one of 'handler()' (which gets stored if successful).
+        The second value tells if the response is a replay.
+        Raises 'UnsuccessfulResponse' carrying the response of a handler that didn't succeed.
+        """
+        executed = False
+
+        async def execute() -> StoredResponse:
+            nonlocal executed
+            executed = True
+            return await handler()
+
+        response = await self._memory.get_or_load(key, lambda: self._load(key, request_hash, execute))
+        if response.request_hash != request_hash:
+            raise IdempotencyKeyMismatchError()
+        return response, not executed
+
+    async def _load(
+            self,
+            key: str,
+            request_hash: str,
+            execute: Callable[[], Awaitable[StoredResponse]],
+    ) -> StoredResponse:
+        deadline = asyncio.get_running_loop().time() + self._wait_timeout
+        while True:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            async with self._session_maker() as session:
+                dao = IdempotencyKeyDAO(session)
+                await dao.delete_expired(now, key)
+                claimed = await dao.claim(key, request_hash, now + datetime.timedelta(seconds=self._lock_timeout))
+                stored = None if claimed else await dao.get(key)
+                await session.commit()
+
+            if claimed:
+                return await self._execute_claimed(key, request_hash, execute)
+
+            if stored is not None and stored.status_code is not None:
+                return StoredResponse(stored.request_hash, stored.status_code, stored.response_body)
+            if stored is not None and stored.request_hash != request_hash:
+                raise IdempotencyKeyMismatchError()
+
+            # Claimed by a request on another instance (or released in the meantime)
+            if asyncio.get_running_loop().time() >= deadline:
+                raise IdempotencyKeyInProgressError()
+            await asyncio.sleep(self._poll_interval)
+
+    async def _execute_claimed(
+            self,
+            key: str,
+            request_hash: str,
+            execute: Callable[[], Awaitable[StoredResponse]],
+    ) -> StoredResponse:
+        try:
+            response = await execute()
+        except BaseException:
+            await self._release(key)
+            raise
+
+        if not response.success:
+            await self._release(key)
+            raise UnsuccessfulResponse(response)
+
+        async with self._session_maker() as session:
+            expires_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=self._ttl)
+            await IdempotencyKeyDAO(session).complete(key, response.status_code, response.body, expires_at)
+            await session.commit()
+        return response
+
+    async def _release(self, key: str) -> None:
+        try:
+            # Shielded: the key must be released even if the request was cancelled (e.g. client disconnect)
+            await asyncio.shield(self._delete_claim(key))
+        except Exception as e:
+            # The claim expires after 'lock_timeout' anyway
+            self._logger.error(f"Failed to release the idempotency key '{key}': {str(e)}.")
+
+    async def _delete_claim(self, key: str) -> None:
+        async with self._session_maker() as session:
+            await IdempotencyKeyDAO(session).release(key)
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        async with self._session_maker() as session:
+            deleted = await IdempotencyKeyDAO(session).delete_expired(datetime.datetime.now(datetime.timezone.utc))
+            await session.commit()
+        return deleted
+
+    def start_purging(self, interval: float) -> None:
+        """Delete the expired keys every 'interval' seconds in the background."""
+        self._purge_task = asyncio.create_task(self._purge_periodically(interval))
+
+    async def _purge_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                deleted = await self.purge_expired()
+                if deleted:
+                    self._logger.info(f"Purged {deleted} expired idempotency keys.")
+            except Exception as e:
+                self._logger.error(f"Failed to purge the expired idempotency keys: {str(e)}.")
+
+    async def close(self) -> None:
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            try:
+                await self._purge_task
+            except asyncio.CancelledError:
+                pass
+            self._purge_task = None
+
+    def cache_stats(self) -> dict:
+        return self._memory.stats()
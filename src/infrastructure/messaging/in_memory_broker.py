@@ -0,0 +1,223 @@
+import asyncio
+import itertools
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from aio_pika import Message
+
+
+class InMemoryIncomingMessage:
+    """Delivered message of the InMemoryBroker. Mirrors the part of 'aio_pika.IncomingMessage' the service uses."""
+
+    def __init__(self, message: Message, channel: "InMemoryChannel", delivery_tag: int, redelivered: bool) -> None:
+        self.body = message.body
+        self.headers = message.headers
+        self.content_type = message.content_type
+        self.correlation_id = message.correlation_id
+        self.reply_to = message.reply_to
+        self.message_id = message.message_id
+        self.delivery_tag = delivery_tag
+        self.redelivered = redelivered
+        self.channel = channel
+        self._message = message
+
+    async def ack(self, multiple: bool = False) -> None:
+        self.channel.settle(self.delivery_tag, multiple=multiple, requeue=None)
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        self.channel.settle(self.delivery_tag, multiple=multiple, requeue=requeue)
+
+    async def reject(self, requeue: bool = False) -> None:
+        self.channel.settle(self.delivery_tag, multiple=False, requeue=requeue)
+
+
+class _Consumer:
+    def __init__(
+            self,
+            tag: str,
+            channel: "InMemoryChannel",
+            callback: Callable[[InMemoryIncomingMessage], Awaitable[Any]],
+            no_ack: bool,
+    ) -> None:
+        self.tag = tag
+        self.channel = channel
+        self.callback = callback
+        self.no_ack = no_ack
+
+    def has_capacity(self) -> bool:
+        return self.no_ack or not self.channel.prefetch_count or \
+            len(self.channel.unacked) < self.channel.prefetch_count
+
+
+class _BrokerQueue:
+    """Broker side state of a queue: pending messages and the consumers subscribed to it."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.pending: deque[tuple[Message, bool]] = deque()
+        self.consumers: List[_Consumer] = []
+
+    def enqueue(self, message: Message, redelivered: bool = False, front: bool = False) -> None:
+        if front:
+            self.pending.appendleft((message, redelivered))
+        else:
+            self.pending.append((message, redelivered))
+        self.dispatch()
+
+    def dispatch(self) -> None:
+        """Hand pending messages to consumers round-robin, respecting their channels' prefetch limits."""
+        while self.pending and self.consumers:
+            for _ in range(len(self.consumers)):
+                consumer = self.consumers.pop(0)
+                self.consumers.append(consumer)
+                if consumer.has_capacity() and not consumer.channel.is_closed:
+                    break
+            else:
+                return
+
+            message, redelivered = self.pending.popleft()
+            incoming = consumer.channel.deliver(self, message, redelivered, consumer.no_ack)
+            asyncio.get_running_loop().create_task(consumer.callback(incoming))
+
+    def detach_channel(self, channel: "InMemoryChannel") -> None:
+        self.consumers = [consumer for consumer in self.consumers if consumer.channel is not channel]
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+
+class InMemoryQueue:
+    """Queue bound to a channel of the InMemoryBroker. Mirrors the part of 'aio_pika.Queue' the service uses."""
+
+    def __init__(self, broker_queue: _BrokerQueue, channel: "InMemoryChannel") -> None:
+        self.name = broker_queue.name
+        self._broker_queue = broker_queue
+        self._channel = channel
+
+    async def consume(
+            self,
+            callback: Callable[[InMemoryIncomingMessage], Awaitable[Any]],
+            no_ack: bool = False,
+            consumer_tag: Optional[str] = None,
+            **kwargs: Any,
+    ) -> str:
+        tag = consumer_tag or f"ctag-{uuid.uuid4().hex}"
+        self._broker_queue.consumers.append(_Consumer(tag, self._channel, callback, no_ack))
+        self._broker_queue.dispatch()
+        return tag
+
+    async def cancel(self, consumer_tag: str, **kwargs: Any) -> None:
+        self._broker_queue.consumers = [
+            consumer for consumer in self._broker_queue.consumers if consumer.tag != consumer_tag
+        ]
+
+
+class _InMemoryExchange:
+    def __init__(self, broker: "InMemoryBroker") -> None:
+        self._broker = broker
+
+    async def publish(self, message: Message, routing_key: str, **kwargs: Any) -> None:
+        # Like the AMQP default exchange: deliver to the queue named after the routing key, drop if there is none
+        queue = self._broker.queues.get(routing_key)
+        if queue is not None:
+            queue.enqueue(message)
+
+
+class InMemoryChannel:
+    """Channel of the InMemoryBroker. Mirrors the part of 'aio_pika.Channel' the service uses."""
+
+    def __init__(self, connection: "InMemoryConnection") -> None:
+        self._connection = connection
+        self._delivery_tags = itertools.count(1)
+        self.default_exchange = _InMemoryExchange(connection.broker)
+        self.prefetch_count = 0
+        self.unacked: Dict[int, tuple[_BrokerQueue, Message]] = {}
+        self.is_closed = False
+
+    async def set_qos(self, prefetch_count: int = 0, **kwargs: Any) -> None:
+        self.prefetch_count = prefetch_count
+
+    async def declare_queue(
+            self,
+            name: Optional[str] = None,
+            *,
+            exclusive: bool = False,
+            **kwargs: Any,
+    ) -> InMemoryQueue:
+        broker = self._connection.broker
+        name = name or f"amq.gen-{uuid.uuid4().hex}"
+        if name not in broker.queues:
+            broker.queues[name] = _BrokerQueue(name)
+            if exclusive:
+                self._connection.exclusive_queues.append(name)
+        return InMemoryQueue(broker.queues[name], self)
+
+    def deliver(
+            self, queue: _BrokerQueue, message: Message, redelivered: bool, no_ack: bool
+    ) -> InMemoryIncomingMessage:
+        delivery_tag = next(self._delivery_tags)
+        if not no_ack:
+            self.unacked[delivery_tag] = (queue, message)
+        return InMemoryIncomingMessage(message, self, delivery_tag, redelivered)
+
+    def settle(self, delivery_tag: int, multiple: bool, requeue: Optional[bool]) -> None:
+        """Ack (requeue=None), nack or reject deliveries up to and including 'delivery_tag'."""
+        tags = [tag for tag in self.unacked if tag <= delivery_tag] if multiple else [delivery_tag]
+        # Requeued messages go back to the head of their queues in their original order
+        for tag in reversed(tags):
+            queue, message = self.unacked.pop(tag)
+            if requeue:
+                queue.pending.appendleft((message, True))
+        # Freed prefetch slots may unblock pending messages of any queue consumed on this channel
+        for queue in list(self._connection.broker.queues.values()):
+            queue.dispatch()
+
+    async def close(self) -> None:
+        if self.is_closed:
+            return
+        self.is_closed = True
+        for queue in self._connection.broker.queues.values():
+            queue.detach_channel(self)
+        # As a real broker does, unacknowledged deliveries of a closed channel go back to their queues
+        unacked, self.unacked = self.unacked, {}
+        for queue, message in reversed(list(unacked.values())):
+            queue.enqueue(message, redelivered=True, front=True)
+
+
+class InMemoryConnection:
+    """Connection of the InMemoryBroker. Mirrors the part of 'aio_pika.RobustConnection' the service uses."""
+
+    def __init__(self, broker: "InMemoryBroker") -> None:
+        self.broker = broker
+        self.exclusive_queues: List[str] = []
+        self._channels: List[InMemoryChannel] = []
+        self.is_closed = False
+
+    async def channel(self, **kwargs: Any) -> InMemoryChannel:
+        channel = InMemoryChannel(self)
+        self._channels.append(channel)
+        return channel
+
+    async def close(self) -> None:
+        self.is_closed = True
+        for channel in self._channels:
+            await channel.close()
+        for name in self.exclusive_queues:
+            self.broker.queues.pop(name, None)
+
+
+class InMemoryBroker:
+    """
+    In-process stand-in for RabbitMQ (default exchange, queues, prefetch, acks and redelivery only).
+    Lets the RabbitMQ clients be exercised and benchmarked without a live broker:
+
+        broker = InMemoryBroker()
+        rpc_client = RabbitMQRPCClient(url="", connect=broker.connect)
+    """
+
+    def __init__(self) -> None:
+        self.queues: Dict[str, _BrokerQueue] = {}
+
+    async def connect(self, url: str = "", **kwargs: Any) -> InMemoryConnection:
+        return InMemoryConnection(self)
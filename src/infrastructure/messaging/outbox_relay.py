@@ -0,0 +1,140 @@
+import asyncio
+import json
+from typing import Awaitable, Callable, Optional
+
+import aio_pika
+from aio_pika import Message, DeliveryMode
+from aio_pika.abc import AbstractChannel, AbstractConnection
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.logger import LoggerService
+from src.infrastructure.dao.outbox_event_dao import OutboxEventDAO
+from src.infrastructure.database.models import OutboxEventModel
+from src.infrastructure.exceptions import RabbitMQError
+
+
+class OutboxRelay:
+    """
+    Publishes the events of the transactional outbox ('outbox_events') to RabbitMQ.
+
+    Every cycle locks a batch of the oldest events ('SELECT ... FOR UPDATE SKIP LOCKED', so several instances can
+    relay side by side), publishes them all at once on a channel with publisher confirms, and deletes the confirmed
+    ones with a single statement in the same transaction. The cost per event shrinks with the batch size: one
+    database round trip per batch, and the confirms of a batch are awaited together rather than one by one.
+
+    Delivery is at-least-once: an event whose deletion didn't commit is published again. The AMQP 'message_id'
+    is the event ID, so consumers can drop duplicates.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            queue_name: str,
+            session_maker: async_sessionmaker[AsyncSession],
+            logger: LoggerService,
+            batch_size: int = 500,
+            poll_interval: float = 0.5,
+            connect: Callable[[str], Awaitable[AbstractConnection]] = aio_pika.connect_robust,
+    ) -> None:
+        """
+        Args:
+            url (str): AMQP URL of the broker.
+            queue_name (str): Durable queue the events are published to (through the default exchange).
+            session_maker (async_sessionmaker): Factory of the sessions reading and deleting the events.
+            logger (LoggerService): Logger of the publishing failures.
+            batch_size (int): Events published per cycle.
+            poll_interval (float): Seconds to wait before the next cycle once the outbox has been drained.
+            connect (Callable): Connection factory. 'InMemoryBroker.connect' can be passed to run without RabbitMQ.
+        """
+        self._url = url
+        self._queue_name = queue_name
+        self._session_maker = session_maker
+        self._logger = logger
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._connect = connect
+
+        self._connection: Optional[AbstractConnection] = None
+        self._channel: Optional[AbstractChannel] = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self.published: int = 0
+        self.failed: int = 0
+
+    async def connect(self) -> None:
+        try:
+            self._connection = await self._connect(self._url)
+            self._channel = await self._connection.channel(publisher_confirms=True)
+            await self._channel.declare_queue(self._queue_name, durable=True)
+        except Exception as e:
+            raise RabbitMQError(detail=f"Could not connect to RabbitMQ: {e}") from e
+
+    def start(self) -> None:
+        self._relay_task = asyncio.create_task(self._relay_continuously())
+        self._logger.info(f"Relaying the outbox events to '{self._queue_name}'.")
+
+    async def stop(self) -> None:
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            self._relay_task = None
+
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _relay_continuously(self) -> None:
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception as e:
+                self._logger.error(f"Failed to relay the outbox events: {str(e)}.")
+                relayed = 0
+            # A full batch means there are probably more events waiting
+            if relayed < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    async def relay_batch(self) -> int:
+        """Publishes and deletes one batch of events. Returns the number of events published."""
+        async with self._session_maker() as session, session.begin():
+            outbox = OutboxEventDAO(session)
+            events = await outbox.lock_batch(self._batch_size)
+            if not events:
+                return 0
+
+            results = await asyncio.gather(*(self._publish(event) for event in events), return_exceptions=True)
+            confirmed_ids = [event.id for event, result in zip(events, results) if not isinstance(result, BaseException)]
+            # The unconfirmed events stay in the outbox, their locks are released on commit
+            await outbox.delete_many(confirmed_ids)
+
+        failures = [result for result in results if isinstance(result, BaseException)]
+        self.published += len(confirmed_ids)
+        self.failed += len(failures)
+        if failures:
+            self._logger.error(f"{len(failures)} outbox events were not confirmed by RabbitMQ: {str(failures[0])}.")
+        return len(confirmed_ids)
+
+    async def _publish(self, event: OutboxEventModel) -> None:
+        body = dict(
+            event_id=event.id,
+            event_type=event.event_type,
+            aggregate_id=str(event.aggregate_id),
+            occurred_at=event.created_at.isoformat(),
+            data=event.payload,
+        )
+        # With publisher confirms, the publish returns once the broker has taken responsibility for the message
+        await self._channel.default_exchange.publish(
+            Message(
+                body=json.dumps(body).encode(),
+                content_type="application/json",
+                delivery_mode=DeliveryMode.PERSISTENT,
+                message_id=str(event.id),
+                type=event.event_type,
+            ),
+            routing_key=self._queue_name,
+        )
+
+    def stats(self) -> dict:
+        return dict(published=self.published, failed=self.failed)
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import aio_pika
+from aio_pika import Message
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractIncomingMessage
+
+from src.infrastructure.exceptions import RabbitMQError
+
+
+class RabbitMQRPCClient:
+    """
+    Request/reply client over RabbitMQ.
+
+    - One long-lived connection per process.
+    - Requests are published through a pool of channels, so concurrent calls don't queue up on one channel.
+    - All replies arrive at one exclusive reply queue and are matched to their callers by correlation ID,
+      which lets any number of in-flight calls share the connection.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            channel_pool_size: int = 8,
+            default_timeout: float = 5.0,
+            connect: Callable[[str], Awaitable[AbstractConnection]] = aio_pika.connect_robust,
+    ) -> None:
+        """
+        Args:
+            url (str): AMQP URL of the broker.
+            channel_pool_size (int): Number of channels used to publish requests.
+            default_timeout (float): Seconds to wait for a reply if the call doesn't specify its own timeout.
+            connect (Callable): Connection factory. 'InMemoryBroker.connect' can be passed to run without RabbitMQ.
+        """
+        self._url = url
+        self._channel_pool_size = channel_pool_size
+        self._default_timeout = default_timeout
+        self._connect = connect
+
+        self._connection: Optional[AbstractConnection] = None
+        self._channels: asyncio.Queue[AbstractChannel] = asyncio.Queue()
+        self._reply_queue_name: Optional[str] = None
+        self._pending_replies: Dict[str, asyncio.Future] = {}
+
+    async def connect(self) -> None:
+        try:
+            self._connection = await self._connect(self._url)
+
+            reply_channel = await self._connection.channel()
+            reply_queue = await reply_channel.declare_queue(exclusive=True, auto_delete=True)
+            await reply_queue.consume(self._on_reply, no_ack=True)
+            self._reply_queue_name = reply_queue.name
+
+            for _ in range(self._channel_pool_size):
+                self._channels.put_nowait(await self._connection.channel())
+        except Exception as e:
+            raise RabbitMQError(detail=f"Could not connect to RabbitMQ: {e}") from e
+
+    async def close(self) -> None:
+        for future in self._pending_replies.values():
+            if not future.done():
+                future.set_exception(RabbitMQError(detail="RabbitMQ RPC client has been closed."))
+        self._pending_replies.clear()
+
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls waiting for a reply."""
+        return len(self._pending_replies)
+
+    async def call(self, routing_key: str, payload: dict, timeout: Optional[float] = None) -> Any:
+        """
+        Publish 'payload' as JSON to the 'routing_key' queue and wait for the JSON reply.
+
+        Raises:
+            RabbitMQError: If the client is not connected or no reply arrived within the timeout.
+        """
+        if self._connection is None:
+            raise RabbitMQError(detail="RabbitMQ RPC client is not connected.")
+
+        timeout = timeout if timeout is not None else self._default_timeout
+        correlation_id = uuid.uuid4().hex
+        reply = asyncio.get_running_loop().create_future()
+        self._pending_replies[correlation_id] = reply
+
+        try:
+            async with self._channel() as channel:
+                await channel.default_exchange.publish(
+                    Message(
+                        body=json.dumps(payload, default=str).encode(),
+                        content_type="application/json",
+                        correlation_id=correlation_id,
+                        reply_to=self._reply_queue_name,
+                        # The broker drops requests nobody picked up before the caller gave up on them
+                        expiration=timeout,
+                    ),
+                    routing_key=routing_key,
+                )
+
+            return json.loads(await asyncio.wait_for(reply, timeout))
+        except asyncio.TimeoutError:
+            raise RabbitMQError(detail=f"No reply from '{routing_key}' within {timeout} seconds.")
+        finally:
+            self._pending_replies.pop(correlation_id, None)
+
+    @asynccontextmanager
+    async def _channel(self) -> AsyncIterator[AbstractChannel]:
+        channel = await self._channels.get()
+        try:
+            if channel.is_closed:
+                channel = await self._connection.channel()
+            yield channel
+        finally:
+            self._channels.put_nowait(channel)
+
+    async def _on_reply(self, message: AbstractIncomingMessage) -> None:
+        reply = self._pending_replies.pop(message.correlation_id, None)
+        # Replies to calls that already timed out are dropped
+        if reply is not None and not reply.done():
+            reply.set_result(message.body)
@@ -0,0 +1,48 @@
+from typing import Optional, List
+from uuid import UUID
+
+from src.domain.interfaces.repositories_interfaces.bank_card_repository_interface import IBankCardRepository
+from src.domain.models.payment_methods import CardPaymentMethod
+from src.domain.schemas import Page, PageCursor
+from src.infrastructure.adapters.cached_balance_payment_gateway import CachedBalancePaymentGateway
+
+
+class BalanceSnapshotBankCardRepository(IBankCardRepository):
+    """
+    Decorator of an IBankCardRepository giving the cards it reads their balance snapshot.
+
+    The balance stored with a card is the one fetched when it was added; the cards read by 'get_by_id' and
+    'get_by_user_id' get the latest one known to the 'BalanceSnapshotCache' of the payment gateway instead.
+    Reads never wait for the bank: a card whose token isn't in the cache yet keeps its stored balance, which seeds
+    the cache and is refreshed in the background.
+    """
+
+    def __init__(self, repository: IBankCardRepository, payment_gateway: CachedBalancePaymentGateway) -> None:
+        self._repository = repository
+        self._payment_gateway = payment_gateway
+
+    async def create(self, bank_card: CardPaymentMethod) -> CardPaymentMethod:
+        return await self._repository.create(bank_card)
+
+    async def create_many(self, bank_cards: List[CardPaymentMethod]) -> List[CardPaymentMethod]:
+        return await self._repository.create_many(bank_cards)
+
+    async def get_by_id(self, bank_card_id: UUID, user_id: Optional[UUID] = None) -> Optional[CardPaymentMethod]:
+        bank_card = await self._repository.get_by_id(bank_card_id, user_id)
+        if bank_card is not None:
+            self._apply_balance_snapshot(bank_card)
+        return bank_card
+
+    async def get_by_user_id(
+            self, user_id: UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[CardPaymentMethod]:
+        page = await self._repository.get_by_user_id(user_id, limit, after)
+        for bank_card in page.items:
+            self._apply_balance_snapshot(bank_card)
+        return page
+
+    async def update(self, bank_card: CardPaymentMethod) -> CardPaymentMethod:
+        return await self._repository.update(bank_card)
+
+    def _apply_balance_snapshot(self, bank_card: CardPaymentMethod) -> None:
+        bank_card.balance = self._payment_gateway.balance_snapshot(bank_card.payment_token, bank_card.balance)
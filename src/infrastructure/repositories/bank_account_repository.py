@@ -4,6 +4,7 @@ from typing import Optional, List
 
 from src.domain.interfaces.repositories_interfaces.bank_account_repository_interface import IBankAccountRepository
 from src.domain.models.payment_methods import BankAccountPaymentMethod
+from src.domain.schemas import Page, PageCursor
 from src.infrastructure.dao.bank_account_dao import BankAccountDAO
 from src.infrastructure.database.models import BankAccountModel
 
@@ -52,20 +53,25 @@ class BankAccountRepository(IBankAccountRepository):
                 datetime.timezone.utc)
         )
 
-    async def create(self, bank_account: BankAccountPaymentMethod) -> BankAccountPaymentMethod:
+    async def create(self, bank_account: BankAccountPaymentMethod) -> Optional[BankAccountPaymentMethod]:
         model = self._to_model(bank_account)
         created_model = await self._dao.create(model)
 
-        return self._to_domain(created_model)
+        return self._to_domain(created_model) if created_model else None
 
     async def get_by_id(self, bank_account_id: uuid.UUID) -> Optional[BankAccountPaymentMethod]:
         model = await self._dao.get_by_id(bank_account_id)
 
         return self._to_domain(model) if model else None
 
-    async def get_by_company_id(self, company_id: uuid.UUID) -> List[BankAccountPaymentMethod]:
-        models = await self._dao.get_by_company_id(company_id)
-        return [self._to_domain(model) for model in models]
+    async def get_by_company_id(
+            self, company_id: uuid.UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[BankAccountPaymentMethod]:
+        models = await self._dao.get_by_company_id(company_id, limit + 1, after)
+        return Page.from_rows([self._to_domain(model) for model in models], limit)
+
+    async def exists_for_company(self, company_id: uuid.UUID) -> bool:
+        return await self._dao.exists_for_company(company_id)
 
     async def update(self, bank_account: BankAccountPaymentMethod) -> BankAccountPaymentMethod:
         model = self._to_model(bank_account)
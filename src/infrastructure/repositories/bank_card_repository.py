@@ -1,11 +1,12 @@
 import uuid
 import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 
 from src.domain.interfaces.repositories_interfaces.bank_card_repository_interface import IBankCardRepository
 from src.domain.models.payment_methods import CardPaymentMethod
+from src.domain.schemas import Page, PageCursor
 from src.infrastructure.dao.bank_card_dao import BankCardDAO
 from src.infrastructure.database.models import BankCardModel
 
@@ -58,22 +59,24 @@ class BankCardRepository(IBankCardRepository):
 
         return self._to_domain(created_model)
 
-    async def get_by_id(self, card_id: UUID) -> Optional[CardPaymentMethod]:
-        model = await self._dao.get_by_id(card_id)
+    async def create_many(self, cards: List[CardPaymentMethod]) -> List[CardPaymentMethod]:
+        created_models = await self._dao.create_many([self._to_model(card) for card in cards])
 
-        return self._to_domain(model) if model else None
+        return [self._to_domain(model) for model in created_models]
+
+    async def get_by_id(self, card_id: UUID, user_id: Optional[UUID] = None) -> Optional[CardPaymentMethod]:
+        model = await self._dao.get_by_id(card_id, user_id)
 
-    # Temporarily commented out due to the lack of 'user_id' field in the database model
+        return self._to_domain(model) if model else None
 
-    # async def get_by_user_id(self, user_id: UUID) -> List[CardPaymentMethod]:
-    #     models = await self._dao.get_by_user_id(user_id)
-    #     return [self._to_domain(model) for model in models]
+    async def get_by_user_id(
+            self, user_id: UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[CardPaymentMethod]:
+        models = await self._dao.get_by_user_id(user_id, limit + 1, after)
+        return Page.from_rows([self._to_domain(model) for model in models], limit)
 
     async def update(self, card: CardPaymentMethod) -> CardPaymentMethod:
         model = self._to_model(card)
         updated_model = await self._dao.update(model)
 
         return self._to_domain(updated_model)
-
-    async def delete(self, card_id: UUID) -> None:
-        await self._dao.delete(card_id)
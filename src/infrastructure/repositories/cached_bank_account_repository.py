@@ -0,0 +1,83 @@
+import copy
+from typing import Optional
+from uuid import UUID
+
+from src.domain.interfaces.repositories_interfaces.bank_account_repository_interface import IBankAccountRepository
+from src.domain.models.payment_methods import BankAccountPaymentMethod
+from src.domain.schemas import Page, PageCursor
+from src.infrastructure.cache.repository_cache import RepositoryCache
+
+
+class CachedBankAccountRepository(IBankAccountRepository):
+    """
+    Read-through caching decorator of an IBankAccountRepository, for a single unit of work.
+
+    'get_by_id' is served from the process-wide 'RepositoryCache'; the other reads go to the wrapped repository.
+    'update' and 'delete' invalidate the account right away and once more on commit ('invalidate_written'), since
+    other units of work may cache the former row until then. The accounts written by this unit of work are never
+    cached by it: what it reads back isn't committed yet.
+    """
+
+    def __init__(
+            self,
+            repository: IBankAccountRepository,
+            cache: RepositoryCache[UUID, BankAccountPaymentMethod],
+            replica_lag: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            repository (IBankAccountRepository): The repository of the unit of work.
+            cache (RepositoryCache): The process-wide cache of the bank accounts.
+            replica_lag (float): Seconds the database of the repository may lag behind the primary (0 for the
+                primary itself). Rows written that recently are not cached from it.
+        """
+        self._repository = repository
+        self._cache = cache
+        self._replica_lag = replica_lag
+        self._written: set[UUID] = set()
+
+    async def create(self, bank_account: BankAccountPaymentMethod) -> Optional[BankAccountPaymentMethod]:
+        return await self._repository.create(bank_account)
+
+    async def get_by_id(self, bank_account_id: UUID) -> Optional[BankAccountPaymentMethod]:
+        if bank_account_id in self._written:
+            return await self._repository.get_by_id(bank_account_id)
+
+        cached = self._cache.get(bank_account_id)
+        if cached is not None:
+            # A copy, so the caller's changes don't leak into the cache before they are saved
+            return copy.copy(cached)
+
+        read_started = self._cache.begin_read()
+        bank_account = await self._repository.get_by_id(bank_account_id)
+        if bank_account is not None:
+            self._cache.store(
+                bank_account_id, copy.copy(bank_account), bank_account.updated_at, read_started, lag=self._replica_lag
+            )
+        return bank_account
+
+    async def get_by_company_id(
+            self, company_id: UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[BankAccountPaymentMethod]:
+        return await self._repository.get_by_company_id(company_id, limit, after)
+
+    async def exists_for_company(self, company_id: UUID) -> bool:
+        return await self._repository.exists_for_company(company_id)
+
+    async def update(self, bank_account: BankAccountPaymentMethod) -> BankAccountPaymentMethod:
+        self._mark_written(bank_account.id)
+        return await self._repository.update(bank_account)
+
+    async def delete(self, bank_account_id: UUID) -> None:
+        self._mark_written(bank_account_id)
+        await self._repository.delete(bank_account_id)
+
+    def _mark_written(self, bank_account_id: UUID) -> None:
+        self._written.add(bank_account_id)
+        self._cache.invalidate(bank_account_id)
+
+    def invalidate_written(self) -> None:
+        """Called by the unit of work once its transaction is over."""
+        for bank_account_id in self._written:
+            self._cache.invalidate(bank_account_id)
+        self._written.clear()
@@ -0,0 +1,79 @@
+import copy
+from typing import Optional, List
+from uuid import UUID
+
+from src.domain.interfaces.repositories_interfaces.bank_card_repository_interface import IBankCardRepository
+from src.domain.models.payment_methods import CardPaymentMethod
+from src.domain.schemas import Page, PageCursor
+from src.infrastructure.cache.repository_cache import RepositoryCache
+
+
+class CachedBankCardRepository(IBankCardRepository):
+    """
+    Read-through caching decorator of an IBankCardRepository, for a single unit of work.
+
+    'get_by_id' is served from the process-wide 'RepositoryCache'; the other reads go to the wrapped repository.
+    'update' invalidates the card right away and once more on commit ('invalidate_written'), since
+    other units of work may cache the former row until then. The cards written by this unit of work are never
+    cached by it: what it reads back isn't committed yet.
+    """
+
+    def __init__(
+            self,
+            repository: IBankCardRepository,
+            cache: RepositoryCache[UUID, CardPaymentMethod],
+            replica_lag: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            repository (IBankCardRepository): The repository of the unit of work.
+            cache (RepositoryCache): The process-wide cache of the bank cards.
+            replica_lag (float): Seconds the database of the repository may lag behind the primary (0 for the
+                primary itself). Rows written that recently are not cached from it.
+        """
+        self._repository = repository
+        self._cache = cache
+        self._replica_lag = replica_lag
+        self._written: set[UUID] = set()
+
+    async def create(self, bank_card: CardPaymentMethod) -> CardPaymentMethod:
+        return await self._repository.create(bank_card)
+
+    async def create_many(self, bank_cards: List[CardPaymentMethod]) -> List[CardPaymentMethod]:
+        return await self._repository.create_many(bank_cards)
+
+    async def get_by_id(self, bank_card_id: UUID, user_id: Optional[UUID] = None) -> Optional[CardPaymentMethod]:
+        if bank_card_id in self._written:
+            return await self._repository.get_by_id(bank_card_id, user_id)
+
+        cached = self._cache.get(bank_card_id)
+        if cached is not None and user_id in (None, cached.user_id):
+            # A copy, so the caller's changes don't leak into the cache before they are saved
+            return copy.copy(cached)
+
+        read_started = self._cache.begin_read()
+        bank_card = await self._repository.get_by_id(bank_card_id, user_id)
+        if bank_card is not None:
+            self._cache.store(
+                bank_card_id, copy.copy(bank_card), bank_card.updated_at, read_started, lag=self._replica_lag
+            )
+        return bank_card
+
+    async def get_by_user_id(
+            self, user_id: UUID, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[CardPaymentMethod]:
+        return await self._repository.get_by_user_id(user_id, limit, after)
+
+    async def update(self, bank_card: CardPaymentMethod) -> CardPaymentMethod:
+        self._mark_written(bank_card.id)
+        return await self._repository.update(bank_card)
+
+    def _mark_written(self, bank_card_id: UUID) -> None:
+        self._written.add(bank_card_id)
+        self._cache.invalidate(bank_card_id)
+
+    def invalidate_written(self) -> None:
+        """Called by the unit of work once its transaction is over."""
+        for bank_card_id in self._written:
+            self._cache.invalidate(bank_card_id)
+        self._written.clear()
@@ -0,0 +1,56 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class BulkheadFullError(Exception):
+    """No call slot became free within the bulkhead's 'max_wait'."""
+
+
+class Bulkhead:
+    """
+    Limits the calls in flight to one dependency, so a slow dependency can only tie up
+    'max_concurrent_calls' coroutines (and whatever they hold, e.g. database sessions).
+    Further callers queue for at most 'max_wait' seconds (0 = reject immediately), then fail with 'BulkheadFullError'.
+    """
+
+    def __init__(self, max_concurrent_calls: int, max_wait: float = 0.0) -> None:
+        self.max_concurrent_calls = max_concurrent_calls
+        self._max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self.in_flight: int = 0
+        self.waiting: int = 0
+        self.rejected_calls: int = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        if self._semaphore.locked():
+            if self._max_wait <= 0:
+                self.rejected_calls += 1
+                raise BulkheadFullError()
+            self.waiting += 1
+            try:
+                async with asyncio.timeout(self._max_wait):
+                    await self._semaphore.acquire()
+            except TimeoutError:
+                self.rejected_calls += 1
+                raise BulkheadFullError() from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return dict(
+            max_concurrent_calls=self.max_concurrent_calls,
+            in_flight=self.in_flight,
+            waiting=self.waiting,
+            rejected_calls=self.rejected_calls,
+        )
@@ -0,0 +1,105 @@
+import time
+from enum import Enum
+from typing import Callable
+
+from src.infrastructure.resilience.rolling_window import RollingCounter
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling a degraded dependency, so callers fail fast instead of queueing behind timeouts.
+
+    - CLOSED: calls pass. Once at least 'minimum_calls' calls were made in the last 'window' seconds and
+      the failure rate among them reaches 'failure_rate_threshold', the circuit opens.
+    - OPEN: calls are rejected for 'open_duration' seconds.
+    - HALF_OPEN: up to 'half_open_max_calls' trial calls pass. If they all succeed the circuit closes,
+      a single failure opens it again.
+    """
+
+    def __init__(
+            self,
+            failure_rate_threshold: float = 0.5,
+            minimum_calls: int = 20,
+            window: float = 10.0,
+            open_duration: float = 5.0,
+            half_open_max_calls: int = 1,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_rate_threshold = failure_rate_threshold
+        self._minimum_calls = minimum_calls
+        self._open_duration = open_duration
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._calls = RollingCounter(window, clock=clock)
+        self._failures = RollingCounter(window, clock=clock)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self.rejected_calls: int = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._open_duration:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+            self._half_open_successes = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Must be called before every call; a rejected call must not be made (nor recorded)."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._half_open_calls < self._half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        self.rejected_calls += 1
+        return False
+
+    def cancel_request(self) -> None:
+        """Returns an allowed call that was not made after all, so it doesn't hold a half-open trial slot."""
+        if self._state is CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        if self._state is CircuitState.HALF_OPEN:
+            self._half_open_successes += 1
+            if self._half_open_successes >= self._half_open_max_calls:
+                self._close()
+            return
+        self._calls.add()
+
+    def record_failure(self) -> None:
+        if self._state is CircuitState.HALF_OPEN:
+            self._open()
+            return
+        self._calls.add()
+        self._failures.add()
+        calls = self._calls.total()
+        if calls >= self._minimum_calls and self._failures.total() / calls >= self._failure_rate_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+
+    def _close(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._calls.reset()
+        self._failures.reset()
+
+    def stats(self) -> dict:
+        return dict(
+            state=self.state.value,
+            calls=self._calls.total(),
+            failures=self._failures.total(),
+            rejected_calls=self.rejected_calls,
+        )
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from src.infrastructure.resilience.bulkhead import Bulkhead, BulkheadFullError
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+
+T = TypeVar("T")
+
+
+class DependencyGuard:
+    """
+    Runs the calls to one dependency through a circuit breaker and a bulkhead.
+
+    The circuit is checked first, so while it is open calls fail without waiting for a bulkhead slot.
+    Only exceptions for which 'is_failure' is true count against the circuit: a dependency answering
+    e.g. 'not found' is healthy.
+    """
+
+    def __init__(
+            self,
+            bulkhead: Bulkhead,
+            circuit_breaker: CircuitBreaker,
+            is_failure: Callable[[BaseException], bool] = lambda exc: True,
+    ) -> None:
+        self.bulkhead = bulkhead
+        self.circuit_breaker = circuit_breaker
+        self._is_failure = is_failure
+
+    async def run(self, call: Callable[[], Awaitable[T]], unavailable_error: Callable[[str], Exception]) -> T:
+        """Awaits 'call()'; a rejected call raises 'unavailable_error(reason)' instead."""
+        if not self.circuit_breaker.allow_request():
+            raise unavailable_error("circuit open")
+
+        try:
+            async with self.bulkhead.acquire():
+                result = await call()
+        except BulkheadFullError:
+            self.circuit_breaker.cancel_request()
+            raise unavailable_error("too many calls in flight") from None
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. the client disconnected), that says nothing about the dependency
+            self.circuit_breaker.cancel_request()
+            raise
+        except Exception as exc:
+            if self._is_failure(exc):
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+            raise
+
+        self.circuit_breaker.record_success()
+        return result
+
+    def stats(self) -> dict:
+        return dict(circuit_breaker=self.circuit_breaker.stats(), bulkhead=self.bulkhead.stats())
@@ -0,0 +1,45 @@
+import random
+import time
+from typing import Callable, Optional
+
+from src.infrastructure.resilience.rolling_window import RollingCounter
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of the calls, so retrying can't multiply the load on a struggling dependency.
+
+    Over the last 'window' seconds, at most 'ratio' * calls + 'min_retries_per_second' * window retries are allowed.
+    The minimum keeps occasional retries possible at low traffic.
+    """
+
+    def __init__(
+            self,
+            ratio: float = 0.1,
+            min_retries_per_second: float = 5.0,
+            window: float = 10.0,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ratio = ratio
+        self._min_retries = min_retries_per_second * window
+        self._calls = RollingCounter(window, clock=clock)
+        self._retries = RollingCounter(window, clock=clock)
+        self.exhausted: int = 0
+
+    def record_call(self) -> None:
+        self._calls.add()
+
+    def try_acquire_retry(self) -> bool:
+        if self._retries.total() >= self._ratio * self._calls.total() + self._min_retries:
+            self.exhausted += 1
+            return False
+        self._retries.add()
+        return True
+
+    def stats(self) -> dict:
+        return dict(calls=self._calls.total(), retries=self._retries.total(), exhausted=self.exhausted)
+
+
+def jittered_backoff(attempt: int, base: float, cap: float, rng: Optional[random.Random] = None) -> float:
+    """'Full jitter' backoff: a random delay up to base * 2^attempt (capped), in seconds."""
+    return (rng or random).uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,36 @@
+import math
+import time
+from typing import Callable
+
+
+class RollingCounter:
+    """
+    Counts events over the last 'window' seconds, in 'buckets' time slices.
+    Old slices are zeroed lazily, so counting is O(1) and needs no background task.
+    """
+
+    def __init__(self, window: float, buckets: int = 10, clock: Callable[[], float] = time.monotonic) -> None:
+        self._bucket_width = window / buckets
+        self._counts = [0] * buckets
+        self._epochs = [-1] * buckets
+        self._clock = clock
+
+    def _current_bucket(self) -> int:
+        epoch = math.floor(self._clock() / self._bucket_width)
+        index = epoch % len(self._counts)
+        if self._epochs[index] != epoch:
+            self._epochs[index] = epoch
+            self._counts[index] = 0
+        return index
+
+    def add(self, amount: int = 1) -> None:
+        self._counts[self._current_bucket()] += amount
+
+    def total(self) -> int:
+        current_epoch = math.floor(self._clock() / self._bucket_width)
+        oldest_epoch = current_epoch - len(self._counts) + 1
+        return sum(count for count, epoch in zip(self._counts, self._epochs) if epoch >= oldest_epoch)
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self._epochs = [-1] * len(self._epochs)
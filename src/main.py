@@ -2,11 +2,14 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
-from starlette.middleware.base import BaseHTTPMiddleware
 
-from src.core.dependencies import setup_dependencies
+from src.core.config import settings
+from src.core.dependencies import setup_dependencies, shutdown_dependencies
 from src.core.middleware.clients_filter_middleware import IPFilterMiddleware
 from src.core.middleware.exceptions_middleware import ExceptionMiddleware
+from src.core.middleware.idempotency_middleware import IdempotencyMiddleware
+from src.core.middleware.metrics_middleware import MetricsMiddleware
+from src.presentation.api.metrics_routes import metrics_router
 from src.presentation.api.v1.payment_routes import payment_router
 
 
@@ -15,6 +18,7 @@ async def lifespan(_app: FastAPI):
     """FastAPI lifespan event handler для startup и shutdown."""
     _app.state.dependencies = await setup_dependencies()  # type: ignore
     yield
+    await shutdown_dependencies(_app.state.dependencies)  # type: ignore
 
 
 def create_app() -> FastAPI:
@@ -25,9 +29,22 @@ def create_app() -> FastAPI:
 app = create_app()
 
 app.include_router(payment_router)
-
-app.add_middleware(IPFilterMiddleware)  # type: ignore
-app.add_middleware(BaseHTTPMiddleware, dispatch=ExceptionMiddleware(app=app).dispatch)  # type: ignore
+app.include_router(metrics_router)
+
+app.add_middleware(
+    IdempotencyMiddleware,  # type: ignore
+    paths=[f"{payment_router.prefix}/bank_card", f"{payment_router.prefix}/bank_account"],
+)
+app.add_middleware(
+    IPFilterMiddleware,  # type: ignore
+    allowed_networks=settings.ALLOWED_CLIENT_NETWORKS.split(','),
+    trusted_proxies=settings.TRUSTED_PROXY_NETWORKS.split(','),
+    cache_size=settings.IP_FILTER_CACHE_SIZE,
+)
+app.add_middleware(ExceptionMiddleware)  # type: ignore
+if settings.METRICS_ENABLED:
+    # Outermost, so the recorded status is the one the client gets
+    app.add_middleware(MetricsMiddleware)  # type: ignore
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from src.core.metrics import metrics, CONTENT_TYPE_LATEST
+
+metrics_router = APIRouter(
+    tags=["Metrics"],
+)
+
+
+@metrics_router.get('/metrics', include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    CONTROLLER: Expose the service metrics in the Prometheus text format.
+
+    Returns:
+        Response: Latency histograms, error counters and database pool gauges.
+    """
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE_LATEST)
@@ -1,12 +1,22 @@
-from typing import Annotated
-from fastapi import APIRouter, Body, Depends
+from typing import Annotated, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, Query
 
 from src.application.use_cases.add_bank_account import AddBankAccountUseCase
 from src.application.use_cases.add_bank_card import AddBankCardUseCase
-from src.core.dependencies import get_add_bank_card_use_case, get_add_bank_account_use_case
+from src.application.use_cases.add_bank_cards_batch import AddBankCardsBatchUseCase
+from src.application.use_cases.list_bank_accounts import ListBankAccountsUseCase
+from src.application.use_cases.list_bank_cards import ListBankCardsUseCase
+from src.core.config import settings
+from src.core.dependencies import get_add_bank_card_use_case, get_add_bank_account_use_case, \
+    get_add_bank_cards_batch_use_case, get_list_bank_cards_use_case, get_list_bank_accounts_use_case
 from src.domain.models.payment_methods import CardPaymentMethod, BankAccountPaymentMethod
 from src.domain.schemas import AddBankCardDTO, AddBankAccountDTO
-from src.presentation.schemas import AddBankCardRequest, AddBankAccountRequest, APIResponse
+from src.presentation.pagination import encode_cursor, decode_cursor
+from src.presentation.responses import APIJSONResponse, api_response
+from src.presentation.schemas import AddBankCardRequest, AddBankAccountRequest, APIResponse, \
+    AddBankCardsBatchRequest, AddBankCardBatchItemResponse, BankCardsPageResponse, BankAccountsPageResponse
 
 payment_router = APIRouter(
     tags=["Payment"],
@@ -17,54 +27,154 @@ payment_router = APIRouter(
 async def add_bank_card(
         card_info: Annotated[AddBankCardRequest, Body(...)],
         use_case: Annotated[AddBankCardUseCase, Depends(get_add_bank_card_use_case)],
-) -> APIResponse[CardPaymentMethod]:
+) -> APIJSONResponse:
     """
     CONTROLLER: Add a payment method to the user's account.
     Passes the query to the 'AddBankCardUseCase'.
 
+    A retry with the same 'Idempotency-Key' header gets the first response replayed (see 'IdempotencyMiddleware').
+
     Args:
         card_info (AddBankCardRequest): The card information to add to the user's account.
         use_case (AddBankCardUseCase): The payment use_case to process the operation.
 
     Returns:
-        APIResponse: A response schema containing status code, message and bank response.
+        APIJSONResponse: A response schema containing status code, message and bank response.
     """
     bank_card_domain_dto = AddBankCardDTO(**card_info.model_dump())
     card_domain_model = await use_case.execute(bank_card_domain_dto)
 
-    return APIResponse(
-        success=True,
+    return api_response(
+        APIResponse[CardPaymentMethod],
+        content=card_domain_model,
         message='Payment method added successfully.',
-        content={
-            **card_domain_model.to_dict()
-        }
+        status_code=201,
     )
 
 
+@payment_router.post(
+    '/bank_card/batch', response_model=APIResponse[list[AddBankCardBatchItemResponse]], status_code=207
+)
+async def add_bank_cards_batch(
+        batch_info: Annotated[AddBankCardsBatchRequest, Body(...)],
+        use_case: Annotated[AddBankCardsBatchUseCase, Depends(get_add_bank_cards_batch_use_case)],
+) -> APIJSONResponse:
+    """
+    CONTROLLER: Add many payment methods to the users' accounts at once.
+    Passes the query to the 'AddBankCardsBatchUseCase'.
+
+    Args:
+        batch_info (AddBankCardsBatchRequest): The cards information to add to the users' accounts.
+        use_case (AddBankCardsBatchUseCase): The payment use_case to process the operation.
+
+    Returns:
+        APIJSONResponse: A response schema containing status code, message and the outcome of every card.
+    """
+    bank_card_domain_dtos = [AddBankCardDTO(**card_info.model_dump()) for card_info in batch_info.cards]
+    results = await use_case.execute(bank_card_domain_dtos)
+    added_count = sum(result.success for result in results)
+
+    return api_response(
+        APIResponse[list[AddBankCardBatchItemResponse]],
+        content=[
+            AddBankCardBatchItemResponse.model_construct(
+                index=result.index,
+                success=result.success,
+                content=result.card,
+                error=result.error
+            )
+            for result in results
+        ],
+        message=f'{added_count} of {len(results)} payment methods added successfully.',
+        success=added_count == len(results),
+        status_code=207,
+    )
+
 
 @payment_router.post('/bank_account', response_model=APIResponse[BankAccountPaymentMethod], status_code=201)
 async def add_bank_account(
         bank_account_info: Annotated[AddBankAccountRequest, Body(...)],
         use_case: Annotated[AddBankAccountUseCase, Depends(get_add_bank_account_use_case)],
-) -> APIResponse[BankAccountPaymentMethod]:
+) -> APIJSONResponse:
     """
     CONTROLLER: Add a payment method to the company's account.
     Passes the query to the 'AddBankAccountUseCase'.
 
+    A retry with the same 'Idempotency-Key' header gets the first response replayed (see 'IdempotencyMiddleware').
+
     Args:
         bank_account_info (AddBankAccountRequest): The bank account information to add.
         use_case (AddBankAccountUseCase): The use case to process the operation.
 
     Returns:
-        APIResponse: A response schema containing status code, message and bank response.
+        APIJSONResponse: A response schema containing status code, message and bank response.
     """
     bank_account_domain_dto = AddBankAccountDTO(**bank_account_info.model_dump())
     bank_account_domain_model = await use_case.execute(bank_account_domain_dto)
 
-    return APIResponse(
-        success=True,
+    return api_response(
+        APIResponse[BankAccountPaymentMethod],
+        content=bank_account_domain_model,
         message='Payment method added successfully.',
-        content={
-            **bank_account_domain_model.to_dict()
-        }
+        status_code=201,
+    )
+
+
+@payment_router.get('/users/{user_id}/bank_cards', response_model=APIResponse[BankCardsPageResponse])
+async def list_bank_cards(
+        user_id: UUID,
+        use_case: Annotated[ListBankCardsUseCase, Depends(get_list_bank_cards_use_case)],
+        limit: Annotated[int, Query(ge=1, le=settings.PAGE_MAX_LIMIT)] = settings.PAGE_DEFAULT_LIMIT,
+        cursor: Annotated[Optional[str], Query(description="'next_cursor' of the previous page.")] = None,
+) -> APIJSONResponse:
+    """
+    CONTROLLER: List the payment methods of the user's account, newest first.
+    Passes the query to the 'ListBankCardsUseCase'.
+
+    Args:
+        user_id (UUID): The user whose bank cards are listed.
+        use_case (ListBankCardsUseCase): The use case to process the operation.
+        limit (int): Bank cards per page.
+        cursor (Optional[str]): Where the page starts, None for the first page.
+
+    Returns:
+        APIJSONResponse: A response schema containing status code, message and the page of bank cards.
+    """
+    page = await use_case.execute(user_id, limit, decode_cursor(cursor))
+
+    return api_response(
+        APIResponse[BankCardsPageResponse],
+        content=BankCardsPageResponse.model_construct(items=page.items, next_cursor=encode_cursor(page.next_cursor)),
+        message='Payment methods retrieved successfully.',
+    )
+
+
+@payment_router.get('/companies/{company_id}/bank_accounts', response_model=APIResponse[BankAccountsPageResponse])
+async def list_bank_accounts(
+        company_id: UUID,
+        use_case: Annotated[ListBankAccountsUseCase, Depends(get_list_bank_accounts_use_case)],
+        limit: Annotated[int, Query(ge=1, le=settings.PAGE_MAX_LIMIT)] = settings.PAGE_DEFAULT_LIMIT,
+        cursor: Annotated[Optional[str], Query(description="'next_cursor' of the previous page.")] = None,
+) -> APIJSONResponse:
+    """
+    CONTROLLER: List the payment methods of the company's account, newest first.
+    Passes the query to the 'ListBankAccountsUseCase'.
+
+    Args:
+        company_id (UUID): The company whose bank accounts are listed.
+        use_case (ListBankAccountsUseCase): The use case to process the operation.
+        limit (int): Bank accounts per page.
+        cursor (Optional[str]): Where the page starts, None for the first page.
+
+    Returns:
+        APIJSONResponse: A response schema containing status code, message and the page of bank accounts.
+    """
+    page = await use_case.execute(company_id, limit, decode_cursor(cursor))
+
+    return api_response(
+        APIResponse[BankAccountsPageResponse],
+        content=BankAccountsPageResponse.model_construct(
+            items=page.items, next_cursor=encode_cursor(page.next_cursor)
+        ),
+        message='Payment methods retrieved successfully.',
     )
@@ -0,0 +1,201 @@
+import asyncio
+import json
+from dataclasses import asdict
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+import aio_pika
+from aio_pika import Message
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractIncomingMessage, AbstractQueue
+from pydantic import ValidationError
+
+from src.application.use_cases.add_bank_account import AddBankAccountUseCase
+from src.application.use_cases.add_bank_card import AddBankCardUseCase
+from src.core.logger import LoggerService
+from src.domain.interfaces.message_queue_interface import IQueueListener
+from src.domain.schemas import RabbitMQResponse, AddBankCardDTO, AddBankAccountDTO
+from src.infrastructure.exceptions import RabbitMQError
+from src.presentation.schemas import AddBankCardRequest, AddBankAccountRequest
+
+
+class PaymentCommandsListener(IQueueListener):
+    """
+    CONTROLLER: Consumes 'add_bank_card' / 'add_bank_account' commands from RabbitMQ.
+
+    A command is a JSON message '{"action": "add_bank_card", "data": {...}}' whose 'data' has the same schema as
+    the body of the corresponding HTTP endpoint. If the message has 'reply_to', a 'RabbitMQResponse' with the same
+    correlation ID is sent back.
+
+    Up to 'prefetch_count' commands are processed concurrently. Finished commands are acknowledged in batches
+    (one by one behind a command still in progress); a command is never acknowledged before it has been processed,
+    so nothing is lost if the service stops.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            queue_name: str,
+            add_bank_card_use_case: AddBankCardUseCase,
+            add_bank_account_use_case: AddBankAccountUseCase,
+            logger: LoggerService,
+            prefetch_count: int = 32,
+            ack_batch_size: int = 16,
+            ack_flush_interval: float = 0.05,
+            connect: Callable[[str], Awaitable[AbstractConnection]] = aio_pika.connect_robust,
+    ) -> None:
+        self._url = url
+        self._queue_name = queue_name
+        self._logger = logger
+        self._prefetch_count = prefetch_count
+        # Unacknowledged finished commands occupy prefetch slots, so a batch must never fill the whole window
+        self._ack_batch_size = max(1, min(ack_batch_size, prefetch_count // 2))
+        self._ack_flush_interval = ack_flush_interval
+        self._connect = connect
+
+        self._handlers = {
+            "add_bank_card": self._add_bank_card,
+            "add_bank_account": self._add_bank_account,
+        }
+        self._add_bank_card_use_case = add_bank_card_use_case
+        self._add_bank_account_use_case = add_bank_account_use_case
+
+        self._connection: Optional[AbstractConnection] = None
+        self._channel: Optional[AbstractChannel] = None
+        self._queue: Optional[AbstractQueue] = None
+        self._consumer_tag: Optional[str] = None
+        self._ack_flusher: Optional[asyncio.Task] = None
+
+        self._in_flight: Set[asyncio.Task] = set()
+        self._in_progress_tags: Set[int] = set()
+        self._processed: Dict[int, AbstractIncomingMessage] = {}  # Processed, but not acknowledged yet
+
+    async def connect(self) -> None:
+        try:
+            self._connection = await self._connect(self._url)
+            self._channel = await self._connection.channel()
+            await self._channel.set_qos(prefetch_count=self._prefetch_count)
+            self._queue = await self._channel.declare_queue(self._queue_name, durable=True)
+        except Exception as e:
+            raise RabbitMQError(detail=f"Could not connect to RabbitMQ: {e}") from e
+
+    async def start_listening(self) -> None:
+        self._consumer_tag = await self._queue.consume(self._on_message)
+        self._ack_flusher = asyncio.create_task(self._flush_acks_periodically())
+        self._logger.info(f"Listening for payment commands on '{self._queue_name}'.")
+
+    async def stop(self, drain_timeout: float = 30.0) -> None:
+        """Stop consuming, let in-flight commands finish and acknowledge them, then close the connection."""
+        if self._consumer_tag is not None:
+            await self._queue.cancel(self._consumer_tag)
+            self._consumer_tag = None
+
+        if self._in_flight:
+            _, unfinished = await asyncio.wait(self._in_flight, timeout=drain_timeout)
+            if unfinished:
+                # Their messages stay unacknowledged and the broker redelivers them
+                self._logger.warning(f"{len(unfinished)} payment commands did not finish in {drain_timeout} s.")
+                for task in unfinished:
+                    task.cancel()
+
+        if self._ack_flusher is not None:
+            self._ack_flusher.cancel()
+            self._ack_flusher = None
+        await self._flush_acks()
+
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def send_response(self, routing_key: str, response: RabbitMQResponse, correlation_id: str) -> None:
+        await self._channel.default_exchange.publish(
+            Message(
+                body=json.dumps(asdict(response), default=str).encode(),
+                content_type="application/json",
+                correlation_id=correlation_id,
+            ),
+            routing_key=routing_key,
+        )
+
+    async def _on_message(self, message: AbstractIncomingMessage) -> None:
+        # aio-pika runs every delivery in its own task, the prefetch count bounds how many run at once
+        task = asyncio.current_task()
+        self._in_flight.add(task)
+        self._in_progress_tags.add(message.delivery_tag)
+        try:
+            response = await self._process(message)
+            if message.reply_to:
+                await self.send_response(message.reply_to, response, message.correlation_id)
+        except asyncio.CancelledError:
+            # The tag stays "in progress", so no batched ack covers it and the broker redelivers the command
+            raise
+        except Exception as e:
+            self._logger.error(f"Could not reply to the payment command {message.correlation_id}: {e}.")
+        finally:
+            self._in_flight.discard(task)
+
+        self._in_progress_tags.discard(message.delivery_tag)
+        self._processed[message.delivery_tag] = message
+        if len(self._processed) >= self._ack_batch_size:
+            await self._flush_acks()
+
+    async def _process(self, message: AbstractIncomingMessage) -> RabbitMQResponse:
+        try:
+            command = json.loads(message.body)
+            handler = self._handlers.get(command.get("action"))
+            if handler is None:
+                return RabbitMQResponse.error_response(400, f"Unknown action: {command.get('action')}.")
+
+            return await handler(command.get("data", {}))
+        except (ValueError, ValidationError) as e:
+            return RabbitMQResponse.error_response(400, f"Error while adding the payment method: {e}")
+        except Exception as e:
+            status_code = getattr(e, "status_code", 500)
+            if status_code >= 500:
+                self._logger.error(f"Payment command {message.correlation_id} failed: {e}.")
+            return RabbitMQResponse.error_response(status_code, str(e))
+
+    async def _add_bank_card(self, data: dict) -> RabbitMQResponse:
+        card_info = AddBankCardRequest.model_validate(data)
+        card_domain_model = await self._add_bank_card_use_case.execute(AddBankCardDTO(**card_info.model_dump()))
+
+        return RabbitMQResponse.success_response(201, card_domain_model.to_serializable_dict())
+
+    async def _add_bank_account(self, data: dict) -> RabbitMQResponse:
+        bank_account_info = AddBankAccountRequest.model_validate(data)
+        bank_account_domain_model = await self._add_bank_account_use_case.execute(
+            AddBankAccountDTO(**bank_account_info.model_dump())
+        )
+
+        return RabbitMQResponse.success_response(201, bank_account_domain_model.to_serializable_dict())
+
+    async def _flush_acks(self) -> None:
+        """
+        Acknowledge processed commands.
+        Delivery tags of a channel grow monotonically and 'multiple' acks every tag up to the given one, so the
+        processed tags below the oldest command still in progress are acknowledged with a single 'multiple' ack.
+        Those above it are acknowledged one by one: held back, they would fill the prefetch window and a single
+        slow command would stop the broker from delivering any other.
+        """
+        if not self._processed:
+            return
+
+        watermark = min(self._in_progress_tags, default=None)
+        contiguous_tags = [tag for tag in self._processed if watermark is None or tag < watermark]
+        last_contiguous_message = self._processed[max(contiguous_tags)] if contiguous_tags else None
+        for tag in contiguous_tags:
+            del self._processed[tag]
+        # Taken out before any await, so a concurrent flush never acknowledges a message twice
+        blocked_messages = list(self._processed.values())
+        self._processed.clear()
+
+        if last_contiguous_message is not None:
+            await last_contiguous_message.ack(multiple=True)
+        for message in blocked_messages:
+            await message.ack()
+
+    async def _flush_acks_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._ack_flush_interval)
+            try:
+                await self._flush_acks()
+            except Exception as e:
+                self._logger.error(f"Could not acknowledge payment commands: {e}.")
@@ -0,0 +1,27 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from src.domain.schemas import PageCursor
+from src.infrastructure.exceptions import InvalidCursorError
+
+
+def encode_cursor(cursor: Optional[PageCursor]) -> Optional[str]:
+    """Opaque, URL-safe form of a page cursor, handed to the clients as 'next_cursor'."""
+    if cursor is None:
+        return None
+    raw = f"{cursor.created_at.isoformat()}|{cursor.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(value: Optional[str]) -> Optional[PageCursor]:
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        created_at, _, cursor_id = raw.partition("|")
+        return PageCursor(created_at=datetime.fromisoformat(created_at), id=UUID(cursor_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError()
@@ -0,0 +1,36 @@
+from typing import Any
+
+from starlette.responses import Response
+
+from src.presentation.schemas import APIResponse
+
+
+class APIJSONResponse(Response):
+    """
+    JSON response rendered straight from an 'APIResponse' model by pydantic-core's serializer.
+
+    Routes returning it skip FastAPI's re-validation of the returned object against 'response_model' and the
+    intermediate 'jsonable_encoder' dict: the domain objects are encoded once, with UUID, Decimal and datetime
+    handled natively. 'response_model' is still declared on the route, for the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content.model_dump_json().encode() if isinstance(content, APIResponse) else super().render(content)
+
+
+def api_response(
+        response_model: type[APIResponse],
+        content: Any,
+        message: str,
+        success: bool = True,
+        status_code: int = 200,
+) -> APIJSONResponse:
+    """
+    Builds the 'response_model' (e.g. 'APIResponse[CardPaymentMethod]') without validating it: 'content'
+    must already be of its content type, as the domain objects returned by the use cases are.
+    """
+    return APIJSONResponse(
+        response_model.model_construct(success=success, message=message, content=content),
+        status_code=status_code,
+    )
@@ -1,5 +1,4 @@
-import re
-from datetime import date, datetime
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Annotated, Optional, TypeVar, Generic
@@ -7,6 +6,10 @@ from uuid import UUID
 
 from pydantic import BaseModel, StringConstraints, field_validator, Field, ConfigDict
 
+from src.core.config import settings
+from src.domain import validation
+from src.domain.models.payment_methods import CardPaymentMethod, BankAccountPaymentMethod
+
 ApiResponseData = TypeVar("ApiResponseData")
 
 
@@ -32,50 +35,69 @@ class AddBankCardRequest(BaseModel):
     @property
     def expiration_month(self) -> int | None:
         """Returns the expiration month as an integer."""
-        match = re.match(r"^(0[1-9]|1[0-2])/\d{2}$", self.expiration_date)
-        if match:
-            return int(match[1])
-        return None
+        parsed = validation.parse_expiration_date(self.expiration_date)
+        return parsed[0] if parsed else None
 
     @property
     def expiration_year(self) -> int | None:
         """Returns the expiration year as a full 4-digit integer (e.g., 2024)."""
-        match = re.match(r"^(0[1-9]|1[0-2])/(\d{2})$", self.expiration_date)
-        if match:
-            year_short = int(match[2])
-            return 2000 + year_short
-        return None
+        parsed = validation.parse_expiration_date(self.expiration_date)
+        return parsed[1] if parsed else None
 
     @field_validator("expiration_date")
     @classmethod
-    def validate_expiration(cls, v):
-        match = re.match(r"^(0[1-9]|1[0-2])/(\d{2})$", v)
-        if not match:
-            raise ValueError("Invalid expiration date format. Use MM/YY instead.")
-
-        month, year = int(match[1]), int(match[2])
-
-        full_year = 2000 + year
-
-        exp_date = date(full_year, month, 1)
-        if exp_date < date.today():
-            raise ValueError("Expiration date must be in the future.")
-
-        return v
+    def validate_expiration(cls, value: str) -> str:
+        return validation.validate_expiration_date(value)
 
     @field_validator("card_number")
     @classmethod
     def validate_card_number(cls, value: str) -> str:
-        if not re.fullmatch(r"\d+", value):
-            raise ValueError("Card number must contain only digits.")
-        return value
+        return validation.validate_card_number(value)
 
     @field_validator("cvv_code")
     @classmethod
     def validate_cvv(cls, value: str) -> str:
-        if not re.fullmatch(r"\d{3}", value):
-            raise ValueError("CVV code must contain exactly 3 digits.")
-        return value
+        return validation.validate_cvv_code(value)
+
+
+class AddBankCardsBatchRequest(BaseModel):
+    """
+    Pydantic schema for adding many bank cards at once.
+    """
+    cards: Annotated[
+        list[AddBankCardRequest],
+        Field(min_length=1, max_length=settings.BANK_CARD_BATCH_MAX_SIZE, description="Bank cards to add.")
+    ]
+
+
+class AddBankCardBatchItemResponse(BaseModel):
+    """
+    Pydantic response schema for the outcome of a single bank card in a batch.
+    """
+    index: Annotated[int, Field(description="Position of the card in the request's 'cards' list.")]
+    success: Annotated[bool, Field(description="Was the bank card added?")]
+    content: Annotated[Optional[CardPaymentMethod], Field(default=None, description="The added bank card.")]
+    error: Annotated[Optional[str], Field(default=None, description="Why the bank card was not added.")]
+
+
+class BankCardsPageResponse(BaseModel):
+    """
+    Pydantic response schema for a page of a user's bank cards.
+    """
+    items: Annotated[list[CardPaymentMethod], Field(description="Bank cards of the page, newest first.")]
+    next_cursor: Annotated[
+        Optional[str], Field(default=None, description="Pass as 'cursor' to get the next page. None on the last page.")
+    ]
+
+
+class BankAccountsPageResponse(BaseModel):
+    """
+    Pydantic response schema for a page of a company's bank accounts.
+    """
+    items: Annotated[list[BankAccountPaymentMethod], Field(description="Bank accounts of the page, newest first.")]
+    next_cursor: Annotated[
+        Optional[str], Field(default=None, description="Pass as 'cursor' to get the next page. None on the last page.")
+    ]
 
 
 class AddBankCardResponse(BaseModel):
@@ -116,20 +138,16 @@ class AddBankAccountRequest(BaseModel):
         """
         Validates that the field is not empty or consists only of spaces.
         """
-        if not value.strip():
-            raise ValueError("Field cannot be empty or consist only of spaces.")
-        return value
+        return validation.validate_not_blank(value)
 
     @field_validator("account_number")
     @classmethod
     def validate_account_number_format(cls, value: str) -> str:
         """
-        Validates that the account number is in a valid Kazakhstan IBAN format:
-        It must start with 'KZ' followed by exactly 18 digits.
+        Validates that the account number is a valid Kazakhstan IBAN:
+        'KZ' followed by exactly 18 digits, with matching mod-97 check digits.
         """
-        if not re.fullmatch(r"^KZ\d{18}$", value):
-            raise ValueError("Account number must be a valid Kazakhstan IBAN (e.g., 'KZ' followed by 18 digits).")
-        return value
+        return validation.validate_kz_iban(value)
 
 
 class AddBankAccountResponse(BaseModel):